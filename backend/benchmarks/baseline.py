@@ -0,0 +1,119 @@
+"""
+Seedling - Generational Wealth Time Machine
+Benchmark Baselines
+
+Saving benchmark results as JSON and checking later runs against them.
+Results are ``{case: {metric: value}}``; a metric regresses when it is
+worse than the saved value by more than the tolerance (a fraction).
+
+Machine speed drifts (frequency scaling, busy neighbors), so suites can
+time a fixed pure-Python workload right around each measurement and
+store it as the case's ``calibrationNs``. When both runs have one, the
+case's speed metrics are rescaled by the ratio of the two calibration
+times before comparing, which cancels a uniformly slower or faster
+machine and leaves the engine's own changes. Metrics that do not depend
+on the machine at all (operation counts) can be held to a tighter
+per-metric tolerance instead.
+"""
+
+from typing import Dict, Iterable, List, Optional
+import json
+import platform
+import sys
+import time
+
+Results = Dict[str, Dict[str, float]]
+
+CALIBRATION = "calibrationNs"
+
+
+def calibration_workload() -> None:
+    """Fixed pure-Python work: float math, attribute and dict access, allocation"""
+    class Account:
+        __slots__ = ("balance", "history")
+        
+        def __init__(self):
+            self.balance = 1000.0
+            self.history = []
+    
+    accounts = [Account() for _ in range(50)]
+    rates = {"save": 1.02, "invest": 1.07}
+    for year in range(400):
+        for account in accounts:
+            account.balance = account.balance * rates["invest" if year % 3 else "save"] - 12.5
+            account.history.append((year, round(account.balance, 2)))
+
+
+def time_calibration() -> float:
+    """Seconds for one calibration_workload run"""
+    start = time.perf_counter()
+    calibration_workload()
+    return time.perf_counter() - start
+
+
+def save_results(path: str, results: Results) -> None:
+    with open(path, "w") as f:
+        json.dump({
+            "python": sys.version.split()[0],
+            "machine": platform.machine(),
+            "results": results,
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Results:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def find_regressions(
+    results: Results,
+    baseline: Results,
+    tolerance: float,
+    higher_is_better: Iterable[str] = (),
+    min_delta: Optional[Dict[str, float]] = None,
+    speed_metrics: Iterable[str] = (),
+    metric_tolerance: Optional[Dict[str, float]] = None
+) -> List[str]:
+    """
+    One line per regressed metric. Metrics missing on either side are
+    skipped; ``min_delta`` gives per-metric absolute changes that are
+    always treated as noise and ``metric_tolerance`` per-metric overrides
+    of ``tolerance``. ``speed_metrics`` are rescaled by the case's
+    calibration ratio when both runs recorded one.
+    """
+    higher_is_better = set(higher_is_better)
+    speed_metrics = set(speed_metrics)
+    min_delta = min_delta or {}
+    metric_tolerance = metric_tolerance or {}
+    
+    lines = []
+    for case, saved in baseline.items():
+        current = results.get(case, {})
+        # > 1 when the machine was slower for this case than for the baseline
+        slowdown = 1.0
+        if saved.get(CALIBRATION) and current.get(CALIBRATION):
+            slowdown = current[CALIBRATION] / saved[CALIBRATION]
+        for metric, old in saved.items():
+            new = current.get(metric)
+            if metric == CALIBRATION or new is None or not old:
+                continue
+            if metric in speed_metrics:
+                new = new * slowdown if metric in higher_is_better else new / slowdown
+            if metric in higher_is_better:
+                change = (old - new) / old
+            else:
+                change = (new - old) / old
+            if change > metric_tolerance.get(metric, tolerance) and abs(new - old) > min_delta.get(metric, 0):
+                lines.append(f"{case} {metric}: {new:g} vs {old:g} ({change:+.0%} worse)")
+    return lines
+
+
+def check_results(results: Results, path: str, tolerance: float, **kwargs) -> int:
+    """Print regressions against the baseline at ``path``; exit status to use"""
+    regressions = find_regressions(results, load_results(path), tolerance, **kwargs)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"no regressions beyond {tolerance:.0%} against {path}")
+    return 1 if regressions else 0
@@ -0,0 +1,147 @@
+"""
+Seedling - Generational Wealth Time Machine
+Cold Start Benchmark
+
+Times each entry point from a fresh interpreter, the way a new uvicorn
+worker, Workers isolate or terminal run meets it:
+
+  import   interpreter start to the entry module imported
+  first    the same plus its first 3-generation simulation
+
+Both are timed inside each fresh process, so interpreter start (shown
+once, for reference) does not add noise; the best of several processes
+is reported. Save a run with --save and compare later runs against it
+with --check (exit status 1 when any entry is slower than the tolerance).
+
+Run from the backend directory:
+    python benchmarks/bench_cold_start.py [--runs 7] [--detail]
+        [--save cold_start.json] [--check cold_start.json --tolerance 0.5]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+from baseline import check_results, save_results
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT = os.path.dirname(BACKEND)
+
+# name -> (working directory, import statement, first simulation)
+ENTRY_POINTS = {
+    "core": (
+        BACKEND,
+        "import seedling_core",
+        "seedling_core.simulate_comparison({}, {}, 3)",
+    ),
+    "app": (
+        BACKEND,
+        "import main",
+        "main.simulate_comparison({}, {}, 3)",
+    ),
+    "worker": (
+        BACKEND,
+        "import worker",
+        "worker.run_comparison_simulation({}, {}, 3)",
+    ),
+    "cli": (
+        ROOT,
+        "import standalone",
+        "standalone.simulate({}, 100, 3)",
+    ),
+}
+
+
+# Runs in the fresh process; prints import and first-simulation seconds
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+imported = time.perf_counter()
+{first}
+sys.stderr.write("%r %r" % (imported - start, time.perf_counter() - start))
+"""
+
+
+def _interpreter_ms(runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _cold_start_ms(cwd: str, statement: str, first: str, runs: int):
+    """Best (import ms, first simulation ms) over fresh processes"""
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement, first=first)],
+            cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        samples.append([float(value) * 1000 for value in proc.stderr.split()[-2:]])
+    return min(s[0] for s in samples), min(s[1] for s in samples)
+
+
+def _import_times(cwd: str, code: str):
+    """(cumulative ms, indent, module) per import reported by -X importtime"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, check=True, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)", line)
+        if match:
+            rows.append((int(match.group(1)) / 1000, len(match.group(2)), match.group(3)))
+    return rows
+
+
+def _slowest_imports(cwd: str, statement: str, top: int = 8):
+    """(cumulative ms, module) of the slowest imports the entry itself triggers"""
+    startup = {module for _, _, module in _import_times(cwd, "pass")}
+    rows = [
+        (ms, module) for ms, indent, module in _import_times(cwd, statement)
+        # The entry module and its direct imports, not their internals
+        if module not in startup and indent <= 4
+    ]
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--entries", nargs="+", choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument("--detail", action="store_true", help="show the slowest imports per entry")
+    parser.add_argument("--save", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--check", metavar="FILE", help="compare against saved results")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args()
+    
+    results = {}
+    print(f"interpreter start: {_interpreter_ms(args.runs):.1f} ms (not included below)")
+    print(f"{'entry':<8} {'import ms':>10} {'first ms':>10}")
+    for name in args.entries:
+        cwd, statement, first = ENTRY_POINTS[name]
+        imported, simulated = _cold_start_ms(cwd, statement, first, args.runs)
+        results[name] = {"importMs": round(imported, 1), "firstMs": round(simulated, 1)}
+        print(f"{name:<8} {imported:>10.1f} {simulated:>10.1f}")
+        if args.detail:
+            for ms, module in _slowest_imports(cwd, statement):
+                print(f"    {ms:>8.1f}  {module}")
+    
+    if args.save:
+        save_results(args.save, results)
+    if args.check:
+        # Changes under 10 ms are within process start noise
+        sys.exit(check_results(
+            results, args.check, args.tolerance, min_delta={"importMs": 10, "firstMs": 10}
+        ))
+
+
+if __name__ == "__main__":
+    main()
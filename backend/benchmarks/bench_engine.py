@@ -0,0 +1,299 @@
+"""
+Seedling - Generational Wealth Time Machine
+Engine Microbenchmarks
+
+Times the engine's hot paths on fixed-seed members and end-to-end
+comparisons at each generation count:
+
+  simulate_year, _check_life_events,    ns and bytecodes per call
+  _record_snapshot, spawn_children
+  to_dict, summary                      ns and bytecodes per member
+                                        (FamilyMember.to_dict, generate_comparison_summary)
+  run_comparison_simulation             members/sec, us and bytecodes per
+                                        member-year, blocks per member-year,
+                                        peak KiB
+
+A member-year is one simulate_year call. Bytecodes are Python opcodes
+executed, counted with an opcode tracer: unlike times they are exact and
+independent of the machine, so they are the dependable regression signal
+on shared or throttled hosts (C-level work such as hashing does not show
+up in them). Blocks are Python memory blocks still allocated once a run
+returns (its result held), per member-year; peak memory is tracemalloc's
+peak during the run. Times are the best of --repeat runs with garbage
+collection paused, and a calibration workload runs around each one so
+--check can factor out machine speed (see baseline.py); bytecode counts
+are checked against a fixed 2% instead of --tolerance. Everything is
+pure stdlib and deterministic, so it runs offline anywhere.
+
+Run from the backend directory:
+    python benchmarks/bench_engine.py [--generations 1 2 3 4 5 6] [--repeat 7]
+        [--save benchmarks/engine_baseline.json]
+        [--check benchmarks/engine_baseline.json --tolerance 0.25]
+"""
+
+from typing import Callable, List, Tuple
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seedling_core import (  # noqa: E402
+    FamilyMember,
+    FlatTree,
+    GenerationalSimulator,
+    KeyedRandom,
+    SimulationParams,
+    generate_comparison_summary,
+    run_comparison_simulation,
+)
+from baseline import CALIBRATION, check_results, save_results, time_calibration  # noqa: E402
+
+SEED = 42
+SCENARIO = {"simulation": {"monthly_habit_change": 100}}
+# Members per hot-path case: the first generations of a fixed-seed tree
+POPULATION_GENERATIONS = 4
+# Hot paths run on members at this age, mid-career
+MIDLIFE_AGE = 45
+# Bytecode counting is slow; end-to-end runs are traced up to this size
+TRACED_GENERATIONS = 3
+
+
+def _simulator() -> GenerationalSimulator:
+    return GenerationalSimulator(SimulationParams(), KeyedRandom(SEED))
+
+
+def _tree(num_generations: int) -> FamilyMember:
+    sim = _simulator()
+    founder = sim.create_founder()
+    sim.simulate_generations(founder, num_generations)
+    return founder
+
+
+def _members(root: FamilyMember) -> List[FamilyMember]:
+    members, stack = [], [root]
+    while stack:
+        member = stack.pop()
+        members.append(member)
+        stack.extend(member.children)
+    return members
+
+
+def _fresh(template: FamilyMember, age: int) -> FamilyMember:
+    """An unsimulated copy of a member starting adult life at ``age``"""
+    return FamilyMember(
+        id=template.id,
+        name=template.name,
+        generation=template.generation,
+        birth_year=template.birth_year,
+        base_income=template.base_income,
+        education=template.education,
+        financial_literacy=template.financial_literacy,
+        current_age=age,
+        debt=template.debt if template.generation == 0 else 25000,
+        lineage=template.lineage,
+    )
+
+
+def _midlife(population: List[FamilyMember]) -> List[FamilyMember]:
+    """Population members simulated from 18 up to MIDLIFE_AGE"""
+    sim = _simulator()
+    members = [_fresh(m, 18) for m in population]
+    for member in members:
+        while member.current_age < MIDLIFE_AGE:
+            sim.simulate_year(member)
+    return members
+
+
+def _best(
+    setup: Callable[[], Tuple[object, int]],
+    run: Callable[[object], None],
+    repeat: int
+) -> Tuple[float, float]:
+    """
+    (seconds per operation, calibration seconds) from the repeat that ran
+    fastest relative to the calibration workload timed around it.
+    setup() -> (state, operations) is not timed.
+    """
+    best = (float("inf"), 0.0, 0.0)
+    for _ in range(repeat):
+        state, operations = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            before = time_calibration()
+            start = time.perf_counter()
+            run(state)
+            elapsed = time.perf_counter() - start
+            calibration = (before + time_calibration()) / 2
+        finally:
+            gc.enable()
+        best = min(best, (elapsed / calibration, elapsed / operations, calibration))
+    return best[1], best[2]
+
+
+def _count_bytecodes(run: Callable[[], object]) -> int:
+    """Python opcodes executed by run()"""
+    count = 0
+    
+    def trace(frame, event, arg):
+        nonlocal count
+        frame.f_trace_opcodes = True
+        if event == "opcode":
+            count += 1
+        return trace
+    
+    sys.settrace(trace)
+    try:
+        run()
+    finally:
+        sys.settrace(None)
+    return count
+
+
+def bench_hot_paths(repeat: int):
+    """{case: metrics} for each engine hot path"""
+    population = _members(_tree(POPULATION_GENERATIONS))
+    sim = _simulator()
+    
+    def lifetimes():
+        members = [_fresh(m, 18) for m in population]
+        return members, len(members) * (sim.params.life_expectancy - 18)
+    
+    def simulate_years(members):
+        for member in members:
+            while member.current_age < sim.params.life_expectancy:
+                sim.simulate_year(member)
+    
+    def midlife():
+        members = _midlife(population)
+        return members, len(members)
+    
+    def check_life_events(members):
+        for member in members:
+            sim._check_life_events(member)
+    
+    def record_snapshots(members):
+        for member in members:
+            sim._record_snapshot(member)
+    
+    def spawn_children(members):
+        for member in members:
+            sim.spawn_children(member)
+    
+    tree = _tree(POPULATION_GENERATIONS)
+    tree_size = len(_members(tree))
+    baseline = FlatTree.from_root(_tree(POPULATION_GENERATIONS + 1))
+    scenario = FlatTree.from_root(_tree(POPULATION_GENERATIONS + 1))
+    
+    cases = [
+        ("simulate_year", lifetimes, simulate_years),
+        ("_check_life_events", midlife, check_life_events),
+        ("_record_snapshot", midlife, record_snapshots),
+        ("spawn_children", midlife, spawn_children),
+        ("to_dict", lambda: (tree, tree_size), lambda root: root.to_dict()),
+        (
+            "summary",
+            lambda: ((baseline, scenario), len(baseline) + len(scenario)),
+            lambda trees: generate_comparison_summary(*trees),
+        ),
+    ]
+    results = {}
+    for name, setup, run in cases:
+        seconds, calibration = _best(setup, run, repeat)
+        state, operations = setup()
+        results[name] = {
+            "nsPerOp": round(seconds * 1e9, 1),
+            "bytecodesPerOp": round(_count_bytecodes(lambda: run(state)) / operations, 1),
+            CALIBRATION: round(calibration * 1e9),
+        }
+    return results
+
+
+def _member_years(result) -> Tuple[int, int]:
+    """(members, simulate_year calls) for a run_comparison_simulation result"""
+    members = years = 0
+    for arm in ("baseline", "scenario"):
+        stack = [result[arm]["tree"]]
+        founder_age = stack[0]["financialHistory"][0]["age"]
+        while stack:
+            node = stack.pop()
+            members += 1
+            years += node["currentAge"] - (founder_age if node["generation"] == 0 else 0)
+            stack.extend(node["children"])
+    return members, years
+
+
+def bench_comparison(num_generations: int, repeat: int):
+    """(members, end-to-end metrics) for one generation count"""
+    run = lambda: run_comparison_simulation({}, SCENARIO, num_generations, seed=SEED)  # noqa: E731
+    
+    members, years = _member_years(run())
+    seconds, calibration = _best(lambda: (None, 1), lambda _: run(), repeat)
+    
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    result = run()
+    blocks = sys.getallocatedblocks() - blocks
+    del result
+    
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    metrics = {
+        "membersPerSec": round(members / seconds, 1),
+        "usPerMemberYear": round(seconds / years * 1e6, 3),
+        "blocksPerMemberYear": round(blocks / years, 2),
+        "peakKiB": round(peak / 1024, 1),
+        CALIBRATION: round(calibration * 1e9),
+    }
+    if num_generations <= TRACED_GENERATIONS:
+        metrics["bytecodesPerMemberYear"] = round(_count_bytecodes(run) / years, 1)
+    return members, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--generations", type=int, nargs="+", default=[1, 2, 3, 4, 5, 6])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--save", metavar="FILE", help="write results as a JSON baseline")
+    parser.add_argument("--check", metavar="FILE", help="fail on regressions against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    
+    results = bench_hot_paths(args.repeat)
+    print(f"{'hot path':<22} {'ns/op':>10} {'bytecodes/op':>13}")
+    for name, metrics in results.items():
+        print(f"{name:<22} {metrics['nsPerOp']:>10.1f} {metrics['bytecodesPerOp']:>13.1f}")
+    
+    print(f"\n{'gens':>4} {'members':>8} {'members/s':>10} {'us/member-yr':>13} "
+          f"{'bytecodes/member-yr':>20} {'blocks/member-yr':>17} {'peak KiB':>10}")
+    for gens in args.generations:
+        members, metrics = bench_comparison(gens, args.repeat)
+        results[f"run_comparison_simulation[{gens}]"] = metrics
+        bytecodes = metrics.get("bytecodesPerMemberYear")
+        print(f"{gens:>4} {members:>8} {metrics['membersPerSec']:>10.1f} "
+              f"{metrics['usPerMemberYear']:>13.3f} "
+              f"{bytecodes if bytecodes is not None else '-':>20} "
+              f"{metrics['blocksPerMemberYear']:>17.2f} {metrics['peakKiB']:>10.1f}")
+    
+    if args.save:
+        save_results(args.save, results)
+    if args.check:
+        sys.exit(check_results(
+            results, args.check, args.tolerance,
+            higher_is_better=("membersPerSec",),
+            speed_metrics=("nsPerOp", "membersPerSec", "usPerMemberYear"),
+            # Exact counts: any real growth is a change in the engine
+            metric_tolerance={"bytecodesPerOp": 0.02, "bytecodesPerMemberYear": 0.02},
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Seedling - Generational Wealth Time Machine
+Serialization Benchmark
+
+Compares the cost of turning a comparison result into response bytes:
+
+  dict path     FamilyMember.to_dict -> jsonable_encoder -> json.dumps
+                (what /api/simulate did when it returned a plain dict)
+  encoder path  encoder.encode_comparison_json straight from FlatTree columns
+
+Run from the backend directory:
+    python benchmarks/bench_serialize.py [--generations 4 5 6] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seedling_core import (  # noqa: E402
+    GenerationalSimulator,
+    KeyedRandom,
+    SimulationParams,
+    ComparisonResult,
+    FlatTree,
+    generate_comparison_summary,
+)
+from encoder import encode_comparison_json  # noqa: E402
+
+try:
+    from fastapi.encoders import jsonable_encoder
+except ImportError:  # Benchmark still runs without the web stack
+    def jsonable_encoder(obj):
+        return obj
+
+
+def _simulate(num_generations: int, seed: int = 42):
+    rng = KeyedRandom(seed)
+    baseline_sim = GenerationalSimulator(SimulationParams(), rng)
+    baseline = baseline_sim.create_founder()
+    baseline_sim.simulate_generations(baseline, num_generations)
+    
+    scenario_params = SimulationParams(monthly_habit_change=100)
+    scenario_sim = GenerationalSimulator(scenario_params, rng)
+    scenario = scenario_sim.create_founder()
+    scenario_sim.simulate_generations(scenario, num_generations)
+    return baseline, scenario, scenario_params
+
+
+def _dict_path(baseline, scenario, scenario_params) -> bytes:
+    content = jsonable_encoder({
+        "baseline": {"tree": baseline.to_dict(), "params": SimulationParams().to_dict()},
+        "scenario": {"tree": scenario.to_dict(), "params": scenario_params.to_dict()},
+        "summary": generate_comparison_summary(baseline, scenario),
+    })
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _encoder_path(baseline, scenario, scenario_params) -> bytes:
+    baseline_tree = FlatTree.from_root(baseline)
+    scenario_tree = FlatTree.from_root(scenario)
+    result = ComparisonResult(
+        baseline=baseline_tree,
+        scenario=scenario_tree,
+        baseline_params=SimulationParams(),
+        scenario_params=scenario_params,
+        summary=generate_comparison_summary(baseline_tree, scenario_tree),
+    )
+    return encode_comparison_json(result)
+
+
+def _best_of(fn, repeat: int, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--generations", type=int, nargs="+", default=[3, 4, 5, 6])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'gens':>4} {'members':>8} {'bytes':>10} {'dict us/member':>15} "
+          f"{'encoder us/member':>18} {'speedup':>8}")
+    for gens in args.generations:
+        baseline, scenario, scenario_params = _simulate(gens)
+        members = len(FlatTree.from_root(baseline, include_history=False)) + \
+            len(FlatTree.from_root(scenario, include_history=False))
+        
+        assert json.loads(_dict_path(baseline, scenario, scenario_params)) == \
+            json.loads(_encoder_path(baseline, scenario, scenario_params))
+        
+        dict_time = _best_of(_dict_path, args.repeat, baseline, scenario, scenario_params)
+        encoder_time = _best_of(_encoder_path, args.repeat, baseline, scenario, scenario_params)
+        size = len(_encoder_path(baseline, scenario, scenario_params))
+        print(f"{gens:>4} {members:>8} {size:>10} {dict_time / members * 1e6:>15.1f} "
+              f"{encoder_time / members * 1e6:>18.1f} {dict_time / encoder_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Seedling - Generational Wealth Time Machine
+Engine Equivalence Checks
+
+Fixed-seed checks that engine refactors leave results unchanged, where
+the benchmarks only notice a change in speed:
+
+  lazy history      members simulated with lazy_history=True serialize
+                    (FamilyMember.to_dict) exactly as with recorded history
+  fixture           run_comparison_simulation output (both trees with
+                    history and events, and the summary) matches a digest
+                    captured from the engine before compiled params and
+                    cached metrics (engine_fixture.json)
+  life events       every member's life events, and the count of each
+                    event type, match those of the engine before life
+                    events became fused rules (same fixture)
+
+Member ids are random, so ids and parent ids are left out of every
+comparison; lineages identify members instead. Any difference fails.
+
+Run from the backend directory:
+    python benchmarks/check_equivalence.py [--fixture benchmarks/engine_fixture.json]
+To capture a fixture, run this file from a checkout of the engine to
+capture with --save FILE.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Tuple
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seedling_core import (  # noqa: E402
+    EducationLevel,
+    GenerationalSimulator,
+    KeyedRandom,
+    SimulationParams,
+    run_comparison_simulation,
+)
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "engine_fixture.json")
+
+GENERATIONS = 4
+SEEDS = (1, 7, 42)
+# (founder, simulation params): the defaults, a struggling founder with
+# every behavioral drift option on, and a well-off investor
+CASES: List[Tuple[Dict[str, Any], Dict[str, Any]]] = [
+    ({}, {"monthly_habit_change": 100}),
+    (
+        {"income": 30000, "savings": 0, "debt": 90000, "education": EducationLevel.HIGH_SCHOOL},
+        {"lifestyle_inflation": True, "diminishing_returns": True, "estate_tax_rate": 0.4},
+    ),
+    (
+        {"age": 40, "income": 150000, "savings": 200000, "education": EducationLevel.MASTERS},
+        {"investment_return": 0.1, "financial_literacy_boost": 0.2},
+    ),
+]
+
+
+def _without_ids(node: Dict[str, Any]) -> Dict[str, Any]:
+    node.pop("id", None)
+    node.pop("parentId", None)
+    for child in node.get("children", ()):
+        _without_ids(child)
+    return node
+
+
+def _nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.get("children", ()))
+
+
+def _tree_dict(founder: Dict[str, Any], simulation: Dict[str, Any], seed: int, lazy_history: bool) -> str:
+    sim = GenerationalSimulator(SimulationParams(**simulation), KeyedRandom(seed), lazy_history=lazy_history)
+    root = sim.create_founder(**founder)
+    sim.simulate_generations(root, GENERATIONS)
+    return json.dumps(_without_ids(root.to_dict()), sort_keys=True)
+
+
+def check_lazy_history() -> List[str]:
+    """Cases whose lazily replayed history serializes differently"""
+    failures = []
+    for case, (founder, simulation) in enumerate(CASES):
+        for seed in SEEDS:
+            if _tree_dict(founder, simulation, seed, True) != _tree_dict(founder, simulation, seed, False):
+                failures.append(f"lazy history: case {case} seed {seed}")
+    return failures
+
+
+def fingerprints() -> Dict[str, Dict[str, Any]]:
+    """Per case and seed: a digest of the comparison output and its totals"""
+    results = {}
+    for case, (founder, simulation) in enumerate(CASES):
+        for seed in SEEDS:
+            result = run_comparison_simulation(founder, {"simulation": simulation}, GENERATIONS, seed=seed)
+            for arm in ("baseline", "scenario"):
+                _without_ids(result[arm]["tree"])
+            output = json.dumps(result, sort_keys=True).encode()
+            events = sorted(
+                (arm, node["lineage"], node["lifeEvents"])
+                for arm in ("baseline", "scenario")
+                for node in _nodes(result[arm]["tree"])
+            )
+            counts = Counter(
+                event["eventType"] for _, _, member_events in events for event in member_events
+            )
+            results[f"case{case}-seed{seed}"] = {
+                "output": hashlib.sha256(output).hexdigest(),
+                "events": hashlib.sha256(json.dumps(events, sort_keys=True).encode()).hexdigest(),
+                "eventCounts": dict(sorted(counts.items())),
+                "totalNetWorth": [
+                    result["summary"]["baseline"]["totalNetWorth"],
+                    result["summary"]["scenario"]["totalNetWorth"],
+                ],
+            }
+    return results
+
+
+def check_fixture(path: str) -> List[str]:
+    """Fingerprints that differ from the fixture at ``path``"""
+    with open(path) as f:
+        expected = json.load(f)["results"]
+    actual = fingerprints()
+    failures = []
+    for name in sorted(set(expected) | set(actual)):
+        if expected.get(name) != actual.get(name):
+            failures.append(f"fixture: {name} {expected.get(name)} -> {actual.get(name)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixture", metavar="FILE", default=FIXTURE, help="fingerprints to check against")
+    parser.add_argument("--save", metavar="FILE", help="capture this engine's fingerprints instead")
+    args = parser.parse_args()
+    
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"generations": GENERATIONS, "results": fingerprints()}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        return
+    
+    failures = check_lazy_history() + check_fixture(args.fixture)
+    for line in failures:
+        print(f"DIFFERENT {line}")
+    if not failures:
+        print(f"identical: {len(CASES) * len(SEEDS)} cases, lazy history and {args.fixture}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
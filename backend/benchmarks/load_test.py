@@ -0,0 +1,325 @@
+"""
+Seedling - Generational Wealth Time Machine
+Load Test
+
+Drives the API with concurrent clients and reports, per endpoint and
+concurrency level, throughput and p50/p95/p99 latency. Microbenchmarks
+miss what this shows: a simulation holding the event loop delays every
+request queued behind it, so cheap endpoints grow long tails.
+
+Workload, cycled until --requests have completed at each level:
+
+  synthetic   a seeded mix of /api/simulate (founders drawn from a pool
+              of --pool distinct requests), /api/simulate/preset and
+              /api/calculate/habit-impact, weighted by --mix
+  --trace     requests replayed in recorded order from a trace written
+              by the app (SEEDLING_TRACE_FILE, see tracing.py)
+
+Server:
+
+  default     uvicorn serving main.app in this process, on a thread
+  --spawn     a local `uvicorn main:app` subprocess (--workers N)
+  --url       an already running server
+
+Each client is one keep-alive HTTP/1.1 connection issuing requests back
+to back (closed loop). The in-process server shares the interpreter with
+the clients, so use --spawn or --url for numbers closer to production.
+
+Run from the backend directory:
+    python benchmarks/load_test.py [--concurrency 1 4 16] [--requests 200]
+        [--mix simulate=6,preset=3,habit=1] [--trace trace.jsonl]
+        [--spawn --workers 2 | --url http://127.0.0.1:8000]
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+# (method, path with query, headers, JSON body or None)
+Request = Tuple[str, str, Dict[str, str], Optional[bytes]]
+
+DEFAULT_MIX = "simulate=6,preset=3,habit=1"
+EDUCATION = ("high_school", "some_college", "bachelors", "masters")
+HABIT_CHANGES = (50, 100, 200, 500)
+# Requests per connection before the measured run, to fill caches and pools
+WARMUP_REQUESTS = 2
+
+
+def _endpoint(path: str) -> str:
+    return path.split("?", 1)[0]
+
+
+def synthetic_requests(mix: Dict[str, float], pool: int, presets: List[str], seed: int) -> Iterator[Request]:
+    """An endless seeded stream of requests in the given endpoint proportions"""
+    rng = random.Random(seed)
+    headers = {"Accept-Encoding": "gzip"}
+    simulations = []
+    for _ in range(pool):
+        simulations.append(json.dumps({
+            "founder": {
+                "age": rng.randint(22, 50),
+                "income": rng.randrange(30000, 150000, 5000),
+                "savings": rng.randrange(0, 30000, 1000),
+                "debt": rng.randrange(0, 80000, 5000),
+                "education": rng.choice(EDUCATION),
+                "financial_literacy": round(rng.uniform(0.2, 0.8), 2),
+            },
+            "scenario": {"monthly_habit_change": rng.choice(HABIT_CHANGES)},
+            "num_generations": rng.choice((2, 3, 3, 4, 4, 5)),
+        }).encode())
+    
+    kinds, weights = zip(*mix.items())
+    while True:
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "simulate":
+            yield "POST", "/api/simulate", headers, rng.choice(simulations)
+        elif kind == "preset":
+            body = {"preset_name": rng.choice(presets), "num_generations": rng.randint(1, 6)}
+            yield "POST", "/api/simulate/preset", headers, json.dumps(body).encode()
+        else:
+            query = urlencode({"monthly_amount": rng.choice(HABIT_CHANGES), "years": rng.randint(10, 40)})
+            yield "POST", f"/api/calculate/habit-impact?{query}", {}, None
+
+
+def trace_requests(path: str) -> Iterator[Request]:
+    """The requests of a recorded trace, in arrival order, repeated forever"""
+    with open(path) as f:
+        entries = sorted((json.loads(line) for line in f if line.strip()), key=lambda e: e["at"])
+    if not entries:
+        raise SystemExit(f"{path}: no recorded requests")
+    requests = []
+    for entry in entries:
+        target = entry["path"] + (f"?{entry['query']}" if entry["query"] else "")
+        body = json.dumps(entry["body"]).encode() if entry["body"] is not None else None
+        requests.append((entry["method"], target, entry["headers"], body))
+    return itertools.cycle(requests)
+
+
+class Connection:
+    """Minimal keep-alive HTTP/1.1 client (stdlib only, so it adds no dependencies)"""
+    
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+    
+    async def request(self, method: str, target: str, headers: Dict[str, str], body: Optional[bytes]) -> Tuple[int, int]:
+        """(status, body bytes) once the whole response has arrived"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if body is not None:
+            lines += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        else:
+            lines.append("Content-Length: 0")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        
+        status = int((await self.reader.readline()).split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        
+        size = 0
+        if response_headers.get("transfer-encoding") == "chunked":
+            while True:
+                chunk = int((await self.reader.readline()).split(b";")[0], 16)
+                await self.reader.readexactly(chunk + 2)
+                size += chunk
+                if chunk == 0:
+                    break
+        else:
+            size = int(response_headers.get("content-length", 0))
+            await self.reader.readexactly(size)
+        if response_headers.get("connection") == "close":
+            await self.close()
+        return status, size
+    
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+async def run_level(host: str, port: int, requests: Iterator[Request], concurrency: int, total: int):
+    """({endpoint: [latency seconds]}, {endpoint: errors}, wall seconds) for one concurrency level"""
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    connections = [Connection(host, port) for _ in range(concurrency)]
+    remaining = [total]
+    
+    async def client(connection: Connection, measured: bool) -> None:
+        warmup = WARMUP_REQUESTS
+        while remaining[0] > 0 if measured else warmup > 0:
+            if measured:
+                remaining[0] -= 1
+            else:
+                warmup -= 1
+            method, target, headers, body = next(requests)
+            endpoint = _endpoint(target)
+            start = time.perf_counter()
+            try:
+                status, _ = await connection.request(method, target, headers, body)
+            except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                await connection.close()
+                status = 0
+            elapsed = time.perf_counter() - start
+            if measured:
+                if status >= 400 or status == 0:
+                    errors[endpoint] = errors.get(endpoint, 0) + 1
+                else:
+                    latencies.setdefault(endpoint, []).append(elapsed)
+    
+    await asyncio.gather(*(client(c, False) for c in connections))
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c, True) for c in connections))
+    wall = time.perf_counter() - start
+    for connection in connections:
+        await connection.close()
+    return latencies, errors, wall
+
+
+def report(concurrency: int, latencies: Dict[str, List[float]], errors: Dict[str, int], wall: float) -> None:
+    rows = sorted(latencies.items())
+    everything = [seconds for _, samples in rows for seconds in samples]
+    if len(rows) > 1:
+        rows.append(("all", everything))
+    for endpoint, samples in rows:
+        ordered = sorted(samples)
+        failed = sum(errors.values()) if endpoint == "all" else errors.get(endpoint, 0)
+        print(f"{concurrency:>5} {endpoint:<28} {len(ordered):>6} {failed:>6} {len(ordered) / wall:>9.1f} "
+              + " ".join(f"{_percentile(ordered, q) * 1000:>8.1f}" for q in (0.5, 0.95, 0.99)))
+    for endpoint in sorted(set(errors) - set(latencies)):
+        print(f"{concurrency:>5} {endpoint:<28} {0:>6} {errors[endpoint]:>6}")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_server(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"no server listening on {host}:{port}")
+
+
+def start_in_process_server() -> Tuple[str, int]:
+    """Serve main.app with uvicorn on a background thread"""
+    import uvicorn
+    from main import app
+    
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    _wait_for_server("127.0.0.1", port)
+    return "127.0.0.1", port
+
+
+def start_subprocess_server(workers: int) -> Tuple[str, int, subprocess.Popen]:
+    """Serve main:app with a local uvicorn process"""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND,
+    )
+    _wait_for_server("127.0.0.1", port)
+    return "127.0.0.1", port, proc
+
+
+def _parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in ("simulate", "preset", "habit"):
+            raise SystemExit(f"unknown endpoint in --mix: {kind}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+async def _preset_names(host: str, port: int) -> List[str]:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /api/presets HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    presets = json.loads(response.split(b"\r\n\r\n", 1)[1])["presets"]
+    return [preset["name"] for preset in presets]
+
+
+async def run(args, host: str, port: int) -> None:
+    if args.trace:
+        requests = trace_requests(args.trace)
+        workload = f"trace {args.trace}"
+    else:
+        requests = synthetic_requests(_parse_mix(args.mix), args.pool, await _preset_names(host, port), args.seed)
+        workload = f"synthetic {args.mix}, {args.pool} distinct simulations"
+    
+    print(f"{workload}; {args.requests} requests per level against {host}:{port}")
+    print(f"{'conc':>5} {'endpoint':<28} {'ok':>6} {'errors':>6} {'req/s':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for concurrency in args.concurrency:
+        report(concurrency, *await run_level(host, port, requests, concurrency, args.requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="synthetic endpoint weights")
+    parser.add_argument("--pool", type=int, default=100, help="distinct synthetic /api/simulate requests")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--trace", metavar="FILE", help="replay a recorded trace instead")
+    server = parser.add_mutually_exclusive_group()
+    server.add_argument("--url", help="test a running server")
+    server.add_argument("--spawn", action="store_true", help="start a local uvicorn process")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --spawn")
+    args = parser.parse_args()
+    
+    proc = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    elif args.spawn:
+        host, port, proc = start_subprocess_server(args.workers)
+    else:
+        host, port = start_in_process_server()
+    try:
+        asyncio.run(run(args, host, port))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Seedling - Generational Wealth Time Machine
+Result Cache
+
+Simulations with the same inputs and seed produce the same trees, so the
+encoded response bytes can be reused. Entries are keyed by a canonical
+hash of the request plus ENGINE_VERSION and hold the uncompressed body
+together with each compressed variant, so a repeat request costs neither
+a simulation nor a compression pass. Behind the in-process LRU sits the
+shared on-disk ResultStore, so entries survive restarts and are shared by
+every worker process.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import os
+import threading
+
+from seedling_core import ENGINE_VERSION
+from compression import MIN_COMPRESS_SIZE, compress
+from result_store import ResultStore, open_default_store
+
+
+def request_key(kind: str, request: Dict[str, Any], representation: Any = None) -> str:
+    """Canonical hash of a request: key order and whitespace never matter"""
+    canonical = json.dumps(
+        {"engine": ENGINE_VERSION, "kind": kind, "request": request, "representation": representation},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass
+class CachedPayload:
+    """An encoded response body and its compressed variants"""
+    media_type: str
+    body: bytes
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+    
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(data) for data in self.encodings.values())
+
+
+class ResultCache:
+    """
+    Thread-safe LRU of CachedPayloads bounded by total bytes, reading
+    through to and writing behind an optional persistent store
+    """
+    
+    def __init__(self, max_bytes: int, store: Optional[ResultStore] = None):
+        self.max_bytes = max_bytes
+        self.store = store
+        self._entries: "OrderedDict[str, CachedPayload]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.store_hits = 0
+    
+    def get(self, key: str) -> Optional[CachedPayload]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+        
+        stored = self.store.get(key) if self.store is not None else None
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+            self.store_hits += 1
+        payload = CachedPayload(*stored)
+        self._insert(key, payload)
+        return payload
+    
+    def put(self, key: str, payload: CachedPayload) -> None:
+        self._insert(key, payload)
+        if self.store is not None:
+            # The store keeps compressed bodies only, so make sure gzip exists
+            if len(payload.body) < MIN_COMPRESS_SIZE:
+                variants = {"identity": payload.body}
+            else:
+                if "gzip" not in payload.encodings:
+                    self.body_for(key, payload, "gzip")
+                variants = dict(payload.encodings)
+            self.store.put(key, payload.media_type, variants)
+    
+    def _insert(self, key: str, payload: CachedPayload) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = payload
+            self._bytes += payload.size
+            self._evict()
+    
+    def body_for(self, key: str, payload: CachedPayload, encoding: Optional[str]) -> bytes:
+        """
+        The body in the requested content encoding. Each encoding is
+        compressed at most once per entry and kept for later hits.
+        """
+        if encoding is None or len(payload.body) < MIN_COMPRESS_SIZE:
+            return payload.body
+        data = payload.encodings.get(encoding)
+        if data is None:
+            data = compress(payload.body, encoding)
+            cached = False
+            with self._lock:
+                if encoding not in payload.encodings:
+                    payload.encodings[encoding] = data
+                    cached = self._entries.get(key) is payload
+                    if cached:
+                        self._bytes += len(data)
+                        self._evict()
+            if cached and self.store is not None and encoding != "gzip":
+                self.store.put(key, payload.media_type, {encoding: data})
+        return data
+    
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, payload = self._entries.popitem(last=False)
+            self._bytes -= payload.size
+            self.evictions += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxBytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "storeHits": self.store_hits,
+                "store": self.store.stats() if self.store is not None else None,
+            }
+
+
+RESULT_CACHE = ResultCache(
+    int(os.environ.get("SEEDLING_RESULT_CACHE_MB", "128")) * 1024 * 1024,
+    open_default_store(),
+)
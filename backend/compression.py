@@ -0,0 +1,185 @@
+"""
+Seedling - Generational Wealth Time Machine
+Response Compression
+
+Content-encoding negotiation and size-aware compression for simulation
+payloads. gzip is always available; brotli and zstd are used when their
+optional packages are installed. Every compression is counted in
+COMPRESSION_STATS (bytes in/out and CPU seconds per encoding).
+"""
+
+from typing import Iterable, Iterator, Optional, Dict, Any
+import threading
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+
+# Payloads smaller than this are not worth a compression pass
+MIN_COMPRESS_SIZE = 1024
+
+# Preference order when the client accepts several encodings equally
+SUPPORTED_ENCODINGS = tuple(
+    encoding for encoding, available in (
+        ("br", brotli is not None),
+        ("zstd", zstandard is not None),
+        ("gzip", True),
+    ) if available
+)
+
+# (payload size upper bound, level) per encoding: cheap levels for big
+# payloads so one large response never monopolizes a worker
+_LEVELS = {
+    "gzip": ((256 * 1024, 9), (2 * 1024 * 1024, 6), (float("inf"), 4)),
+    "br": ((64 * 1024, 11), (1024 * 1024, 6), (float("inf"), 4)),
+    "zstd": ((256 * 1024, 19), (2 * 1024 * 1024, 9), (float("inf"), 3)),
+}
+
+
+class CompressionStats:
+    """Thread-safe per-encoding counters"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+    
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                encoding, {"count": 0, "bytesIn": 0, "bytesOut": 0, "cpuSeconds": 0.0}
+            )
+            stats["count"] += 1
+            stats["bytesIn"] += bytes_in
+            stats["bytesOut"] += bytes_out
+            stats["cpuSeconds"] += cpu_seconds
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                encoding: {
+                    **stats,
+                    "ratio": stats["bytesIn"] / max(stats["bytesOut"], 1),
+                    "cpuSecondsPerRequest": stats["cpuSeconds"] / max(stats["count"], 1),
+                }
+                for encoding, stats in self._stats.items()
+            }
+
+
+COMPRESSION_STATS = CompressionStats()
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported encoding from an Accept-Encoding header, or None"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        parts = [p.strip() for p in item.split(";")]
+        name = parts[0].lower()
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+    best = None
+    best_q = 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def choose_level(encoding: str, size: int) -> int:
+    """Compression level for a payload of the given size"""
+    for limit, level in _LEVELS[encoding]:
+        if size <= limit:
+            return level
+    return _LEVELS[encoding][-1][1]
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """One-shot compression with stats accounting"""
+    if level is None:
+        level = choose_level(encoding, len(data))
+    start = time.thread_time()
+    if encoding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        out = compressor.compress(data) + compressor.flush()
+    elif encoding == "br":
+        out = brotli.compress(data, quality=level)
+    elif encoding == "zstd":
+        out = zstandard.ZstdCompressor(level=level).compress(data)
+    else:
+        raise ValueError(f"Unsupported encoding: {encoding}")
+    COMPRESSION_STATS.record(encoding, len(data), len(out), time.thread_time() - start)
+    return out
+
+
+def iter_compress(chunks: Iterable[bytes], encoding: str, level: int) -> Iterator[bytes]:
+    """
+    Compress a chunked stream incrementally, yielding compressed chunks as
+    they become available. Stats are recorded once the stream completes.
+    """
+    if encoding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        compress_chunk, flush = compressor.compress, compressor.flush
+    elif encoding == "br":
+        # A C type: its methods are process and finish, and it takes no new attributes
+        compressor = brotli.Compressor(quality=level)
+        compress_chunk, flush = compressor.process, compressor.finish
+    elif encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        compress_chunk, flush = compressor.compress, compressor.flush
+    else:
+        raise ValueError(f"Unsupported encoding: {encoding}")
+    
+    bytes_in = bytes_out = 0
+    cpu = 0.0
+    for chunk in chunks:
+        start = time.thread_time()
+        out = compress_chunk(chunk)
+        cpu += time.thread_time() - start
+        bytes_in += len(chunk)
+        if out:
+            bytes_out += len(out)
+            yield out
+    start = time.thread_time()
+    out = flush()
+    cpu += time.thread_time() - start
+    bytes_out += len(out)
+    COMPRESSION_STATS.record(encoding, bytes_in, bytes_out, cpu)
+    if out:
+        yield out
+
+
+if __name__ == "__main__":
+    from seedling_core import simulate_comparison
+    from encoder import encode_comparison_json, iter_comparison_json
+    
+    decompress = {
+        "gzip": lambda data: zlib.decompress(data, 31),
+        "br": lambda data: brotli.decompress(data),
+        "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+    }
+    # Big enough for the API to stream it
+    result = simulate_comparison({}, {"simulation": {"monthly_habit_change": 100}}, num_generations=5, seed=7)
+    whole = encode_comparison_json(result)
+    for encoding in SUPPORTED_ENCODINGS:
+        level = choose_level(encoding, len(whole))
+        streamed = b"".join(iter_compress(iter_comparison_json(result), encoding, level))
+        ok = decompress[encoding](streamed) == whole
+        print(f"{encoding:>4} json={len(whole):>8} streamed={len(streamed):>8} ok={ok}")
+        assert ok
@@ -0,0 +1,297 @@
+"""
+Seedling - Generational Wealth Time Machine
+Delta-Encoded Scenario Trees
+
+Baseline and scenario share their random draws, so their trees usually
+have the same members in the same places and differ only in the money.
+This module sends the scenario as a structural diff against the baseline:
+
+- members are matched by lineage (their stable position in the tree)
+- numeric fields travel as integer deltas in units of the JSON rounding
+  (cents for money, thousandths for branch thickness), so rebuilding
+  gives back exactly the numbers the full response would contain
+- members only one arm has are listed as explicit adds and removes
+
+Run ``python delta.py`` for a self-check that rebuilt scenario trees
+match the full ones exactly.
+"""
+
+from typing import Dict, Any, Iterator, List, Optional
+import json
+
+from seedling_core import (
+    ComparisonResult,
+    FlatTree,
+    HEALTH_LEVELS,
+    EDUCATION_LEVELS,
+    BRANCH_COLORS,
+    branch_thickness,
+)
+from encoder import DEFAULT_CHUNK_SIZE, iter_tree_json
+
+
+DELTA_ENCODING = "seedling-delta-v1"
+
+# (JSON key, FlatTree column, decimals) for member and history numbers
+MEMBER_NUMBERS = (
+    ("financialLiteracy", "financial_literacy", 2),
+    ("income", "income", 2),
+    ("savings", "savings", 2),
+    ("investments", "investments", 2),
+    ("debt", "debt", 2),
+    ("homeEquity", "home_equity", 2),
+    ("netWorth", "net_worth", 2),
+    ("inheritanceReceived", "inheritance_received", 2),
+)
+HISTORY_NUMBERS = (
+    ("income", "h_income"),
+    ("savings", "h_savings"),
+    ("investments", "h_investments"),
+    ("debt", "h_debt"),
+    ("homeEquity", "h_home_equity"),
+    ("netWorth", "h_net_worth"),
+)
+
+
+def _units(value: float, decimals: int = 2) -> int:
+    """A value as an integer count of its JSON rounding unit"""
+    return round(round(value, decimals) * 10 ** decimals)
+
+
+def _member_fields(tree: FlatTree, i: int) -> Dict[str, Any]:
+    """Non-numeric member fields, sent whole when they differ"""
+    health = HEALTH_LEVELS[tree.health[i]]
+    return {
+        "name": tree.names[i],
+        "generation": tree.generation[i],
+        "birthYear": tree.birth_year[i],
+        "currentAge": tree.current_age[i],
+        "education": EDUCATION_LEVELS[tree.education[i]].value,
+        "ownsHome": bool(tree.owns_home[i]),
+        "financialHealth": health.value,
+        "branchColor": BRANCH_COLORS[health],
+    }
+
+
+def _member_delta(baseline: FlatTree, b: int, scenario: FlatTree, s: int) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {"lineage": scenario.lineages[s], "id": scenario.ids[s]}
+    
+    base_fields = _member_fields(baseline, b)
+    changed = {
+        key: value for key, value in _member_fields(scenario, s).items()
+        if base_fields[key] != value
+    }
+    if changed:
+        entry["set"] = changed
+    
+    numbers = {}
+    for key, column, decimals in MEMBER_NUMBERS:
+        diff = _units(getattr(scenario, column)[s], decimals) - \
+            _units(getattr(baseline, column)[b], decimals)
+        if diff:
+            numbers[key] = diff
+    diff = _units(branch_thickness(scenario.net_worth[s]), 3) - \
+        _units(branch_thickness(baseline.net_worth[b]), 3)
+    if diff:
+        numbers["branchThickness"] = diff
+    if numbers:
+        entry["delta"] = numbers
+    
+    b_rows, s_rows = baseline.history_range(b), scenario.history_range(s)
+    same_years = (
+        len(b_rows) == len(s_rows)
+        and baseline.h_year[b_rows.start:b_rows.stop] == scenario.h_year[s_rows.start:s_rows.stop]
+        and baseline.h_age[b_rows.start:b_rows.stop] == scenario.h_age[s_rows.start:s_rows.stop]
+    )
+    if same_years:
+        history = {}
+        for key, column in HISTORY_NUMBERS:
+            b_col, s_col = getattr(baseline, column), getattr(scenario, column)
+            diffs = [_units(s_col[r2]) - _units(b_col[r1]) for r1, r2 in zip(b_rows, s_rows)]
+            if any(diffs):
+                history[key] = diffs
+        b_health = baseline.h_health[b_rows.start:b_rows.stop]
+        s_health = scenario.h_health[s_rows.start:s_rows.stop]
+        if b_health != s_health:
+            history["health"] = [HEALTH_LEVELS[h].value for h in s_health]
+        if history:
+            entry["history"] = history
+    else:
+        entry["financialHistory"] = [scenario.history_row_dict(r) for r in s_rows]
+    
+    b_events = [e.to_dict() for e in baseline.events[b]]
+    s_events = [e.to_dict() for e in scenario.events[s]]
+    if b_events != s_events:
+        entry["lifeEvents"] = s_events
+    
+    return entry
+
+
+def encode_scenario_delta(baseline: FlatTree, scenario: FlatTree) -> Dict[str, Any]:
+    """Describe the scenario tree as changes against the baseline tree"""
+    baseline_index = {lineage: i for i, lineage in enumerate(baseline.lineages)}
+    scenario_lineages = set(scenario.lineages)
+    
+    members = []
+    added = []
+    for s, lineage in enumerate(scenario.lineages):
+        b = baseline_index.get(lineage)
+        if b is None:
+            member = scenario.member_dict(s)
+            del member["children"]
+            added.append(member)
+        else:
+            members.append(_member_delta(baseline, b, scenario, s))
+    
+    return {
+        "encoding": DELTA_ENCODING,
+        "members": members,
+        "added": added,
+        "removed": [l for l in baseline.lineages if l not in scenario_lineages],
+    }
+
+
+def apply_scenario_delta(baseline_tree: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reference decoder: rebuild the full scenario tree from the nested
+    baseline tree JSON and an ``encode_scenario_delta`` result.
+    """
+    if delta.get("encoding") != DELTA_ENCODING:
+        raise ValueError(f"Unsupported delta encoding: {delta.get('encoding')}")
+    
+    baseline_nodes = {}
+    stack = [baseline_tree]
+    while stack:
+        node = stack.pop()
+        baseline_nodes[node["lineage"]] = node
+        stack.extend(node["children"])
+    
+    nodes = {}
+    for entry in delta["members"]:
+        base = baseline_nodes[entry["lineage"]]
+        node = {key: value for key, value in base.items() if key != "children"}
+        node["id"] = entry["id"]
+        node.update(entry.get("set", {}))
+        
+        for key, diff in entry.get("delta", {}).items():
+            decimals = 3 if key == "branchThickness" else 2
+            node[key] = (_units(base[key], decimals) + diff) / 10 ** decimals
+        
+        if "financialHistory" in entry:
+            node["financialHistory"] = entry["financialHistory"]
+        else:
+            history = [dict(row) for row in base["financialHistory"]]
+            changes = entry.get("history", {})
+            for key, diffs in changes.items():
+                if key == "health":
+                    for row, value in zip(history, diffs):
+                        row["health"] = value
+                else:
+                    for row, diff in zip(history, diffs):
+                        row[key] = (_units(row[key]) + diff) / 100
+            node["financialHistory"] = history
+        
+        if "lifeEvents" in entry:
+            node["lifeEvents"] = entry["lifeEvents"]
+        nodes[entry["lineage"]] = node
+    
+    for member in delta["added"]:
+        nodes[member["lineage"]] = dict(member)
+    
+    # Re-link by lineage: "0.2.1" is child 1 of "0.2"
+    root = None
+    for lineage in sorted(nodes, key=lambda l: [int(p) for p in l.split(".")]):
+        node = nodes[lineage]
+        node["children"] = []
+        if "." in lineage:
+            parent = nodes[lineage.rsplit(".", 1)[0]]
+            node["parentId"] = parent["id"]
+            parent["children"].append(node)
+        else:
+            root = node
+    
+    # Restore the canonical key order of the full response
+    def reorder(node: Dict[str, Any]) -> Dict[str, Any]:
+        ordered = {key: node[key] for key in baseline_tree if key in node}
+        ordered["children"] = [reorder(child) for child in node["children"]]
+        return ordered
+    
+    return reorder(root) if root is not None else {}
+
+
+def iter_comparison_delta_json(
+    result: ComparisonResult,
+    extra: Optional[Dict[str, Any]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield the delta-mode response: the baseline tree in full and the
+    scenario as ``treeDelta``. Shape otherwise matches the full response.
+    """
+    dumps = lambda value: json.dumps(value, ensure_ascii=False, separators=(",", ":"))  # noqa: E731
+    
+    def fragments() -> Iterator[str]:
+        yield '{"baseline":{"tree":'
+        yield from iter_tree_json(result.baseline)
+        yield ',"params":%s},"scenario":{"treeDelta":%s,"params":%s},"summary":%s' % (
+            dumps(result.baseline_params.to_dict()),
+            dumps(encode_scenario_delta(result.baseline, result.scenario)),
+            dumps(result.scenario_params.to_dict()),
+            dumps(result.summary),
+        )
+        for key, value in result.with_fidelity(extra).items():
+            yield ",%s:%s" % (dumps(key), dumps(value))
+        yield "}"
+    
+    pending: List[str] = []
+    size = 0
+    for fragment in fragments():
+        pending.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield "".join(pending).encode()
+            pending = []
+            size = 0
+    if pending:
+        yield "".join(pending).encode()
+
+
+def encode_comparison_delta_json(
+    result: ComparisonResult,
+    extra: Optional[Dict[str, Any]] = None
+) -> bytes:
+    return b"".join(iter_comparison_delta_json(result, extra))
+
+
+def check_delta_roundtrip(result: ComparisonResult) -> bool:
+    """True when decoding the delta rebuilds the full scenario tree exactly"""
+    baseline_tree = json.loads(json.dumps(result.baseline.to_nested()))
+    expected = json.loads(json.dumps(result.scenario.to_nested()))
+    delta = json.loads(json.dumps(encode_scenario_delta(result.baseline, result.scenario)))
+    return apply_scenario_delta(baseline_tree, delta) == expected
+
+
+if __name__ == "__main__":
+    from seedling_core import simulate_comparison, EducationLevel
+    
+    scenarios = [
+        {"simulation": {"monthly_habit_change": 100}},
+        {"simulation": {"monthly_habit_change": 500, "financial_literacy_boost": 0.3}},
+        {"simulation": {"starting_debt_modifier": 3.0, "investment_return": 0.03}},
+    ]
+    founders = [
+        {},
+        {"income": 30000, "savings": 0, "debt": 90000, "education": EducationLevel.HIGH_SCHOOL},
+    ]
+    for seed in range(5):
+        for founder in founders:
+            for scenario in scenarios:
+                result = simulate_comparison(founder, scenario, num_generations=4, seed=seed)
+                full = len(json.dumps(result.scenario.to_nested(), separators=(",", ":")))
+                delta = len(json.dumps(
+                    encode_scenario_delta(result.baseline, result.scenario), separators=(",", ":")
+                ))
+                ok = check_delta_roundtrip(result)
+                print(f"seed={seed} members={len(result.scenario):>3} "
+                      f"full={full:>8} delta={delta:>8} ({delta / full:.0%}) ok={ok}")
+                assert ok
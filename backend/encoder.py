@@ -0,0 +1,203 @@
+"""
+Seedling - Generational Wealth Time Machine
+Streaming JSON Encoder
+
+Writes simulation results straight from FlatTree columns to UTF-8 bytes.
+The output parses to the same document ComparisonResult.to_dict() would
+produce, but no intermediate dicts are built. The rounding rules (2
+decimals for money, 3 for branch thickness) are applied inline through
+fixed-point formatting: "%.2f" % x reads back as exactly round(x, 2).
+"""
+
+from json.encoder import encode_basestring
+from typing import Iterator, Dict, Any, Optional
+import json
+
+from seedling_core import (
+    ComparisonResult,
+    FlatTree,
+    HEALTH_LEVELS,
+    EDUCATION_LEVELS,
+    BRANCH_COLORS,
+    branch_thickness,
+)
+
+
+# Bytes buffered before a chunk is yielded to the transport
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_HEALTH_VALUES = tuple(h.value for h in HEALTH_LEVELS)
+_HEALTH_COLORS = tuple(BRANCH_COLORS[h] for h in HEALTH_LEVELS)
+_EDUCATION_VALUES = tuple(e.value for e in EDUCATION_LEVELS)
+
+_MEMBER_HEAD = (
+    '{"id":%s,"name":%s,"generation":%d,"birthYear":%d,"currentAge":%d,'
+    '"education":"%s","financialLiteracy":%.2f,"income":%.2f,"savings":%.2f,'
+    '"investments":%.2f,"debt":%.2f,"homeEquity":%.2f,"netWorth":%.2f,"ownsHome":%s,'
+    '"inheritanceReceived":%.2f,"financialHealth":"%s","branchThickness":%.3f,'
+    '"branchColor":"%s","children":['
+)
+_MEMBER_TAIL = ']%s,"parentId":%s,"lineage":%s,"financialHistory":[%s],"lifeEvents":[%s]}'
+# Inserted after the empty children of a member cut off by ``depth``
+_COLLAPSED = ',"childCount":%d,"subtree":{"descendants":%d,"generations":%d,"totalNetWorth":%.2f,"avgNetWorth":%.2f}'
+_HISTORY_ROW = (
+    '{"year":%d,"age":%d,"income":%.2f,"savings":%.2f,"investments":%.2f,'
+    '"debt":%.2f,"homeEquity":%.2f,"netWorth":%.2f,"health":"%s"}'
+)
+_LIFE_EVENT = '{"year":%d,"age":%d,"eventType":%s,"description":%s,"financialImpact":%.2f}'
+
+
+def _dumps(value: Any) -> str:
+    """Compact JSON matching the framework's own response rendering"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _member_head(tree: FlatTree, i: int) -> str:
+    net_worth = tree.net_worth[i]
+    health = tree.health[i]
+    return _MEMBER_HEAD % (
+        encode_basestring(tree.ids[i]),
+        encode_basestring(tree.names[i]),
+        tree.generation[i],
+        tree.birth_year[i],
+        tree.current_age[i],
+        _EDUCATION_VALUES[tree.education[i]],
+        tree.financial_literacy[i],
+        tree.income[i],
+        tree.savings[i],
+        tree.investments[i],
+        tree.debt[i],
+        tree.home_equity[i],
+        net_worth,
+        "true" if tree.owns_home[i] else "false",
+        tree.inheritance_received[i],
+        _HEALTH_VALUES[health],
+        branch_thickness(net_worth),
+        _HEALTH_COLORS[health],
+    )
+
+
+def _member_tail(tree: FlatTree, i: int, collapsed: str = "") -> str:
+    start, stop = tree.history_offsets[i], tree.history_offsets[i + 1]
+    history = ",".join([
+        _HISTORY_ROW % (
+            year, age, income, savings, investments, debt, home_equity, net_worth,
+            _HEALTH_VALUES[health],
+        )
+        for year, age, income, savings, investments, debt, home_equity, net_worth, health in zip(
+            tree.h_year[start:stop], tree.h_age[start:stop],
+            tree.h_income[start:stop], tree.h_savings[start:stop],
+            tree.h_investments[start:stop], tree.h_debt[start:stop],
+            tree.h_home_equity[start:stop], tree.h_net_worth[start:stop],
+            tree.h_health[start:stop],
+        )
+    ])
+    events = ",".join([
+        _LIFE_EVENT % (
+            e.year, e.age, encode_basestring(e.event_type),
+            encode_basestring(e.description), e.financial_impact,
+        )
+        for e in tree.events[i]
+    ])
+    parent_id = tree.parent_ids[i]
+    return _MEMBER_TAIL % (
+        collapsed,
+        "null" if parent_id is None else encode_basestring(parent_id),
+        encode_basestring(tree.lineages[i]),
+        history,
+        events,
+    )
+
+
+def _collapsed(tree: FlatTree, i: int) -> str:
+    stats = tree.subtree_stats(i)
+    return _COLLAPSED % (
+        len(tree.children_of(i)),
+        stats["descendants"],
+        stats["generations"],
+        stats["totalNetWorth"],
+        stats["avgNetWorth"],
+    )
+
+
+def iter_tree_json(tree: FlatTree, root: int = 0, depth: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield JSON text for a subtree in the nested ``children`` shape.
+    Depth-first over the CSR child ranges with an explicit stack, so
+    deep trees never hit the recursion limit.
+    
+    With ``depth``, only members down to that many generations below
+    ``root`` are sent; those at the cut keep empty ``children`` plus a
+    ``childCount`` and ``subtree`` totals when they have descendants.
+    """
+    if not len(tree):
+        yield "{}"
+        return
+    
+    yield _member_head(tree, root)
+    if depth == 0 and len(tree.children_of(root)):
+        yield _member_tail(tree, root, _collapsed(tree, root))
+        return
+    stack = [[root, iter(tree.children_of(root)), True]]
+    while stack:
+        frame = stack[-1]
+        child = next(frame[1], None)
+        if child is None:
+            stack.pop()
+            yield _member_tail(tree, frame[0])
+            continue
+        if frame[2]:
+            frame[2] = False
+        else:
+            yield ","
+        yield _member_head(tree, child)
+        if depth is not None and len(stack) == depth and len(tree.children_of(child)):
+            yield _member_tail(tree, child, _collapsed(tree, child))
+            continue
+        stack.append([child, iter(tree.children_of(child)), True])
+
+
+def iter_comparison_json(
+    result: ComparisonResult,
+    extra: Optional[Dict[str, Any]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    depth: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Yield the comparison response as UTF-8 chunks of roughly chunk_size
+    bytes. Keys in ``extra`` are appended at the top level; ``depth``
+    cuts both trees as in iter_tree_json.
+    """
+    
+    def fragments() -> Iterator[str]:
+        yield '{"baseline":{"tree":'
+        yield from iter_tree_json(result.baseline, depth=depth)
+        yield ',"params":%s},"scenario":{"tree":' % _dumps(result.baseline_params.to_dict())
+        yield from iter_tree_json(result.scenario, depth=depth)
+        yield ',"params":%s},"summary":%s' % (
+            _dumps(result.scenario_params.to_dict()), _dumps(result.summary)
+        )
+        for key, value in result.with_fidelity(extra).items():
+            yield ",%s:%s" % (encode_basestring(key), _dumps(value))
+        yield "}"
+    
+    pending = []
+    size = 0
+    for fragment in fragments():
+        pending.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield "".join(pending).encode()
+            pending = []
+            size = 0
+    if pending:
+        yield "".join(pending).encode()
+
+
+def encode_comparison_json(
+    result: ComparisonResult,
+    extra: Optional[Dict[str, Any]] = None,
+    depth: Optional[int] = None
+) -> bytes:
+    """Encode the whole comparison response into one byte string"""
+    return b"".join(iter_comparison_json(result, extra, depth=depth))
@@ -5,20 +5,97 @@ FastAPI Backend Server
 Provides REST API endpoints for running simulations and retrieving results.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, model_validator
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Match
+from typing import Optional, Dict, Any, List, Literal, Iterator, Tuple
+import anyio
+import asyncio
+import contextlib
+import json
+import logging
 import os
+import time
 
-from simulation import (
-    run_comparison_simulation,
+from seedling_core import (
+    simulate_comparison,
+    run_comparison_ensemble,
+    MIN_ANTITHETIC_RUNS,
+    SimulationBudget,
     SimulationParams,
     EducationLevel,
+    HEALTH_LEVELS,
     GenerationalSimulator,
+    FlatTree,
+    Timings,
+    PREVIEW_STRIDE,
+    PREVIEW_ERROR_BOUND,
 )
+from encoder import encode_comparison_json, iter_comparison_json, iter_tree_json
+from columnar import negotiate, encode_comparison_binary
+from delta import encode_comparison_delta_json, iter_comparison_delta_json
+from compression import (
+    COMPRESSION_STATS,
+    MIN_COMPRESS_SIZE,
+    SUPPORTED_ENCODINGS,
+    compress,
+    negotiate_encoding,
+    choose_level,
+    iter_compress,
+)
+from cache import RESULT_CACHE, CachedPayload, request_key
+from run_store import open_default_run_store
+from run_index import MemberFilter, query_members, snapshot_frame, snapshot_row
+from tracing import TraceMiddleware, open_default_recorder
+from profiling import ProfileMiddleware, open_default_profiler
+from memory import ACTION_FULL, ACTION_REJECT, ACTION_SUMMARY_ONLY, open_default_guard
+from metrics import (
+    REGISTRY,
+    MEMORY_BUCKETS,
+    MetricsMiddleware,
+    flush_periodically,
+    monitor_event_loop,
+    open_process_metrics,
+)
+
+# Uncached JSON responses for trees this large are streamed through an
+# incremental compressor rather than built in memory before sending
+STREAM_MIN_MEMBERS = 150
+# Typical encoded JSON size per member, to pick a level before the size is known
+JSON_BYTES_PER_MEMBER = 12 * 1024
+# CPU budget for /api/simulate when the request sets none (unset = unlimited)
+DEFAULT_CPU_BUDGET_MS = int(os.environ.get("SEEDLING_CPU_BUDGET_MS", "0")) or None
+# Per-phase timings, sent as Server-Timing and logged as JSON lines to the
+# seedling.timing logger. SEEDLING_TIMING: off (default), stages, or
+# detailed to also split simulate_year into its phases
+TIMING_MODE = os.environ.get("SEEDLING_TIMING", "off")
+
+# Per-request memory budget and sampled tracemalloc measurements, logged to
+# the seedling.memory logger (SEEDLING_MEMORY_BUDGET_MB, SEEDLING_MEMORY_SAMPLE;
+# see memory.py)
+MEMORY_GUARD = open_default_guard()
+# Children per member the engine draws from, for memory projections
+AVG_CHILDREN = SimulationParams().avg_children
+
+
+def json_log(name: str, enabled: bool) -> logging.Logger:
+    """A logger writing one JSON document per line to stderr when enabled"""
+    log = logging.getLogger(name)
+    if enabled and not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+    return log
+
+
+timing_log = json_log("seedling.timing", TIMING_MODE != "off")
+memory_log = json_log("seedling.memory", MEMORY_GUARD is not None)
 
 app = FastAPI(
     title="Seedling API",
@@ -33,8 +110,57 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Run-Id"],
 )
 
+# Sampled, anonymized request traces for benchmarks/load_test.py to replay
+# (SEEDLING_TRACE_FILE, SEEDLING_TRACE_SAMPLE; off by default)
+TRACE_RECORDER = open_default_recorder()
+if TRACE_RECORDER is not None:
+    app.add_middleware(TraceMiddleware, recorder=TRACE_RECORDER)
+
+
+# Paths whose route template is remembered; bounded because path
+# parameters (preset names) come from clients
+ROUTE_CACHE_SIZE = 1024
+_route_templates: Dict[Tuple[str, str], str] = {}
+
+
+def route_of(scope) -> str:
+    """Path template of the route serving a request, as a low-cardinality label"""
+    key = (scope["method"], scope["path"])
+    template = _route_templates.get(key)
+    if template is None:
+        template = "unmatched"
+        for route in app.router.routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                template = route.path
+                break
+        if len(_route_templates) < ROUTE_CACHE_SIZE:
+            _route_templates[key] = template
+    return template
+
+
+# Prometheus metrics at /api/metrics, merged across worker processes
+# through files (SEEDLING_METRICS=off disables, SEEDLING_METRICS_DIR moves them)
+PROCESS_METRICS = open_process_metrics(REGISTRY)
+if PROCESS_METRICS is not None:
+    app.add_middleware(MetricsMiddleware, registry=REGISTRY, route_of=route_of)
+
+# Completed runs kept on disk in columnar form for /api/runs (see run_store.py;
+# SEEDLING_RUN_STORE_MB=0 disables)
+RUN_STORE = open_default_run_store()
+# Years per /api/runs/{id}/snapshots request
+MAX_SNAPSHOT_FRAMES = 500
+HEALTH_VALUES = [level.value for level in HEALTH_LEVELS]
+
+# Profiles of single requests that present SEEDLING_PROFILE_TOKEN, rate limited
+# (see profiling.py); off unless the token is set
+PROFILER = open_default_profiler()
+if PROFILER is not None:
+    app.add_middleware(ProfileMiddleware, profiler=PROFILER)
+
 
 class FounderInput(BaseModel):
     """Input parameters for the founding family member"""
@@ -55,11 +181,52 @@ class ScenarioModifiers(BaseModel):
     investment_return: Optional[float] = Field(default=None, description="Override investment return")
 
 
+class BehavioralDrift(BaseModel):
+    """Behavioral drift applied to both arms (the terminal version turns it all on)"""
+    lifestyle_inflation: bool = Field(default=False, description="Living costs rise with net worth")
+    diminishing_returns: bool = Field(default=False, description="Large portfolios earn less")
+    estate_tax_rate: float = Field(default=0, ge=0, le=1, description="Tax on estates above the exemption")
+    estate_tax_exemption: float = Field(default=1000000, ge=0, description="Estate value exempt from tax")
+
+
 class SimulationRequest(BaseModel):
     """Full simulation request"""
     founder: FounderInput = Field(default_factory=FounderInput)
     scenario: Optional[ScenarioModifiers] = Field(default=None)
+    drift: Optional[BehavioralDrift] = Field(default=None)
     num_generations: int = Field(default=4, ge=1, le=6, description="Generations to simulate")
+    response_mode: Literal["full", "delta"] = Field(
+        default="full",
+        description="'delta' sends the scenario tree as a diff against the baseline (JSON only)"
+    )
+    cpu_budget_ms: Optional[int] = Field(
+        default=None, ge=10, le=60000,
+        description="CPU budget; detail degrades to fit it, see the response's 'fidelity'"
+    )
+    depth: Optional[int] = Field(
+        default=None, ge=0, le=6,
+        description="Generations below the founder to send in JSON trees; deeper levels come from "
+                    "/api/runs/{runId}/members/{id}/subtree"
+    )
+    
+    @model_validator(mode="after")
+    def check_depth(self):
+        if self.depth is not None and self.response_mode == "delta":
+            raise ValueError("depth is not supported with response_mode 'delta'")
+        return self
+
+
+class EnsembleRequest(SimulationRequest):
+    """Ensemble request estimating the scenario effect over many seeds"""
+    runs: int = Field(default=16, ge=2, le=64, description="Number of simulated runs")
+    seed: int = Field(default=42, description="First seed of the ensemble")
+    antithetic: bool = Field(default=True, description="Pair runs with mirrored random draws")
+    
+    @model_validator(mode="after")
+    def check_pairs(self):
+        if self.antithetic and (self.runs % 2 or self.runs < MIN_ANTITHETIC_RUNS):
+            raise ValueError(f"antithetic ensembles need an even number of runs, at least {MIN_ANTITHETIC_RUNS}")
+        return self
 
 
 class PresetScenario(BaseModel):
@@ -132,6 +299,213 @@ PRESET_SCENARIOS = {
     }
 }
 
+# Preset responses are a closed set (preset x 1..6 generations), so they are
+# precomputed in the default JSON format and compressed up front. Keys come
+# from request_key and include ENGINE_VERSION, so only an engine change
+# invalidates them. SEEDLING_PRESET_WARMUP: startup (default), lazy or off.
+PRESET_WARMUP_MODE = os.environ.get("SEEDLING_PRESET_WARMUP", "startup")
+PRESET_GENERATIONS = range(1, 7)
+PRESET_RESULTS: Dict[str, CachedPayload] = {}
+preset_warmup: Dict[str, Any] = {
+    "state": "pending",
+    "completed": 0,
+    "total": len(PRESET_SCENARIOS) * len(PRESET_GENERATIONS),
+}
+_preset_warmup_task = None
+_metrics_tasks = []
+
+REGISTRY.gauge("seedling_result_cache_entries", "Results held in this process's memory cache")
+REGISTRY.gauge("seedling_result_cache_bytes", "Bytes held in this process's memory cache")
+REGISTRY.counter("seedling_result_cache_requests_total", "Memory cache lookups by result (hit, miss, store_hit)")
+REGISTRY.counter("seedling_result_cache_evictions_total", "Results evicted from memory caches")
+REGISTRY.gauge("seedling_result_store_entries", "Results in the shared SQLite store", aggregate="max")
+REGISTRY.gauge("seedling_result_store_bytes", "Bytes in the shared SQLite store", aggregate="max")
+REGISTRY.counter("seedling_compressions_total", "Response compressions by encoding")
+REGISTRY.counter("seedling_compression_bytes_in_total", "Bytes compressed, by encoding")
+REGISTRY.counter("seedling_compression_bytes_out_total", "Compressed bytes produced, by encoding")
+REGISTRY.counter("seedling_compression_cpu_seconds_total", "CPU seconds spent compressing, by encoding")
+REGISTRY.gauge("seedling_threadpool_busy", "Worker threads in use (run_in_threadpool)")
+REGISTRY.gauge("seedling_threadpool_waiting", "Calls queued for a worker thread")
+REGISTRY.gauge("seedling_preset_warmup_completed", "Preset responses precomputed so far")
+REGISTRY.gauge("seedling_preset_warmup_total", "Preset responses to precompute")
+REGISTRY.counter("seedling_traced_requests_total", "Requests written to the trace file")
+REGISTRY.gauge("seedling_run_store_runs", "Runs in the shared run store", aggregate="max")
+REGISTRY.gauge("seedling_run_store_bytes", "Bytes in the shared run store", aggregate="max")
+REGISTRY.histogram(
+    "seedling_request_peak_memory_bytes", "Peak traced allocation of sampled simulations, by endpoint", MEMORY_BUCKETS
+)
+REGISTRY.counter(
+    "seedling_memory_budget_actions_total", "Simulations cut to summary-only or rejected by the memory budget"
+)
+REGISTRY.gauge(
+    "seedling_memory_bytes_per_member", "Learned peak bytes per expected member, by mode", aggregate="max"
+)
+
+
+def collect_app_stats(registry) -> None:
+    """Copy cache, compression, thread pool, warmup and memory model state into the registry"""
+    cache = RESULT_CACHE.stats()
+    registry.set("seedling_result_cache_entries", cache["entries"])
+    registry.set("seedling_result_cache_bytes", cache["bytes"])
+    for result, count in (("hit", cache["hits"]), ("miss", cache["misses"]), ("store_hit", cache["storeHits"])):
+        registry.set("seedling_result_cache_requests_total", count, result=result)
+    registry.set("seedling_result_cache_evictions_total", cache["evictions"])
+    if cache["store"] is not None:
+        registry.set("seedling_result_store_entries", cache["store"]["entries"])
+        registry.set("seedling_result_store_bytes", cache["store"]["bytes"])
+    if RUN_STORE is not None:
+        runs = RUN_STORE.stats()
+        registry.set("seedling_run_store_runs", runs["runs"])
+        registry.set("seedling_run_store_bytes", runs["bytes"])
+    
+    for encoding, stats in COMPRESSION_STATS.snapshot().items():
+        registry.set("seedling_compressions_total", stats["count"], encoding=encoding)
+        registry.set("seedling_compression_bytes_in_total", stats["bytesIn"], encoding=encoding)
+        registry.set("seedling_compression_bytes_out_total", stats["bytesOut"], encoding=encoding)
+        registry.set("seedling_compression_cpu_seconds_total", stats["cpuSeconds"], encoding=encoding)
+    
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    registry.set("seedling_threadpool_busy", limiter.borrowed_tokens)
+    registry.set("seedling_threadpool_waiting", limiter.statistics().tasks_waiting)
+    
+    registry.set("seedling_preset_warmup_completed", preset_warmup["completed"])
+    registry.set("seedling_preset_warmup_total", preset_warmup["total"])
+    if TRACE_RECORDER is not None:
+        registry.set("seedling_traced_requests_total", TRACE_RECORDER.recorded)
+    if MEMORY_GUARD is not None:
+        for mode, per_member in MEMORY_GUARD.bytes_per_member.items():
+            registry.set("seedling_memory_bytes_per_member", round(per_member), mode=mode)
+
+
+REGISTRY.collectors.append(collect_app_stats)
+
+
+def record_simulation(endpoint: str, result, num_generations: int, started: float) -> None:
+    """Count a finished comparison's work in the metrics registry"""
+    fidelity = result.fidelity["level"] if result.fidelity is not None else "full"
+    REGISTRY.inc("seedling_simulations_total", endpoint=endpoint, fidelity=fidelity)
+    REGISTRY.inc("seedling_members_simulated_total", result.members_simulated)
+    REGISTRY.inc("seedling_member_years_simulated_total", result.member_years)
+    REGISTRY.inc("seedling_simulation_seconds_total", time.perf_counter() - started)
+    REGISTRY.observe(
+        "seedling_tree_members", len(result.baseline) + len(result.scenario), num_generations=num_generations
+    )
+
+
+def persist_run(
+    background_tasks: BackgroundTasks,
+    kind: str,
+    trees: List[Tuple[str, int, FlatTree]],
+    meta: Dict[str, Any]
+) -> Optional[str]:
+    """
+    Queue a finished run for the run store, written once the response
+    has gone out; returns its id for the response, or None when the
+    store is off
+    """
+    if RUN_STORE is None:
+        return None
+    run_id = RUN_STORE.new_id()
+    background_tasks.add_task(save_run, run_id, kind, trees, meta)
+    return run_id
+
+
+def with_run_id(response: Response, run_id: Optional[str]) -> Response:
+    """
+    Point a response at its stored run. A header, not a body field:
+    bodies are cached and outlive the run store's copy of the run.
+    """
+    if run_id is not None:
+        response.headers["X-Run-Id"] = run_id
+    return response
+
+
+def save_run(run_id: str, kind: str, trees: List[Tuple[str, int, FlatTree]], meta: Dict[str, Any]) -> None:
+    try:
+        RUN_STORE.save(run_id, kind, trees, meta)
+    except OSError:
+        pass  # The response already went out; the run is just not kept
+
+
+def comparison_run(result, request: BaseModel) -> Tuple[List[Tuple[str, int, FlatTree]], Dict[str, Any]]:
+    """Run store trees and metadata of a single comparison"""
+    trees = [("baseline", 0, result.baseline), ("scenario", 0, result.scenario)]
+    meta = {
+        "request": request.model_dump(),
+        "params": {"baseline": result.baseline_params.to_dict(), "scenario": result.scenario_params.to_dict()},
+        "summary": result.summary,
+        "fidelity": result.fidelity,
+    }
+    return trees, meta
+
+
+def memory_plan(endpoint: str, num_generations: int) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    (mode, response extra) for a simulation under the memory budget:
+    full, or summary-only with the projection reported in the response.
+    Raises 413 when even summary-only would not fit.
+    """
+    if MEMORY_GUARD is None:
+        return ACTION_FULL, None
+    action, projected = MEMORY_GUARD.decide(num_generations, AVG_CHILDREN)
+    if action == ACTION_FULL:
+        return action, None
+    REGISTRY.inc("seedling_memory_budget_actions_total", endpoint=endpoint, action=action)
+    report = {"action": action, "projectedBytes": projected, "budgetBytes": MEMORY_GUARD.budget_bytes}
+    memory_log.info(json.dumps({"endpoint": endpoint, "numGenerations": num_generations, **report}))
+    if action == ACTION_REJECT:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{num_generations} generations would need about {projected / 2 ** 20:.1f} MiB, "
+                   f"over the {MEMORY_GUARD.budget_bytes / 2 ** 20:.1f} MiB per-request memory budget",
+        )
+    return action, {"memory": report}
+
+
+def request_budget(request: BaseModel, mode: str) -> Optional[SimulationBudget]:
+    """
+    A fresh budget for one simulation of a request. Budgets learn a plan
+    and keep a clock, so each simulation needs its own.
+    """
+    if mode == ACTION_SUMMARY_ONLY:
+        return SimulationBudget.summary_only(request.num_generations)
+    budget_ms = request.cpu_budget_ms or DEFAULT_CPU_BUDGET_MS
+    return SimulationBudget(budget_ms / 1000) if budget_ms else None
+
+
+def measure_memory():
+    return MEMORY_GUARD.measure() if MEMORY_GUARD is not None else contextlib.nullcontext({})
+
+
+def record_memory(
+    endpoint: str,
+    mode: str,
+    num_generations: int,
+    usage: Dict[str, Any],
+    response: Response
+) -> None:
+    """
+    Log and count a sampled request's peak allocation and let it correct
+    the projection. A streamed body is encoded after the measurement
+    ends, so those only report.
+    """
+    peak = usage.get("peakBytes")
+    if peak is None:
+        return
+    streamed = isinstance(response, StreamingResponse)
+    REGISTRY.observe("seedling_request_peak_memory_bytes", peak, endpoint=endpoint)
+    memory_log.info(json.dumps({
+        "endpoint": endpoint,
+        "numGenerations": num_generations,
+        "mode": mode,
+        "peakBytes": peak,
+        "projectedBytes": MEMORY_GUARD.project(num_generations, AVG_CHILDREN, mode),
+        "overBudget": MEMORY_GUARD.over_budget(peak),
+        "streamed": streamed,
+    }))
+    if not streamed:
+        MEMORY_GUARD.learn(mode, num_generations, AVG_CHILDREN, peak)
+
 
 @app.get("/")
 async def root():
@@ -144,8 +518,42 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "seedling"}
+    """Health check endpoint; ``ready`` stays false while startup preset warming runs"""
+    return {
+        "status": "healthy",
+        "service": "seedling",
+        "ready": preset_warmup["state"] == "ready" or PRESET_WARMUP_MODE != "startup",
+        "presetWarmup": preset_warmup,
+    }
+
+
+@app.get("/api/stats")
+async def get_stats():
+    """Result cache, run store and response compression counters (ratio, CPU seconds per encoding)"""
+    return {
+        "resultCache": RESULT_CACHE.stats(),
+        "runStore": RUN_STORE.stats() if RUN_STORE is not None else None,
+        "compression": COMPRESSION_STATS.snapshot(),
+    }
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Prometheus metrics, merged across every worker process"""
+    if PROCESS_METRICS is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (SEEDLING_METRICS=off)")
+    return Response(content=PROCESS_METRICS.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/profiles/{profile_id}")
+async def download_profile(profile_id: str, x_seedling_profile: Optional[str] = Header(default=None)):
+    """Download a captured request profile (.pstats or .collapsed); needs the admin token"""
+    if PROFILER is None or x_seedling_profile is None or not PROFILER.authorized(x_seedling_profile.encode()):
+        raise HTTPException(status_code=404, detail="Not found")
+    path = PROFILER.path_of(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=profile_id)
 
 
 @app.get("/api/presets")
@@ -167,27 +575,19 @@ async def get_preset_details(preset_name: str):
     return PRESET_SCENARIOS[preset_name]
 
 
-@app.post("/api/simulate")
-async def run_simulation(request: SimulationRequest):
-    """
-    Run a generational wealth simulation.
-    
-    Returns both baseline and scenario results if scenario modifiers are provided.
-    """
-    
-    # Convert education string to enum
-    education_map = {
-        "high_school": EducationLevel.HIGH_SCHOOL,
-        "some_college": EducationLevel.SOME_COLLEGE,
-        "bachelors": EducationLevel.BACHELORS,
-        "masters": EducationLevel.MASTERS,
-        "doctorate": EducationLevel.DOCTORATE,
-    }
+# Founder education names, as requests and presets spell them
+EDUCATION_BY_NAME = {level.value: level for level in EducationLevel}
+
+
+def founder_education(name: str) -> EducationLevel:
+    """A founder's education by name; unknown names count as some college"""
+    return EDUCATION_BY_NAME.get(name.lower(), EducationLevel.SOME_COLLEGE)
+
+
+def build_simulation_params(request: SimulationRequest):
+    """Translate an API request into engine founder and scenario params"""
     
-    education = education_map.get(
-        request.founder.education.lower(), 
-        EducationLevel.SOME_COLLEGE
-    )
+    education = founder_education(request.founder.education)
     
     base_params = {
         "name": request.founder.name,
@@ -212,35 +612,16 @@ async def run_simulation(request: SimulationRequest):
         if request.scenario.investment_return is not None:
             scenario_params["simulation"]["investment_return"] = request.scenario.investment_return
     
-    try:
-        result = run_comparison_simulation(
-            base_params=base_params,
-            scenario_params=scenario_params,
-            num_generations=request.num_generations
-        )
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if request.drift:
+        # Only fields that differ from the defaults, as for the scenario
+        scenario_params["shared"] = request.drift.model_dump(exclude_defaults=True)
+    
+    return base_params, scenario_params
 
 
-@app.post("/api/simulate/preset")
-async def run_preset_simulation(request: PresetScenario):
-    """Run simulation using a preset scenario"""
-    
-    if request.preset_name not in PRESET_SCENARIOS:
-        raise HTTPException(status_code=404, detail=f"Preset '{request.preset_name}' not found")
-    
-    preset = PRESET_SCENARIOS[request.preset_name]
-    founder_data = preset["founder"]
-    
-    # Convert education
-    education_map = {
-        "high_school": EducationLevel.HIGH_SCHOOL,
-        "some_college": EducationLevel.SOME_COLLEGE,
-        "bachelors": EducationLevel.BACHELORS,
-        "masters": EducationLevel.MASTERS,
-        "doctorate": EducationLevel.DOCTORATE,
-    }
+def build_preset_params(preset_name: str):
+    """Founder and scenario params for a preset: its founder plus $100/month"""
+    founder_data = PRESET_SCENARIOS[preset_name]["founder"]
     
     base_params = {
         "name": founder_data["name"],
@@ -248,7 +629,7 @@ async def run_preset_simulation(request: PresetScenario):
         "income": founder_data["income"],
         "savings": founder_data["savings"],
         "debt": founder_data["debt"],
-        "education": education_map.get(founder_data["education"], EducationLevel.SOME_COLLEGE),
+        "education": founder_education(founder_data["education"]),
         "financial_literacy": founder_data["financial_literacy"],
     }
     
@@ -257,18 +638,616 @@ async def run_preset_simulation(request: PresetScenario):
         "simulation": {"monthly_habit_change": 100}
     }
     
+    return base_params, scenario_params
+
+
+def response_format(accept: Optional[str], response_mode: str = "full") -> Tuple[str, str, int]:
+    """(response mode, media type, float precision) for a request"""
+    if response_mode == "delta":
+        return "delta", "application/json", 64
     try:
-        result = run_comparison_simulation(
+        binary = negotiate(accept)
+    except ValueError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    if binary:
+        return ("full",) + binary
+    return "full", "application/json", 64
+
+
+def new_timings() -> Optional[Timings]:
+    """Timings for one request, or None when SEEDLING_TIMING is off"""
+    if TIMING_MODE == "off":
+        return None
+    return Timings(detailed=TIMING_MODE == "detailed")
+
+
+def _phase(timings: Optional[Timings], name: str):
+    return timings.phase(name) if timings is not None else contextlib.nullcontext()
+
+
+def _log_timings(endpoint: str, cache_status: Optional[str], timings: Timings) -> None:
+    timing_log.info(json.dumps({"endpoint": endpoint, "cache": cache_status, **timings.report()}))
+
+
+def timed_response(response: Response, endpoint: str, timings: Optional[Timings]) -> Response:
+    """
+    Send the phases as a Server-Timing header and log them. A streamed
+    body is encoded while it is sent, so its ``stream`` phase only reaches
+    the log, which is written once the last chunk has gone out.
+    """
+    if timings is None:
+        return response
+    response.headers["Server-Timing"] = timings.server_timing()
+    cache_status = response.headers.get("x-cache")
+    if not isinstance(response, StreamingResponse):
+        _log_timings(endpoint, cache_status, timings)
+        return response
+    
+    chunks = response.body_iterator
+    
+    async def timed_chunks():
+        start = time.perf_counter()
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            timings.add("stream", time.perf_counter() - start)
+            _log_timings(endpoint, cache_status, timings)
+    
+    response.body_iterator = timed_chunks()
+    return response
+
+
+def cached_response(
+    key: str,
+    payload: CachedPayload,
+    accept_encoding: Optional[str],
+    cache_status: str = "hit",
+    timings: Optional[Timings] = None
+) -> Response:
+    """Serve cached bytes, compressed for the client when it accepts it"""
+    encoding = negotiate_encoding(accept_encoding)
+    with _phase(timings, "compress"):
+        body = RESULT_CACHE.body_for(key, payload, encoding)
+    headers = {"Vary": "Accept, Accept-Encoding", "X-Cache": cache_status}
+    if body is not payload.body:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=payload.media_type, headers=headers)
+
+
+def _compress_and_cache(
+    key: str,
+    media_type: str,
+    chunks: Iterator[bytes],
+    encoding: str,
+    level: int
+) -> Iterator[bytes]:
+    """Stream compressed chunks, caching both forms once the body is complete (key None: no caching)"""
+    raw = []
+    compressed = []
+    
+    def source() -> Iterator[bytes]:
+        for chunk in chunks:
+            raw.append(chunk)
+            yield chunk
+    
+    for chunk in iter_compress(source(), encoding, level):
+        compressed.append(chunk)
+        yield chunk
+    if key is not None:
+        RESULT_CACHE.put(key, CachedPayload(media_type, b"".join(raw), {encoding: b"".join(compressed)}))
+
+
+def comparison_response(
+    result,
+    key: str,
+    response_format: Tuple[str, str, int],
+    accept_encoding: Optional[str],
+    extra: Optional[Dict[str, Any]] = None,
+    timings: Optional[Timings] = None,
+    depth: Optional[int] = None
+) -> Response:
+    """
+    Encode a comparison as JSON, delta JSON or columnar binary and cache
+    the bytes. ``depth`` cuts full JSON trees (see iter_tree_json).
+    """
+    response_mode, media_type, precision = response_format
+    encoding = negotiate_encoding(accept_encoding)
+    # Degraded results depend on timing, so they are never reused
+    if result.fidelity is not None and result.fidelity["level"] != "full":
+        key = None
+    if depth is not None and media_type == "application/json":
+        # Only the generations down to the cut are sent
+        members = sum(
+            tree.gen_offsets[min(depth + 1, tree.num_generations)] for tree in (result.baseline, result.scenario)
+        )
+    else:
+        members = len(result.baseline) + len(result.scenario)
+    
+    if encoding and media_type == "application/json" and members >= STREAM_MIN_MEMBERS:
+        if response_mode == "delta":
+            chunks = iter_comparison_delta_json(result, extra)
+        else:
+            chunks = iter_comparison_json(result, extra, depth=depth)
+        level = choose_level(encoding, members * JSON_BYTES_PER_MEMBER)
+        return StreamingResponse(
+            _compress_and_cache(key, media_type, chunks, encoding, level),
+            media_type=media_type,
+            headers={"Vary": "Accept, Accept-Encoding", "X-Cache": "miss", "Content-Encoding": encoding},
+        )
+    
+    with _phase(timings, "encode"):
+        if response_mode == "delta":
+            content = encode_comparison_delta_json(result, extra)
+        elif media_type == "application/json":
+            content = encode_comparison_json(result, extra, depth)
+        else:
+            content = encode_comparison_binary(result, media_type, precision, extra)
+    payload = CachedPayload(media_type, content)
+    if key is not None:
+        RESULT_CACHE.put(key, payload)
+    return cached_response(key, payload, accept_encoding, "miss", timings)
+
+
+def build_preset_payload(key: str, preset_name: str, num_generations: int) -> CachedPayload:
+    """
+    A preset's JSON response in every supported encoding, read from the
+    shared result store when another process or an earlier run made it
+    """
+    store = RESULT_CACHE.store
+    stored = store.get(key) if store is not None else None
+    if stored is not None:
+        return CachedPayload(*stored)
+    
+    base_params, scenario_params = build_preset_params(preset_name)
+    started = time.perf_counter()
+    result = simulate_comparison(
+        base_params=base_params,
+        scenario_params=scenario_params,
+        num_generations=num_generations
+    )
+    record_simulation("preset_warmup", result, num_generations, started)
+    payload = CachedPayload("application/json", encode_comparison_json(result, {"preset": preset_name}))
+    if len(payload.body) >= MIN_COMPRESS_SIZE:
+        for encoding in SUPPORTED_ENCODINGS:
+            payload.encodings[encoding] = compress(payload.body, encoding)
+    if store is not None:
+        store.put(key, payload.media_type, payload.encodings or {"identity": payload.body})
+    return payload
+
+
+async def warm_presets():
+    """Fill PRESET_RESULTS with every preset x generation response, off the event loop"""
+    preset_warmup["state"] = "warming"
+    try:
+        for preset_name in PRESET_SCENARIOS:
+            for num_generations in PRESET_GENERATIONS:
+                key = request_key(
+                    "preset",
+                    PresetScenario(preset_name=preset_name, num_generations=num_generations).model_dump(),
+                    response_format(None),
+                )
+                if key not in PRESET_RESULTS:
+                    PRESET_RESULTS[key] = await run_in_threadpool(
+                        build_preset_payload, key, preset_name, num_generations
+                    )
+                preset_warmup["completed"] += 1
+    except Exception as e:
+        preset_warmup["state"] = "failed"
+        preset_warmup["error"] = str(e)
+        raise
+    preset_warmup["state"] = "ready"
+
+
+def start_preset_warmup():
+    """Start warming in the background once per process"""
+    global _preset_warmup_task
+    if _preset_warmup_task is None and PRESET_WARMUP_MODE != "off":
+        _preset_warmup_task = asyncio.get_running_loop().create_task(warm_presets())
+
+
+@app.on_event("startup")
+async def warm_presets_on_startup():
+    if PRESET_WARMUP_MODE == "startup":
+        start_preset_warmup()
+
+
+@app.on_event("startup")
+async def start_metrics_tasks():
+    """Sample event loop lag and keep this process's metrics file fresh"""
+    if PROCESS_METRICS is not None:
+        loop = asyncio.get_running_loop()
+        _metrics_tasks.append(loop.create_task(monitor_event_loop(REGISTRY)))
+        _metrics_tasks.append(loop.create_task(flush_periodically(PROCESS_METRICS)))
+
+
+@app.post("/api/simulate")
+async def run_simulation(
+    request: SimulationRequest,
+    background_tasks: BackgroundTasks,
+    accept: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None)
+):
+    """
+    Run a generational wealth simulation.
+    
+    Returns both baseline and scenario results if scenario modifiers are provided.
+    Send ``Accept: application/x-seedling-columnar`` (or ``application/msgpack``,
+    when msgpack is installed) for the compact binary columnar format. Responses are cached and served
+    gzip, brotli or zstd compressed per ``Accept-Encoding``. A freshly
+    simulated run is kept in the run store under the ``X-Run-Id`` header.
+    """
+    
+    timings = new_timings()
+    fmt = response_format(accept, request.response_mode)
+    key = request_key("simulate", request.model_dump(), fmt)
+    with _phase(timings, "cache"):
+        cached = RESULT_CACHE.get(key)
+    if cached is not None:
+        return timed_response(cached_response(key, cached, accept_encoding, timings=timings), "simulate", timings)
+    
+    base_params, scenario_params = build_simulation_params(request)
+    mode, extra = memory_plan("simulate", request.num_generations)
+    
+    try:
+        with measure_memory() as usage:
+            started = time.perf_counter()
+            # Off the event loop, so other requests are served meanwhile
+            result = await run_in_threadpool(
+                simulate_comparison,
+                base_params=base_params,
+                scenario_params=scenario_params,
+                num_generations=request.num_generations,
+                budget=request_budget(request, mode),
+                timings=timings
+            )
+            record_simulation("simulate", result, request.num_generations, started)
+            run_id = persist_run(background_tasks, "comparison", *comparison_run(result, request))
+            response = comparison_response(result, key, fmt, accept_encoding, extra, timings, request.depth)
+            response = with_run_id(response, run_id)
+        record_memory("simulate", mode, request.num_generations, usage, response)
+        return timed_response(response, "simulate", timings)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _same_topology(preview, exact) -> bool:
+    return all(
+        list(coarse.lineages) == list(full.lineages)
+        for coarse, full in ((preview.baseline, exact.baseline), (preview.scenario, exact.scenario))
+    )
+
+
+@app.post("/api/simulate/progressive")
+async def run_progressive_simulation(request: SimulationRequest, background_tasks: BackgroundTasks):
+    """
+    Run a simulation as a coarse preview, then the exact result.
+    
+    Streams two lines of newline-delimited JSON, each a full /api/simulate
+    JSON body. The first, ``"stage": "preview"``, steps lifetimes in
+    multi-year strides and is within ``errorBound`` of the exact totals;
+    the second, ``"stage": "exact"``, replaces it and carries the
+    ``runId``. ``topologyMatches`` says both have the same members in the
+    same places: match them by lineage (ids differ between runs) to
+    animate one into the other. Each stage runs under its own CPU budget
+    and reports its own ``fidelity``. Not cached or compressed, so the
+    preview is not held back behind the exact run.
+    """
+    
+    if request.response_mode == "delta":
+        raise HTTPException(status_code=400, detail="response_mode 'delta' is not supported here")
+    base_params, scenario_params = build_simulation_params(request)
+    mode, extra = memory_plan("progressive", request.num_generations)
+    run_id = RUN_STORE.new_id() if RUN_STORE is not None else None
+    
+    def stages() -> Iterator[bytes]:
+        preview = simulate_comparison(
+            base_params=base_params,
+            scenario_params=scenario_params,
+            num_generations=request.num_generations,
+            budget=request_budget(request, mode),
+            stride=PREVIEW_STRIDE
+        )
+        stage = {"stage": "preview", "stride": PREVIEW_STRIDE, "errorBound": PREVIEW_ERROR_BOUND}
+        yield encode_comparison_json(preview, {**(extra or {}), **stage}, request.depth) + b"\n"
+        
+        started = time.perf_counter()
+        result = simulate_comparison(
             base_params=base_params,
             scenario_params=scenario_params,
-            num_generations=request.num_generations
+            num_generations=request.num_generations,
+            budget=request_budget(request, mode)
         )
-        result["preset"] = request.preset_name
-        return result
+        record_simulation("progressive", result, request.num_generations, started)
+        stage = {"stage": "exact", "topologyMatches": _same_topology(preview, result)}
+        if run_id is not None:
+            # Written once the stream has gone out
+            background_tasks.add_task(save_run, run_id, "comparison", *comparison_run(result, request))
+            stage["runId"] = run_id
+        yield encode_comparison_json(result, {**(extra or {}), **stage}, request.depth) + b"\n"
+    
+    return StreamingResponse(stages(), media_type="application/x-ndjson")
+
+
+@app.post("/api/simulate/ensemble")
+async def run_ensemble_simulation(request: EnsembleRequest, background_tasks: BackgroundTasks):
+    """
+    Estimate the scenario effect across an ensemble of seeds.
+    
+    Baseline and scenario share random draws within each run, so the
+    confidence interval reflects the scenario delta rather than luck.
+    Every run's trees are kept in the run store under ``runId``.
+    """
+    
+    base_params, scenario_params = build_simulation_params(request)
+    
+    try:
+        trees = [] if RUN_STORE is not None else None
+        ensemble = await run_in_threadpool(
+            run_comparison_ensemble,
+            base_params=base_params,
+            scenario_params=scenario_params,
+            num_generations=request.num_generations,
+            runs=request.runs,
+            seed=request.seed,
+            antithetic=request.antithetic,
+            trees=trees
+        )
+        if trees is not None:
+            stored = [
+                (arm, run, tree)
+                for run, pair in enumerate(trees)
+                for arm, tree in zip(("baseline", "scenario"), pair)
+            ]
+            meta = {"request": request.model_dump(), "ensemble": ensemble}
+            ensemble["runId"] = persist_run(background_tasks, "ensemble", stored, meta)
+        return ensemble
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/simulate/preset")
+async def run_preset_simulation(
+    request: PresetScenario,
+    background_tasks: BackgroundTasks,
+    accept: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None)
+):
+    """Run simulation using a preset scenario"""
+    
+    if request.preset_name not in PRESET_SCENARIOS:
+        raise HTTPException(status_code=404, detail=f"Preset '{request.preset_name}' not found")
+    
+    timings = new_timings()
+    fmt = response_format(accept)
+    key = request_key("preset", request.model_dump(), fmt)
+    with _phase(timings, "cache"):
+        cached = RESULT_CACHE.get(key)
+    if cached is not None:
+        return timed_response(cached_response(key, cached, accept_encoding, timings=timings), "preset", timings)
+    
+    if PRESET_WARMUP_MODE == "lazy":
+        start_preset_warmup()
+    precomputed = PRESET_RESULTS.get(key)
+    if precomputed is not None:
+        response = cached_response(key, precomputed, accept_encoding, "preset", timings)
+        return timed_response(response, "preset", timings)
+    
+    base_params, scenario_params = build_preset_params(request.preset_name)
+    mode, extra = memory_plan("preset", request.num_generations)
+    
+    try:
+        with measure_memory() as usage:
+            started = time.perf_counter()
+            result = await run_in_threadpool(
+                simulate_comparison,
+                base_params=base_params,
+                scenario_params=scenario_params,
+                num_generations=request.num_generations,
+                budget=SimulationBudget.summary_only(request.num_generations) if mode == ACTION_SUMMARY_ONLY else None,
+                timings=timings
+            )
+            record_simulation("preset", result, request.num_generations, started)
+            extra = {"preset": request.preset_name, **(extra or {})}
+            run_id = persist_run(background_tasks, "comparison", *comparison_run(result, request))
+            response = with_run_id(comparison_response(result, key, fmt, accept_encoding, extra, timings), run_id)
+        record_memory("preset", mode, request.num_generations, usage, response)
+        return timed_response(response, "preset", timings)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def stored_run(run_id: str):
+    run = RUN_STORE.open(run_id) if RUN_STORE is not None else None
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run '{run_id}' not found")
+    return run
+
+
+def stored_tree(run_id: str, arm: str, run: int) -> FlatTree:
+    tree = stored_run(run_id).tree(arm, run)
+    if tree is None:
+        raise HTTPException(status_code=404, detail=f"Run '{run_id}' has no {arm} tree for run {run}")
+    return tree
+
+
+@app.get("/api/runs")
+async def list_runs(limit: int = Query(default=100, ge=1, le=1000)):
+    """Stored runs, most recently used first"""
+    if RUN_STORE is None:
+        return {"runs": []}
+    runs = []
+    for entry in RUN_STORE.list():
+        if len(runs) == limit:
+            break
+        runs.append(entry)
+    return {"runs": runs}
+
+
+@app.get("/api/runs/{run_id}")
+async def get_run(run_id: str):
+    """A stored run's request, summary and trees (sizes only)"""
+    run = stored_run(run_id)
+    trees = [{k: v for k, v in tree.items() if k != "columns"} for tree in run.meta["trees"]]
+    return {**run.meta, "trees": trees}
+
+
+@app.get("/api/runs/{run_id}/generations/{generation}")
+async def get_run_generation(
+    run_id: str,
+    generation: int,
+    arm: Literal["baseline", "scenario"] = "scenario",
+    run: int = Query(default=0, ge=0, description="Ensemble run")
+):
+    """One generation's stats, read from the stored member columns"""
+    tree = stored_tree(run_id, arm, run)
+    if not 0 <= generation < tree.num_generations:
+        raise HTTPException(status_code=404, detail=f"Generation {generation} not in run")
+    return tree.generation_stats(generation)
+
+
+@app.get("/api/runs/{run_id}/members")
+async def query_run_members(
+    run_id: str,
+    arm: Literal["baseline", "scenario"] = "scenario",
+    run: Optional[int] = Query(default=None, ge=0, description="Ensemble run; all runs when omitted"),
+    generation: Optional[int] = Query(default=None, ge=0),
+    financial_health: Optional[List[Literal["thriving", "stable", "struggling", "distressed"]]] = Query(default=None),
+    education: Optional[List[Literal["high_school", "some_college", "bachelors", "masters", "doctorate"]]] = Query(
+        default=None
+    ),
+    owns_home: Optional[bool] = None,
+    min_net_worth: Optional[float] = None,
+    max_net_worth: Optional[float] = None,
+    sort: Literal["index", "net_worth", "-net_worth"] = "index",
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=1000)
+):
+    """
+    Filter, sort and page a stored run's members, e.g. the distressed
+    members of generation 3 across an ensemble
+    (``generation=3&financial_health=distressed``) or the ten richest
+    (``sort=-net_worth&limit=10``). Repeated ``financial_health`` or
+    ``education`` values match any of them. Served from the indexes
+    written with the run, without loading its members.
+    """
+    runs = stored_run(run_id).runs(arm) if run is None else [run]
+    trees = []
+    for number in runs:
+        index = stored_index(run_id, arm, number)
+        trees.append((number, index.tree, index))
+    query = MemberFilter(
+        generation=generation,
+        health=tuple(financial_health or ()),
+        education=tuple(education or ()),
+        owns_home=owns_home,
+        min_net_worth=min_net_worth,
+        max_net_worth=max_net_worth,
+    )
+    total, members = query_members(trees, query, sort, offset, limit)
+    return {"total": total, "offset": offset, "limit": limit, "members": members}
+
+
+def stored_index(run_id: str, arm: str, run: int):
+    index = stored_run(run_id).index(arm, run)
+    if index is None:
+        raise HTTPException(status_code=404, detail=f"Run '{run_id}' has no {arm} tree for run {run}")
+    return index
+
+
+def stored_history_index(run_id: str, arm: str, run: int):
+    """A stored tree's index, for reading its history; ensemble runs are stored without one"""
+    index = stored_index(run_id, arm, run)
+    if not len(index.tree.h_year):
+        raise HTTPException(status_code=404, detail=f"Run '{run_id}' was stored without history")
+    return index
+
+
+def stored_member(run_id: str, member_id: str, arm: str, run: int) -> Tuple[FlatTree, int]:
+    """(tree, index) of a stored member, found through the run's id index"""
+    index = stored_index(run_id, arm, run)
+    member = index.find(member_id)
+    if member is None:
+        raise HTTPException(status_code=404, detail=f"Member '{member_id}' not in run")
+    return index.tree, member
+
+
+@app.get("/api/runs/{run_id}/members/{member_id}")
+async def get_run_member(
+    run_id: str,
+    member_id: str,
+    arm: Literal["baseline", "scenario"] = "scenario",
+    run: int = Query(default=0, ge=0, description="Ensemble run")
+):
+    """One stored member with its financial history; children are given by id"""
+    tree, index = stored_member(run_id, member_id, arm, run)
+    member = tree.member_dict(index)
+    del member["children"]
+    member["index"] = index
+    member["childIds"] = [tree.ids[child] for child in tree.children_of(index)]
+    return member
+
+
+@app.get("/api/runs/{run_id}/members/{member_id}/subtree")
+async def get_run_subtree(
+    run_id: str,
+    member_id: str,
+    arm: Literal["baseline", "scenario"] = "scenario",
+    run: int = Query(default=0, ge=0, description="Ensemble run"),
+    depth: Optional[int] = Query(
+        default=None, ge=0, le=6, description="Generations below the member; all when omitted"
+    )
+):
+    """
+    A stored member's subtree in the nested ``children`` shape of
+    /api/simulate, for expanding a node cut off by ``depth``
+    """
+    tree, index = stored_member(run_id, member_id, arm, run)
+    return Response(content="".join(iter_tree_json(tree, index, depth)).encode(), media_type="application/json")
+
+
+@app.get("/api/runs/{run_id}/snapshot")
+async def get_run_snapshot(
+    run_id: str,
+    year: int,
+    arm: Literal["baseline", "scenario"] = "scenario",
+    run: int = Query(default=0, ge=0, description="Ensemble run")
+):
+    """Every member alive in a calendar year, as of that year's history row"""
+    index = stored_history_index(run_id, arm, run)
+    rows, members = index.alive_in(year)
+    return {
+        "year": year,
+        "count": len(rows),
+        "members": [snapshot_row(index.tree, row, member) for row, member in zip(rows, members)],
+    }
+
+
+@app.get("/api/runs/{run_id}/snapshots")
+async def get_run_snapshots(
+    run_id: str,
+    start: Optional[int] = Query(default=None, description="First year; the run's first when omitted"),
+    end: Optional[int] = Query(default=None, description="Last year, inclusive; the run's last when omitted"),
+    step: int = Query(default=1, ge=1),
+    arm: Literal["baseline", "scenario"] = "scenario",
+    run: int = Query(default=0, ge=0, description="Ensemble run")
+):
+    """
+    Compact per-year frames for a timeline scrubber: each frame lists the
+    members alive that year as parallel arrays (index, age, netWorth and
+    health as a position in ``healthLevels``); ``ids`` maps the indices
+    that appear to member ids
+    """
+    index = stored_history_index(run_id, arm, run)
+    years = range(index.years[0] if start is None else start, (index.years[-1] if end is None else end) + 1, step)
+    if len(years) > MAX_SNAPSHOT_FRAMES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SNAPSHOT_FRAMES} frames per request")
+    frames = [snapshot_frame(index, year) for year in years]
+    seen = sorted({member for frame in frames for member in frame["index"]})
+    ids = {member: index.tree.ids[member] for member in seen}
+    return {"healthLevels": HEALTH_VALUES, "ids": ids, "frames": frames}
+
+
 @app.post("/api/calculate/habit-impact")
 async def calculate_habit_impact(
     monthly_amount: float = 50,
@@ -0,0 +1,125 @@
+"""
+Seedling - Generational Wealth Time Machine
+Request Memory Accounting
+
+Projects how much memory a comparison will take before running it, and
+measures what sampled requests actually took.
+
+A full run keeps every member with yearly history in both arms, then
+the encoded body and its compressed copy: about 40 KiB per expected
+member. Summary-only (SimulationBudget.summary_only) keeps the founder
+and generation totals: about 2 KiB. Expected members per arm are
+``sum(avg_children ** g)`` over the generations; the per-member figures
+absorb how far real trees stray from that, and are re-learned from
+measurements, so a model that runs low corrects itself.
+
+Measurement uses tracemalloc on a sampled fraction of requests, one at a
+time per process (tracing is process-wide and slows allocation while
+on). Allocations of other requests interleaved at await points would
+be counted too; simulation and encoding run without awaiting.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+import os
+import random
+import threading
+import tracemalloc
+
+# Fixed cost of any comparison (params, summary, response objects)
+BASE_BYTES = 256 * 1024
+# Peak bytes per expected member, from benchmarks/bench_engine.py-style
+# tracemalloc runs of simulate_comparison + encode + gzip
+FULL_BYTES_PER_MEMBER = 40 * 1024
+SUMMARY_BYTES_PER_MEMBER = 2 * 1024
+# Weight of a new measurement in the learned per-member figures
+LEARNING_RATE = 0.25
+# Smaller runs are mostly fixed cost and would skew the per-member figures
+LEARN_MIN_MEMBERS = 50
+
+ACTION_FULL = "full"
+ACTION_SUMMARY_ONLY = "summary_only"
+ACTION_REJECT = "reject"
+
+
+def expected_members(num_generations: int, avg_children: float, arms: int = 2) -> float:
+    return arms * sum(avg_children ** g for g in range(num_generations + 1))
+
+
+class MemoryGuard:
+    """Per-request memory projection, budget decisions and sampled measurement"""
+    
+    def __init__(self, budget_bytes: Optional[int], sample_rate: float):
+        self.budget_bytes = budget_bytes
+        self.sample_rate = sample_rate
+        self.bytes_per_member = {ACTION_FULL: float(FULL_BYTES_PER_MEMBER), ACTION_SUMMARY_ONLY: float(SUMMARY_BYTES_PER_MEMBER)}
+        self._measuring = threading.Lock()
+    
+    def project(self, num_generations: int, avg_children: float, mode: str = ACTION_FULL) -> int:
+        """Projected peak bytes of one comparison run in ``mode``"""
+        return int(BASE_BYTES + expected_members(num_generations, avg_children) * self.bytes_per_member[mode])
+    
+    def decide(self, num_generations: int, avg_children: float) -> Tuple[str, int]:
+        """
+        (action, projected bytes): run in full when it fits the budget,
+        summary-only when only that fits, otherwise reject
+        """
+        projected = self.project(num_generations, avg_children)
+        if self.budget_bytes is None or projected <= self.budget_bytes:
+            return ACTION_FULL, projected
+        projected = self.project(num_generations, avg_children, ACTION_SUMMARY_ONLY)
+        if projected <= self.budget_bytes:
+            return ACTION_SUMMARY_ONLY, projected
+        return ACTION_REJECT, projected
+    
+    @contextmanager
+    def measure(self) -> Iterator[Dict[str, Any]]:
+        """
+        Trace a sampled block's allocations; the yielded dict gets
+        ``peakBytes`` when this one was measured. Tracing is process-wide,
+        so requests served meanwhile on other threads count too and a
+        sample can err high.
+        """
+        usage: Dict[str, Any] = {}
+        if (
+            random.random() >= self.sample_rate
+            or tracemalloc.is_tracing()
+            or not self._measuring.acquire(blocking=False)
+        ):
+            yield usage
+            return
+        try:
+            tracemalloc.start()
+            try:
+                yield usage
+            finally:
+                usage["peakBytes"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        finally:
+            self._measuring.release()
+    
+    def learn(self, mode: str, num_generations: int, avg_children: float, peak_bytes: int) -> None:
+        """Move the per-member figure for ``mode`` toward a measured peak"""
+        members = expected_members(num_generations, avg_children)
+        if members < LEARN_MIN_MEMBERS:
+            return
+        observed = max(peak_bytes - BASE_BYTES, 0) / members
+        current = self.bytes_per_member[mode]
+        self.bytes_per_member[mode] = current + LEARNING_RATE * (observed - current)
+    
+    def over_budget(self, peak_bytes: int) -> bool:
+        return self.budget_bytes is not None and peak_bytes > self.budget_bytes
+
+
+def open_default_guard() -> Optional[MemoryGuard]:
+    """
+    The guard configured by the environment: SEEDLING_MEMORY_BUDGET_MB
+    per request (unset or 0: no budget) and SEEDLING_MEMORY_SAMPLE, the
+    fraction of simulations measured (default 0.01). None when neither
+    is on.
+    """
+    budget_mb = float(os.environ.get("SEEDLING_MEMORY_BUDGET_MB", "0"))
+    sample_rate = float(os.environ.get("SEEDLING_MEMORY_SAMPLE", "0.01"))
+    if budget_mb <= 0 and sample_rate <= 0:
+        return None
+    return MemoryGuard(int(budget_mb * 1024 * 1024) if budget_mb > 0 else None, sample_rate)
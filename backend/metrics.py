@@ -0,0 +1,305 @@
+"""
+Seedling - Generational Wealth Time Machine
+Prometheus Metrics
+
+Counters, gauges and histograms rendered in the Prometheus text format
+for /api/metrics, with no client library needed.
+
+Recording is a dict update under a lock, cheap enough for every request.
+Under several uvicorn workers a scrape reaches only one of them, so each
+process also writes its metrics to ``<dir>/<pid>.json`` every few
+seconds (one small atomic file replace), and the scraped process merges
+every file in the directory:
+
+- counters and histograms are summed over all files, including those of
+  processes that have exited, so totals never go backwards
+- gauges are combined over live processes only (a file refreshed within
+  the last few flush intervals), summed or maxed per gauge
+
+Other processes' values are therefore up to FLUSH_INTERVAL old.
+
+The directory is SEEDLING_METRICS_DIR, by default ``metrics`` under the
+data directory; clear it when deploying if totals should start over.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+
+from result_store import default_data_dir
+
+# Seconds between writes of a process's metrics file
+FLUSH_INTERVAL = 5.0
+# A process whose file is older than this no longer contributes gauges
+STALE_AFTER = 4 * FLUSH_INTERVAL
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(9))  # 1 KiB .. 64 MiB
+MEMBER_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+MEMORY_BUCKETS = tuple(1024 * 1024 * 2 ** i for i in range(11))  # 1 MiB .. 1 GiB
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Registry:
+    """
+    One process's metrics. Each metric is declared once with its type
+    and help text; ``collectors`` run before every snapshot to copy in
+    values kept elsewhere (cache and compression counters, pool sizes).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name -> (type, help, buckets or gauge aggregation)
+        self.metrics: Dict[str, Tuple[str, str, Any]] = {}
+        self.values: Dict[str, Dict[Labels, Any]] = {}
+        self.collectors: List[Callable[["Registry"], None]] = []
+    
+    def counter(self, name: str, help: str) -> None:
+        self.metrics[name] = ("counter", help, None)
+        self.values[name] = {}
+    
+    def gauge(self, name: str, help: str, aggregate: str = "sum") -> None:
+        """``aggregate`` combines live processes: "sum", or "max" for shared state"""
+        self.metrics[name] = ("gauge", help, aggregate)
+        self.values[name] = {}
+    
+    def histogram(self, name: str, help: str, buckets: Iterable[float]) -> None:
+        self.metrics[name] = ("histogram", help, tuple(buckets))
+        self.values[name] = {}
+    
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self.values[name]
+            series[key] = series.get(key, 0) + amount
+    
+    def set(self, name: str, value: float, **labels) -> None:
+        """Set a gauge, or a counter mirrored from a running total"""
+        with self._lock:
+            self.values[name][_labels(labels)] = value
+    
+    def observe(self, name: str, value: float, **labels) -> None:
+        buckets = self.metrics[name][2]
+        key = _labels(labels)
+        with self._lock:
+            series = self.values[name]
+            # Per-bucket (not cumulative) counts, then sum and count
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+            index = len(buckets)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    index = i
+                    break
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+    
+    def snapshot(self) -> Dict[str, List[Tuple[Dict[str, str], Any]]]:
+        for collect in self.collectors:
+            collect(self)
+        with self._lock:
+            return {
+                name: [(dict(key), list(value) if isinstance(value, list) else value)
+                       for key, value in series.items()]
+                for name, series in self.values.items()
+            }
+
+
+class ProcessMetrics:
+    """A registry plus this process's file in the shared metrics directory"""
+    
+    def __init__(self, registry: Registry, directory: str):
+        self.registry = registry
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.json")
+        os.makedirs(directory, exist_ok=True)
+    
+    def flush(self) -> Dict[str, Any]:
+        """Write this process's snapshot (temp file, then atomic replace)"""
+        snapshot = self.registry.snapshot()
+        temp = f"{self.path}.tmp"
+        with open(temp, "w") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(temp, self.path)
+        return snapshot
+    
+    def _snapshots(self) -> Iterable[Tuple[bool, Dict[str, Any]]]:
+        """(live, snapshot) for every process, this one freshly flushed"""
+        yield True, self.flush()
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json") or entry.path == self.path:
+                continue
+            try:
+                live = now - entry.stat().st_mtime < STALE_AFTER
+                with open(entry.path) as f:
+                    yield live, json.load(f)
+            except (OSError, ValueError):
+                continue  # Replaced or removed while reading
+    
+    def render(self) -> str:
+        """All processes' metrics, merged, in the Prometheus text format"""
+        merged: Dict[str, Dict[Labels, Any]] = {name: {} for name in self.registry.metrics}
+        for live, snapshot in self._snapshots():
+            for name, series in snapshot.items():
+                kind, _, option = self.registry.metrics.get(name, (None, None, None))
+                if kind is None or (kind == "gauge" and not live):
+                    continue
+                target = merged[name]
+                for labels, value in series:
+                    key = _labels(labels)
+                    old = target.get(key)
+                    if old is None:
+                        target[key] = value
+                    elif kind == "histogram":
+                        target[key] = [a + b for a, b in zip(old, value)]
+                    elif kind == "gauge" and option == "max":
+                        target[key] = max(old, value)
+                    else:
+                        target[key] = old + value
+        return render_text(self.registry.metrics, merged)
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [
+        '%s="%s"' % (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    ]
+    if extra:
+        parts.append(extra)
+    return "{%s}" % ",".join(parts) if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_text(metrics: Dict[str, Tuple[str, str, Any]], values: Dict[str, Dict[Labels, Any]]) -> str:
+    lines = []
+    for name in sorted(metrics):
+        kind, help, option = metrics[name]
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        for key, value in sorted(values.get(name, {}).items()):
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(option + (math.inf,), value):
+                cumulative += count
+                le = 'le="%s"' % ("+Inf" if math.isinf(bound) else _format_value(float(bound)))
+                lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_value(float(value[-2]))}")
+            lines.append(f"{name}_count{_format_labels(key)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Request latency, response size and in-flight requests per route.
+    ``route_of(scope)`` names the route template (so path parameters do
+    not explode the label space); requests matching no route share one.
+    """
+    
+    def __init__(self, app, registry: Registry, route_of: Callable[[Dict[str, Any]], str]):
+        self.app = app
+        self.registry = registry
+        self.route_of = route_of
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        registry = self.registry
+        route = self.route_of(scope)
+        method = scope["method"]
+        start = time.perf_counter()
+        response = {"status": 500, "bytes": 0}
+        
+        async def send_and_count(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+            await send(message)
+        
+        registry.inc("seedling_requests_in_flight", route=route)
+        try:
+            await self.app(scope, receive, send_and_count)
+        finally:
+            registry.inc("seedling_requests_in_flight", -1, route=route)
+            registry.observe(
+                "seedling_request_duration_seconds", time.perf_counter() - start, route=route, method=method
+            )
+            registry.observe("seedling_response_bytes", response["bytes"], route=route)
+            registry.inc("seedling_requests_total", route=route, method=method, status=response["status"])
+
+
+async def monitor_event_loop(registry: Registry, interval: float = 0.25) -> None:
+    """Record how late the event loop wakes a sleeper: time spent blocked by handlers"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        registry.observe("seedling_event_loop_lag_seconds", lag)
+        registry.set("seedling_event_loop_lag_last_seconds", lag)
+
+
+async def flush_periodically(process_metrics: ProcessMetrics) -> None:
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        try:
+            process_metrics.flush()
+        except OSError:
+            pass  # Next flush retries; a scrape flushes too
+
+
+REGISTRY = Registry()
+REGISTRY.histogram(
+    "seedling_request_duration_seconds", "Time from request to last body chunk, per route", LATENCY_BUCKETS
+)
+REGISTRY.counter("seedling_requests_total", "Requests by route, method and status")
+REGISTRY.gauge("seedling_requests_in_flight", "Requests being served, per route")
+REGISTRY.histogram("seedling_response_bytes", "Response body bytes as sent (after compression)", SIZE_BUCKETS)
+REGISTRY.counter("seedling_simulations_total", "Comparisons simulated, by endpoint and fidelity")
+REGISTRY.counter(
+    "seedling_members_simulated_total", "Member lifetimes simulated (rate() gives members per second)"
+)
+REGISTRY.counter(
+    "seedling_member_years_simulated_total", "Simulated member-years (rate() gives member-years per second)"
+)
+REGISTRY.counter("seedling_simulation_seconds_total", "Wall seconds spent simulating comparisons")
+REGISTRY.histogram(
+    "seedling_tree_members", "Members in both trees of a comparison, by num_generations", MEMBER_BUCKETS
+)
+REGISTRY.histogram(
+    "seedling_event_loop_lag_seconds", "Event loop wake-up delay, sampled every 250 ms", LAG_BUCKETS
+)
+REGISTRY.gauge("seedling_event_loop_lag_last_seconds", "Latest event loop lag sample", aggregate="max")
+
+
+def default_metrics_dir() -> str:
+    return os.environ.get("SEEDLING_METRICS_DIR") or os.path.join(default_data_dir(), "metrics")
+
+
+def open_process_metrics(registry: Registry) -> Optional[ProcessMetrics]:
+    """This process's shared metrics file, or None when SEEDLING_METRICS is off"""
+    if os.environ.get("SEEDLING_METRICS", "on") == "off":
+        return None
+    return ProcessMetrics(registry, default_metrics_dir())
@@ -0,0 +1,221 @@
+"""
+Seedling - Generational Wealth Time Machine
+On-Demand Request Profiling
+
+Captures a profile of one chosen API request in production. A request
+is profiled only when it carries the admin token configured in
+SEEDLING_PROFILE_TOKEN:
+
+    X-Seedling-Profile: <token>
+    X-Seedling-Profile-Mode: cprofile (default) | sample
+  
+  cprofile   deterministic, every call counted; saved as .pstats
+             (python -m pstats, snakeviz, ...)
+  sample     stacks of the event loop thread sampled every millisecond;
+             saved as .collapsed, one "frame;frame;frame count" line per
+             stack, for flamegraph.pl or speedscope
+
+The response names the capture in X-Seedling-Profile-Id, and
+GET /api/profiles/<id> downloads it with the same token. Captures go to
+SEEDLING_PROFILE_DIR (default ``profiles`` under the data directory).
+
+Limits: one capture at a time per process, at most SEEDLING_PROFILE_LIMIT
+(default 4) per rolling hour across all workers sharing the directory
+(counted from the files it holds), and only the newest MAX_PROFILES kept.
+A request that would go over is served normally, unprofiled, with
+``X-Seedling-Profile-Status: rate_limited``.
+
+Profiles cover the event loop thread, so other requests interleaved with
+the profiled one at await points show up too; simulations run without
+awaiting, so they are attributed cleanly.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Optional
+import cProfile
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+
+from result_store import default_data_dir
+
+# Captures are downloaded from here; fetching one is never profiled
+PROFILES_PATH = "/api/profiles/"
+PROFILE_HEADER = b"x-seedling-profile"
+MODE_HEADER = b"x-seedling-profile-mode"
+MODES = {"cprofile": ".pstats", "sample": ".collapsed"}
+# Rolling window for SEEDLING_PROFILE_LIMIT
+LIMIT_WINDOW = 3600.0
+# Captures kept on disk; older ones are deleted
+MAX_PROFILES = 50
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.001
+# Capture ids as generated below, so a download can never leave the directory
+PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[a-z_]+-\d+-[0-9a-f]{8}\.(pstats|collapsed)$")
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a background thread"""
+    
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+    
+    def start(self) -> None:
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+    
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfiler:
+    """Admits, runs and stores profile captures"""
+    
+    def __init__(self, token: str, directory: str, limit: int):
+        self.token = token.encode()
+        self.directory = directory
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._active = False
+        os.makedirs(directory, exist_ok=True)
+    
+    def authorized(self, token: Optional[bytes]) -> bool:
+        return token is not None and hmac.compare_digest(token, self.token)
+    
+    def _captures(self):
+        """(mtime, path) of stored captures, oldest first"""
+        captures = []
+        for entry in os.scandir(self.directory):
+            if PROFILE_ID.match(entry.name):
+                try:
+                    captures.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+        return sorted(captures)
+    
+    def acquire(self) -> bool:
+        """Claim the capture slot if no capture is running and the hourly limit allows"""
+        with self._lock:
+            if self._active:
+                return False
+            now = time.time()
+            recent = sum(1 for mtime, _ in self._captures() if now - mtime < LIMIT_WINDOW)
+            if recent >= self.limit:
+                return False
+            self._active = True
+            return True
+    
+    def release(self) -> None:
+        with self._lock:
+            self._active = False
+    
+    def new_id(self, route: str, mode: str) -> str:
+        slug = re.sub(r"[^a-z]+", "_", route.lower()).strip("_") or "root"
+        return f"{time.strftime('%Y%m%dT%H%M%S')}-{slug}-{os.getpid()}-{os.urandom(4).hex()}{MODES[mode]}"
+    
+    def save(self, profile_id: str, capture: Any) -> None:
+        path = os.path.join(self.directory, profile_id)
+        if isinstance(capture, cProfile.Profile):
+            capture.dump_stats(path)
+        else:
+            with open(path, "w") as f:
+                f.write(capture.collapsed())
+        for _, old in self._captures()[:-MAX_PROFILES]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    
+    def path_of(self, profile_id: str) -> Optional[str]:
+        """Path of a stored capture, or None for unknown or malformed ids"""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.directory, profile_id)
+        return path if os.path.exists(path) else None
+
+
+class ProfileMiddleware:
+    """Profiles API requests that present the admin token"""
+    
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(PROFILES_PATH):
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers", ()))
+        if not self.profiler.authorized(headers.get(PROFILE_HEADER)):
+            await self.app(scope, receive, send)
+            return
+        
+        mode = headers.get(MODE_HEADER, b"cprofile").decode("latin-1").lower()
+        if mode not in MODES:
+            mode = "cprofile"
+        status: Dict[str, bytes] = {}
+        
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", ()), *status.items()]}
+            await send(message)
+        
+        if not self.profiler.acquire():
+            status[b"x-seedling-profile-status"] = b"rate_limited"
+            await self.app(scope, receive, send_with_status)
+            return
+        
+        profile_id = self.profiler.new_id(scope["path"], mode)
+        status[b"x-seedling-profile-status"] = b"captured"
+        status[b"x-seedling-profile-id"] = profile_id.encode()
+        if mode == "cprofile":
+            capture = cProfile.Profile()
+            capture.enable()
+        else:
+            capture = StackSampler(threading.get_ident())
+            capture.start()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if mode == "cprofile":
+                capture.disable()
+            else:
+                capture.stop()
+            try:
+                self.profiler.save(profile_id, capture)
+            finally:
+                self.profiler.release()
+
+
+def open_default_profiler() -> Optional[RequestProfiler]:
+    """
+    The profiler configured by the environment, or None when
+    SEEDLING_PROFILE_TOKEN is unset or SEEDLING_PROFILE_LIMIT is 0
+    """
+    token = os.environ.get("SEEDLING_PROFILE_TOKEN")
+    limit = int(os.environ.get("SEEDLING_PROFILE_LIMIT", "4"))
+    if not token or limit <= 0:
+        return None
+    directory = os.environ.get("SEEDLING_PROFILE_DIR") or os.path.join(default_data_dir(), "profiles")
+    return RequestProfiler(token, directory, limit)
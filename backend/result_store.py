@@ -0,0 +1,146 @@
+"""
+Seedling - Generational Wealth Time Machine
+Persistent Result Store
+
+SQLite-backed second tier behind the in-process ResultCache. Every
+uvicorn worker opens the same database file, so a result computed by one
+process is a hit for all of them and survives restarts and deploys.
+
+- rows hold compressed bodies, one per (key, content encoding); bodies
+  too small to compress are stored once as "identity"
+- WAL journaling lets readers run alongside a writer; writes take an
+  immediate transaction and wait on a busy timeout instead of failing
+- total size is bounded: least recently used keys are evicted first
+- rows from other ENGINE_VERSIONs are dropped when the store is opened
+"""
+
+from typing import Dict, Optional, Tuple
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+
+from seedling_core import ENGINE_VERSION
+
+
+def default_data_dir() -> str:
+    """Directory for persisted Seedling data (SEEDLING_DATA_DIR)"""
+    return os.environ.get("SEEDLING_DATA_DIR") or os.path.join(tempfile.gettempdir(), "seedling")
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT NOT NULL,
+    encoding TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    media_type TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (key, encoding)
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+# Hits refresh a key's LRU timestamp at most this often, to keep reads read-only
+_TOUCH_INTERVAL = 60.0
+
+
+class ResultStore:
+    """Size-bounded LRU key-value store of encoded results, shared by processes"""
+    
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        conn.execute("DELETE FROM results WHERE engine != ?", (ENGINE_VERSION,))
+    
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must stay on the thread that opened them
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def get(self, key: str) -> Optional[Tuple[str, bytes, Dict[str, bytes]]]:
+        """(media type, uncompressed body, compressed variants) or None"""
+        conn = self._connection()
+        rows = conn.execute(
+            "SELECT encoding, media_type, data, accessed FROM results WHERE key = ?", (key,)
+        ).fetchall()
+        if not rows:
+            return None
+        
+        now = time.time()
+        if min(row[3] for row in rows) < now - _TOUCH_INTERVAL:
+            conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        
+        media_type = rows[0][1]
+        variants = {encoding: bytes(data) for encoding, _, data, _ in rows}
+        body = variants.pop("identity", None)
+        if body is None:
+            if "gzip" not in variants:
+                return None
+            body = zlib.decompress(variants["gzip"], 31)
+        return media_type, body, variants
+    
+    def put(self, key: str, media_type: str, variants: Dict[str, bytes]) -> None:
+        """Store (or extend) a key's variants, then evict down to max_bytes"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (key, encoding, ENGINE_VERSION, media_type, data, len(data), now)
+                    for encoding, data in variants.items()
+                ],
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop to 90% so eviction does not run on every insert once full
+        excess = total - int(self.max_bytes * 0.9)
+        victims = []
+        for key, size in conn.execute(
+            "SELECT key, SUM(size) FROM results GROUP BY key ORDER BY MAX(accessed)"
+        ).fetchall():
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM results WHERE key = ?", victims)
+    
+    def stats(self) -> Dict[str, int]:
+        entries, size = self._connection().execute(
+            "SELECT COUNT(DISTINCT key), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        return {"entries": entries, "bytes": size, "maxBytes": self.max_bytes}
+
+
+def open_default_store() -> Optional[ResultStore]:
+    """
+    The shared store configured by the environment, or None when
+    SEEDLING_RESULT_STORE_MB is 0. SEEDLING_RESULT_DB overrides the path.
+    """
+    max_mb = int(os.environ.get("SEEDLING_RESULT_STORE_MB", "512"))
+    if max_mb <= 0:
+        return None
+    path = os.environ.get("SEEDLING_RESULT_DB") or os.path.join(default_data_dir(), "results.sqlite3")
+    return ResultStore(path, max_mb * 1024 * 1024)
@@ -0,0 +1,296 @@
+"""
+Seedling - Generational Wealth Time Machine
+Stored Run Indexes
+
+Secondary indexes over a stored tree's members, built once when the run
+is written and read in place from the run file:
+
+    index.net_worth.order     member indices sorted by final net worth (uint32)
+    index.net_worth.sorted    the net worths in that order, for bisecting ranges
+    index.id.order            member indices sorted by member id, to find one
+    index.health.<level>      one bitmap per financial health level
+    index.education.<level>   one bitmap per education level
+    index.owns_home           bitmap of members owning a home
+    index.year.rows           history rows sorted by calendar year (uint32)
+    index.year.members        the member each of those rows belongs to
+    index.year.years          the distinct years, ascending (uint16)
+    index.year.offsets        where each year's rows start in index.year.rows
+
+Generations need no index: members are stored breadth-first, so each
+generation is the contiguous range given by ``gen_offsets``. A member
+simulated at full fidelity has a history row for every adult year, so a
+year's rows are the adults alive that year with their full history.
+Minors have no rows before 18, and members simulated at NO_HISTORY
+fidelity have only their final snapshot, so neither appears in the
+years they have no row for.
+
+A query turns each filter into a bitmask over member indices (Python
+ints, so combining them is a few machine words per 64 members), ANDs
+them, and reads the matches off the mask in index order or off the
+sorted net-worth permutation. Only the members on the requested page
+are turned into rows; FamilyMember objects are never rebuilt.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import heapq
+
+from seedling_core import EDUCATION_LEVELS, HEALTH_LEVELS, FlatTree
+
+INDEX_PREFIX = "index."
+
+
+def _bitmap(size: int, members: Iterator[int]) -> array:
+    bitmap = bytearray((size + 7) // 8)
+    for index in members:
+        bitmap[index >> 3] |= 1 << (index & 7)
+    return array("B", bitmap)
+
+
+def year_columns(tree: FlatTree) -> List[Tuple[str, array]]:
+    """The per-year history index of a tree"""
+    years = tree.h_year
+    row_member = array("I", bytes(4 * len(years)))
+    for member in range(len(tree)):
+        for row in tree.history_range(member):
+            row_member[row] = member
+    # Stable: within a year, rows stay in breadth-first member order
+    rows = array("I", sorted(range(len(years)), key=years.__getitem__))
+    distinct = array("H")
+    offsets = array("I")
+    for position, row in enumerate(rows):
+        if not distinct or years[row] != distinct[-1]:
+            distinct.append(years[row])
+            offsets.append(position)
+    offsets.append(len(rows))
+    return [
+        ("index.year.rows", rows),
+        ("index.year.members", array("I", (row_member[row] for row in rows))),
+        ("index.year.years", distinct),
+        ("index.year.offsets", offsets),
+    ]
+
+
+def index_columns(tree: FlatTree) -> List[Tuple[str, array]]:
+    """Every index column of a tree, named as stored in the run file"""
+    size = len(tree)
+    net_worth = tree.net_worth
+    order = array("I", sorted(range(size), key=net_worth.__getitem__))
+    columns = [
+        ("index.net_worth.order", order),
+        ("index.net_worth.sorted", array("d", (net_worth[i] for i in order))),
+        ("index.id.order", array("I", sorted(range(size), key=tree.ids.__getitem__))),
+        ("index.owns_home", _bitmap(size, (i for i in range(size) if tree.owns_home[i]))),
+    ]
+    for code, level in enumerate(HEALTH_LEVELS):
+        columns.append(
+            (f"index.health.{level.value}", _bitmap(size, (i for i in range(size) if tree.health[i] == code)))
+        )
+    for code, level in enumerate(EDUCATION_LEVELS):
+        columns.append(
+            (f"index.education.{level.value}", _bitmap(size, (i for i in range(size) if tree.education[i] == code)))
+        )
+    return columns + year_columns(tree)
+
+
+@dataclass
+class MemberFilter:
+    """Member query filters; None or empty means unfiltered"""
+    generation: Optional[int] = None
+    health: Tuple[str, ...] = ()
+    education: Tuple[str, ...] = ()
+    owns_home: Optional[bool] = None
+    min_net_worth: Optional[float] = None
+    max_net_worth: Optional[float] = None
+    
+    @property
+    def net_worth_range(self) -> bool:
+        return self.min_net_worth is not None or self.max_net_worth is not None
+
+
+class TreeIndex:
+    """The indexes of one stored tree, as views into the run file"""
+    
+    def __init__(self, tree: FlatTree, columns: Dict[str, Any]):
+        self.tree = tree
+        self.size = len(tree)
+        self.order = columns["index.net_worth.order"]
+        self.sorted_net_worth = columns["index.net_worth.sorted"]
+        self.id_order = columns["index.id.order"]
+        self.year_rows = columns["index.year.rows"]
+        self.year_members = columns["index.year.members"]
+        self.years = columns["index.year.years"]
+        self.year_offsets = columns["index.year.offsets"]
+        self.bitmaps = {
+            name[len(INDEX_PREFIX):]: int.from_bytes(data, "little")
+            for name, data in columns.items()
+            if name.startswith(("index.health.", "index.education.", "index.owns_home"))
+        }
+    
+    def find(self, member_id: str) -> Optional[int]:
+        """Index of the member with an id, by bisecting the id order"""
+        ids = self.tree.ids
+        position = bisect_left(self.id_order, member_id, key=ids.__getitem__)
+        if position < self.size and ids[self.id_order[position]] == member_id:
+            return self.id_order[position]
+        return None
+    
+    def alive_in(self, year: int) -> Tuple[Any, Any]:
+        """(history rows, members) of everyone alive in a calendar year"""
+        position = bisect_left(self.years, year)
+        if position == len(self.years) or self.years[position] != year:
+            return (), ()
+        start, stop = self.year_offsets[position], self.year_offsets[position + 1]
+        return self.year_rows[start:stop], self.year_members[start:stop]
+    
+    def _net_worth_span(self, query: MemberFilter) -> Tuple[int, int]:
+        """Positions in the sorted permutation of members inside the net-worth range"""
+        lo = 0 if query.min_net_worth is None else bisect_left(self.sorted_net_worth, query.min_net_worth)
+        hi = self.size if query.max_net_worth is None else bisect_right(self.sorted_net_worth, query.max_net_worth)
+        return lo, max(lo, hi)
+    
+    def mask(self, query: MemberFilter) -> int:
+        """Bitmask of the members matching every filter"""
+        mask = (1 << self.size) - 1
+        if query.generation is not None:
+            span = self.tree.generation_range(query.generation)
+            mask &= ((1 << len(span)) - 1) << span.start
+        if query.health:
+            mask &= _any(self.bitmaps[f"health.{level}"] for level in query.health)
+        if query.education:
+            mask &= _any(self.bitmaps[f"education.{level}"] for level in query.education)
+        if query.owns_home is not None:
+            homes = self.bitmaps["owns_home"]
+            mask &= homes if query.owns_home else ~homes
+        if query.net_worth_range:
+            lo, hi = self._net_worth_span(query)
+            in_range = _bitmap(self.size, self.order[lo:hi])
+            mask &= int.from_bytes(in_range, "little")
+        return mask
+    
+    def by_net_worth(self, mask: int, query: MemberFilter, descending: bool = False) -> Iterator[Tuple[float, int]]:
+        """(net worth, index) of the members in ``mask``, in net-worth order"""
+        lo, hi = self._net_worth_span(query)
+        positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        bits = mask.to_bytes((self.size + 7) // 8, "little")
+        for position in positions:
+            index = self.order[position]
+            if bits[index >> 3] >> (index & 7) & 1:
+                yield self.sorted_net_worth[position], index
+
+
+def _any(bitmaps: Iterator[int]) -> int:
+    mask = 0
+    for bitmap in bitmaps:
+        mask |= bitmap
+    return mask
+
+
+def set_bits(mask: int, skip: int = 0) -> Iterator[int]:
+    """Indices of the set bits of ``mask``, ascending, after the first ``skip``"""
+    while mask:
+        low = mask & -mask
+        if skip:
+            skip -= 1
+        else:
+            yield low.bit_length() - 1
+        mask ^= low
+
+
+def member_row(tree: FlatTree, index: int) -> Dict[str, Any]:
+    """A member's scalars for query results, straight from the columns"""
+    return {
+        "index": index,
+        "id": tree.ids[index],
+        "name": tree.names[index],
+        "lineage": tree.lineages[index],
+        "generation": tree.generation[index],
+        "parentIndex": tree.parent[index] if tree.parent[index] >= 0 else None,
+        "birthYear": tree.birth_year[index],
+        "currentAge": tree.current_age[index],
+        "education": EDUCATION_LEVELS[tree.education[index]].value,
+        "financialLiteracy": round(tree.financial_literacy[index], 2),
+        "income": round(tree.income[index], 2),
+        "netWorth": round(tree.net_worth[index], 2),
+        "ownsHome": bool(tree.owns_home[index]),
+        "financialHealth": HEALTH_LEVELS[tree.health[index]].value,
+    }
+
+
+def _tagged(run: int, tree: FlatTree, matches: Iterator[Tuple[float, int]]) -> Iterator[Tuple[float, int, FlatTree, int]]:
+    for net_worth, member in matches:
+        yield net_worth, run, tree, member
+
+
+def query_members(
+    trees: List[Tuple[int, FlatTree, TreeIndex]],
+    query: MemberFilter,
+    sort: str = "index",
+    offset: int = 0,
+    limit: int = 50
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    (total matches, one page of rows) across (ensemble run, tree, index)
+    triples. ``sort`` is "index" (run, then breadth-first order),
+    "net_worth" or "-net_worth" (merged across runs).
+    """
+    masks = [(run, tree, index, index.mask(query)) for run, tree, index in trees]
+    total = sum(mask.bit_count() for _, _, _, mask in masks)
+    page = []
+    if sort == "index":
+        skip = offset
+        for run, tree, _, mask in masks:
+            count = mask.bit_count()
+            if skip >= count:
+                skip -= count
+                continue
+            for member in set_bits(mask, skip):
+                if len(page) == limit:
+                    break
+                page.append((run, tree, member))
+            skip = 0
+            if len(page) == limit:
+                break
+    else:
+        descending = sort == "-net_worth"
+        streams = [_tagged(run, tree, index.by_net_worth(mask, query, descending)) for run, tree, index, mask in masks]
+        merged = heapq.merge(*streams, key=lambda match: match[0], reverse=descending)
+        page = [(run, tree, member) for _, run, tree, member in islice(merged, offset, offset + limit)]
+    return total, [{"run": run, **member_row(tree, member)} for run, tree, member in page]
+
+
+def snapshot_row(tree: FlatTree, row: int, member: int) -> Dict[str, Any]:
+    """A member as of one history row, for point-in-time snapshots"""
+    return {
+        "index": member,
+        "id": tree.ids[member],
+        "name": tree.names[member],
+        "generation": tree.generation[member],
+        "age": tree.h_age[row],
+        "income": round(tree.h_income[row], 2),
+        "savings": round(tree.h_savings[row], 2),
+        "investments": round(tree.h_investments[row], 2),
+        "debt": round(tree.h_debt[row], 2),
+        "homeEquity": round(tree.h_home_equity[row], 2),
+        "netWorth": round(tree.h_net_worth[row], 2),
+        "health": HEALTH_LEVELS[tree.h_health[row]].value,
+    }
+
+
+def snapshot_frame(index: TreeIndex, year: int) -> Dict[str, Any]:
+    """
+    One year of a timeline as parallel arrays: member indices, ages, net
+    worths and health codes (positions in HEALTH_LEVELS)
+    """
+    tree = index.tree
+    rows, members = index.alive_in(year)
+    return {
+        "year": year,
+        "index": list(members),
+        "age": [tree.h_age[row] for row in rows],
+        "netWorth": [round(tree.h_net_worth[row], 2) for row in rows],
+        "health": [tree.h_health[row] for row in rows],
+    }
@@ -0,0 +1,337 @@
+"""
+Seedling - Generational Wealth Time Machine
+Persisted Run Store
+
+Completed simulation runs, kept on disk in a columnar form so analytics
+can read them back instead of simulating again. Single comparisons store
+their two trees with full history; ensembles store every run's two trees
+(members only, as the ensemble simulates them).
+
+One file per run, ``<run id>.sdlr``:
+
+    magic "SDLR" | version u16 | reserved u16 | metadata length u32
+    UTF-8 JSON metadata {runId, kind, created, request, summary, trees, ...}
+    column blocks, each starting on an 8-byte boundary
+
+Each tree lists its columns (name, typecode, offset, length): the
+FlatTree member and history columns, and its strings (ids, names,
+lineages, parent ids, life events as JSON) as a uint32 offsets column
+plus a UTF-8 data column per field, and the member indexes of
+run_index.py. Reading maps the file and views the columns in place, and
+strings are decoded one member at a time, so one member's history or one
+generation's stats touches only those bytes.
+
+Files are written to a temporary name and renamed, so readers never see
+half a run. Total size is bounded (SEEDLING_RUN_STORE_MB): the least
+recently read runs are deleted first, by file mtime, which reads refresh.
+Every worker process shares the directory.
+"""
+
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+
+from seedling_core import ENGINE_VERSION, HISTORY_COLUMNS, MEMBER_COLUMNS, FlatTree, LifeEvent
+from result_store import default_data_dir
+from run_index import INDEX_PREFIX, TreeIndex, index_columns
+
+RUN_MAGIC = b"SDLR"
+# 2: every tree carries the full run_index.py index columns
+RUN_VERSION = 2
+_HEADER = struct.Struct("<4sHHI")
+RUN_SUFFIX = ".sdlr"
+# Run ids as generated below, so a lookup can never leave the directory
+RUN_ID = re.compile(r"^[0-9a-f]{16}$")
+
+# Tree string fields stored as offsets + UTF-8 data; parent ids use "" for None
+STRING_FIELDS = ("ids", "names", "lineages", "parent_ids", "events")
+NUMERIC_COLUMNS = MEMBER_COLUMNS + HISTORY_COLUMNS + (("gen_offsets", "I"),)
+
+# Reads refresh a run's mtime (its LRU position) at most this often
+_TOUCH_INTERVAL = 60.0
+# Mapped runs kept open per process
+OPEN_RUNS = 16
+
+
+def _aligned(n: int, alignment: int = 8) -> int:
+    return (n + alignment - 1) // alignment * alignment
+
+
+def _encode_strings(field: str, values: List[Any]) -> Tuple[array, bytes]:
+    """(uint32 offsets, UTF-8 data) for one string field of a tree"""
+    if field == "events":
+        values = [
+            json.dumps([[e.year, e.age, e.event_type, e.description, e.financial_impact] for e in events],
+                       separators=(",", ":")) if events else ""
+            for events in values
+        ]
+    elif field == "parent_ids":
+        values = [value or "" for value in values]
+    offsets = array("I", [0])
+    data = bytearray()
+    for value in values:
+        data += value.encode()
+        offsets.append(len(data))
+    return offsets, bytes(data)
+
+
+class StoredStrings(Sequence):
+    """A string column decoded on access, one member at a time"""
+    
+    def __init__(self, field: str, offsets, data):
+        self.field = field
+        self.offsets = offsets
+        self.data = data
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        value = bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode()
+        if self.field == "events":
+            return [LifeEvent(*e) for e in json.loads(value)] if value else []
+        if self.field == "parent_ids":
+            return value or None
+        return value
+
+
+class StoredRun:
+    """One mapped run file: its metadata and lazily viewed trees"""
+    
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        magic, version, _, meta_len = _HEADER.unpack_from(view, 0)
+        if magic != RUN_MAGIC or version != RUN_VERSION:
+            raise ValueError("Not a Seedling run file")
+        self.meta: Dict[str, Any] = json.loads(bytes(view[_HEADER.size:_HEADER.size + meta_len]))
+        self._data = view[_aligned(_HEADER.size + meta_len):]
+        self._trees: Dict[Tuple[str, int], FlatTree] = {}
+        self._indexes: Dict[Tuple[str, int], TreeIndex] = {}
+    
+    def _column(self, column: Dict[str, Any]):
+        typecode = column["type"]
+        start = column["offset"]
+        raw = self._data[start:start + column["length"] * array(typecode).itemsize]
+        if sys.byteorder == "little":
+            return raw.cast(typecode)
+        data = array(typecode, raw.tobytes())
+        data.byteswap()
+        return data
+    
+    def tree_meta(self, arm: str, run: int = 0) -> Optional[Dict[str, Any]]:
+        for entry in self.meta["trees"]:
+            if entry["arm"] == arm and entry["run"] == run:
+                return entry
+        return None
+    
+    def tree(self, arm: str, run: int = 0) -> Optional[FlatTree]:
+        """An arm's tree (of ensemble run ``run``) viewing the mapped file, or None"""
+        tree = self._trees.get((arm, run))
+        if tree is not None:
+            return tree
+        entry = self.tree_meta(arm, run)
+        if entry is None:
+            return None
+        columns = {column["name"]: column for column in entry["columns"]}
+        tree = FlatTree()
+        for name, _ in NUMERIC_COLUMNS:
+            setattr(tree, name, self._column(columns[name]))
+        for field in STRING_FIELDS:
+            strings = StoredStrings(
+                field, self._column(columns[f"{field}.offsets"]), self._column(columns[f"{field}.data"])
+            )
+            setattr(tree, field, strings)
+        self._trees[(arm, run)] = tree
+        return tree
+    
+    def runs(self, arm: str) -> List[int]:
+        """Ensemble runs stored for an arm (just [0] for a single comparison)"""
+        return [entry["run"] for entry in self.meta["trees"] if entry["arm"] == arm]
+    
+    def index(self, arm: str, run: int = 0) -> Optional[TreeIndex]:
+        """The member indexes of a tree (see run_index.py), or None"""
+        index = self._indexes.get((arm, run))
+        if index is not None:
+            return index
+        tree = self.tree(arm, run)
+        if tree is None:
+            return None
+        columns = {
+            column["name"]: self._column(column)
+            for column in self.tree_meta(arm, run)["columns"]
+            if column["name"].startswith(INDEX_PREFIX)
+        }
+        index = TreeIndex(tree, columns)
+        self._indexes[(arm, run)] = index
+        return index
+
+
+class RunStore:
+    """Size-bounded directory of run files, shared by worker processes"""
+    
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._open: "OrderedDict[str, StoredRun]" = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+    
+    def new_id(self) -> str:
+        return os.urandom(8).hex()
+    
+    def path_of(self, run_id: str) -> str:
+        return os.path.join(self.directory, run_id + RUN_SUFFIX)
+    
+    def save(
+        self,
+        run_id: str,
+        kind: str,
+        trees: List[Tuple[str, int, FlatTree]],
+        meta: Dict[str, Any]
+    ) -> None:
+        """
+        Write a run: ``trees`` are (arm, ensemble run, tree), ``meta`` the
+        request, summary and anything else to return with the run
+        """
+        blocks = []
+        tree_entries = []
+        offset = 0
+        for arm, run, tree in trees:
+            columns = []
+            named = []
+            for name, typecode in NUMERIC_COLUMNS:
+                data = getattr(tree, name)
+                named.append((name, data if isinstance(data, array) else array(typecode, data)))
+            for field in STRING_FIELDS:
+                offsets, data = _encode_strings(field, getattr(tree, field))
+                named.append((f"{field}.offsets", offsets))
+                named.append((f"{field}.data", array("B", data)))
+            named.extend(index_columns(tree))
+            for name, data in named:
+                if sys.byteorder != "little":
+                    data = array(data.typecode, data)
+                    data.byteswap()
+                columns.append({"name": name, "type": data.typecode, "offset": offset, "length": len(data)})
+                blocks.append((offset, data))
+                offset = _aligned(offset + len(data) * data.itemsize)
+            tree_entries.append({
+                "arm": arm,
+                "run": run,
+                "members": len(tree),
+                "generations": tree.num_generations,
+                "historyRows": tree.history_offsets[-1],
+                "columns": columns,
+            })
+        
+        header = {
+            "runId": run_id,
+            "kind": kind,
+            "created": time.time(),
+            "engine": ENGINE_VERSION,
+            **meta,
+            "trees": tree_entries,
+        }
+        encoded = json.dumps(header, separators=(",", ":")).encode()
+        data_start = _aligned(_HEADER.size + len(encoded))
+        
+        path = self.path_of(run_id)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(_HEADER.pack(RUN_MAGIC, RUN_VERSION, 0, len(encoded)))
+            f.write(encoded)
+            for start, data in blocks:
+                f.write(b"\0" * (data_start + start - f.tell()))
+                data.tofile(f)
+            f.write(b"\0" * (data_start + offset - f.tell()))
+        os.replace(temp, path)
+        self._evict()
+    
+    def _runs(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of stored runs, least recently used first"""
+        runs = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(RUN_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                runs.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(runs)
+    
+    def _evict(self) -> None:
+        runs = self._runs()
+        total = sum(size for _, size, _ in runs)
+        if total <= self.max_bytes:
+            return
+        # Drop to 90% so eviction does not run on every save once full
+        excess = total - int(self.max_bytes * 0.9)
+        for _, size, path in runs:
+            if excess <= 0:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            excess -= size
+    
+    def open(self, run_id: str) -> Optional[StoredRun]:
+        """A stored run, mapped (and kept open for the next read), or None"""
+        if not RUN_ID.match(run_id):
+            return None
+        path = self.path_of(run_id)
+        with self._lock:
+            run = self._open.get(run_id)
+            if run is not None:
+                self._open.move_to_end(run_id)
+        if run is None:
+            try:
+                run = StoredRun(path)
+            except (OSError, ValueError):
+                return None
+            with self._lock:
+                self._open[run_id] = run
+                while len(self._open) > OPEN_RUNS:
+                    # Unmapped once the last view into it is released
+                    self._open.popitem(last=False)
+        try:
+            if os.stat(path).st_mtime < time.time() - _TOUCH_INTERVAL:
+                os.utime(path)
+        except OSError:
+            pass  # Evicted by another process; the mapping stays readable
+        return run
+    
+    def list(self) -> Iterator[Dict[str, Any]]:
+        """Id, size and last read time of every stored run, most recent first"""
+        for mtime, size, path in reversed(self._runs()):
+            yield {"runId": os.path.basename(path)[:-len(RUN_SUFFIX)], "bytes": size, "accessed": mtime}
+    
+    def stats(self) -> Dict[str, int]:
+        runs = self._runs()
+        return {"runs": len(runs), "bytes": sum(size for _, size, _ in runs), "maxBytes": self.max_bytes}
+
+
+def open_default_run_store() -> Optional[RunStore]:
+    """
+    The run store configured by the environment, or None when
+    SEEDLING_RUN_STORE_MB is 0. SEEDLING_RUN_DIR overrides the directory.
+    """
+    max_mb = int(os.environ.get("SEEDLING_RUN_STORE_MB", "1024"))
+    if max_mb <= 0:
+        return None
+    directory = os.environ.get("SEEDLING_RUN_DIR") or os.path.join(default_data_dir(), "runs")
+    return RunStore(directory, max_mb * 1024 * 1024)
@@ -0,0 +1,78 @@
+"""
+Seedling - Generational Wealth Time Machine
+Simulation Core
+
+The one engine behind every entry point: the FastAPI app, the Cloudflare
+Python worker and the terminal version all import it from here. The
+package has no third-party dependencies, and importing it is nearly free:
+submodules load on first attribute access, so a caller that only needs
+the simulator never pays for flat trees, budgets or comparisons.
+
+    from seedling_core import simulate_comparison, EducationLevel
+"""
+
+from importlib import import_module
+from typing import Any
+
+
+# Bump whenever a change alters simulation output; cached results are
+# keyed by it so they never outlive the engine that produced them
+ENGINE_VERSION = "3"
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "EducationLevel": "model",
+    "FinancialHealth": "model",
+    "EDUCATION_INCOME_MULTIPLIER": "model",
+    "EDUCATION_DEBT": "model",
+    "BRANCH_COLORS": "model",
+    "branch_thickness": "model",
+    "new_member_id": "model",
+    "FinancialSnapshot": "model",
+    "LifeEvent": "model",
+    "FamilyMember": "model",
+    "KeyedRandom": "keyed_random",
+    "LazyHistory": "history",
+    "REPLAY_CACHE": "history",
+    "HEALTH_LEVELS": "flat_tree",
+    "HEALTH_CODES": "flat_tree",
+    "EDUCATION_LEVELS": "flat_tree",
+    "EDUCATION_CODES": "flat_tree",
+    "MEMBER_COLUMNS": "flat_tree",
+    "HISTORY_COLUMNS": "flat_tree",
+    "FlatTree": "flat_tree",
+    "SimulationParams": "params",
+    "CompiledParams": "compiled",
+    "compile_params": "compiled",
+    "EventRule": "rules",
+    "LIFE_EVENT_RULES": "rules",
+    "Fidelity": "budget",
+    "FIDELITY_ORDER": "budget",
+    "SimulationBudget": "budget",
+    "YEAR_PHASES": "timings",
+    "Timings": "timings",
+    "GenerationalSimulator": "engine",
+    "PREVIEW_STRIDE": "engine",
+    "PREVIEW_ERROR_BOUND": "engine",
+    "ComparisonResult": "comparison",
+    "simulate_comparison": "comparison",
+    "run_comparison_simulation": "comparison",
+    "generate_comparison_summary": "comparison",
+    "run_comparison_ensemble": "comparison",
+    "MIN_ANTITHETIC_RUNS": "comparison",
+}
+
+__all__ = ["ENGINE_VERSION", *_EXPORTS]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
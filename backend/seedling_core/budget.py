@@ -0,0 +1,189 @@
+"""
+Seedling - Generational Wealth Time Machine
+Simulation Budget
+
+Plans how much detail each generation keeps so a run fits a CPU budget.
+"""
+
+from typing import List, Optional, Dict, Any, Tuple
+from enum import Enum
+import math
+import time
+
+
+class Fidelity(Enum):
+    """Detail kept for a generation, from most to least"""
+    FULL = "full"              # Every member with yearly financial history
+    NO_HISTORY = "no_history"  # Members keep only their final snapshot
+    AGGREGATE = "aggregate"    # Members simulated, reported as generation totals
+    CAPPED = "capped"          # Aggregate over an evenly spaced sample of members
+
+
+FIDELITY_ORDER = list(Fidelity)
+
+# Relative cost of simulating one member lifetime (FULL = 1)
+_SIMULATE_COST = {
+    Fidelity.FULL: 1.0,
+    Fidelity.NO_HISTORY: 0.67,
+    Fidelity.AGGREGATE: 0.67,
+    Fidelity.CAPPED: 0.67,
+}
+# Share of a FULL member's encoding cost still paid at each fidelity
+_ENCODE_SHARE = {
+    Fidelity.FULL: 1.0,
+    Fidelity.NO_HISTORY: 0.05,
+    Fidelity.AGGREGATE: 0.0,
+    Fidelity.CAPPED: 0.0,
+}
+
+
+class SimulationBudget:
+    """
+    Time budget for one comparison, shared by its arms.
+    
+    Before each generation the simulator asks for a plan. When the
+    projected cost of the remaining generations no longer fits, fidelity
+    steps down (FULL -> NO_HISTORY -> AGGREGATE -> CAPPED) and never steps
+    back up. Later arms replay the first arm's plan so trees stay comparable.
+    
+    By default the budget is CPU seconds (time.process_time) and the cost
+    of a member lifetime is learned as the run goes. Passing ``member_cost``
+    (seconds per FULL member lifetime) spends the budget on modeled cost
+    instead, which makes degradation deterministic - needed where the clock
+    does not advance during a request, as in Workers.
+    """
+    
+    def __init__(
+        self,
+        seconds: float,
+        arms: int = 2,
+        encode_cost: float = 0.25,
+        member_cost: Optional[float] = None
+    ):
+        self.seconds = seconds
+        self.arms = arms
+        # Encoding a FULL member for the response, relative to simulating it
+        self.encode_cost = encode_cost
+        self.member_cost = member_cost
+        self.modeled = member_cost is not None
+        self.plan: List[Tuple[Fidelity, Optional[int]]] = []
+        self._started = time.process_time()
+        self._modeled_spent = 0.0
+        self._units = 0.0
+        self._unit_seconds = 0.0
+    
+    @classmethod
+    def summary_only(cls, num_generations: int) -> "SimulationBudget":
+        """
+        A fixed plan that keeps only the founder (final snapshot) and
+        aggregates every generation below: the least memory a run can
+        take while still producing the full summary.
+        """
+        budget = cls(math.inf)
+        budget.plan = [(Fidelity.NO_HISTORY, None)] + [(Fidelity.AGGREGATE, None)] * num_generations
+        return budget
+    
+    def spent(self) -> float:
+        if self.modeled:
+            return self._modeled_spent
+        return time.process_time() - self._started
+    
+    def observe(self, members: int, fidelity: Fidelity, seconds: float) -> None:
+        """Account for one simulated generation"""
+        units = members * _SIMULATE_COST[fidelity]
+        if self.modeled:
+            self._modeled_spent += units * self.member_cost
+            return
+        self._units += units
+        self._unit_seconds += seconds
+        if self._units:
+            self.member_cost = self._unit_seconds / self._units
+    
+    def _cost(self, members: float, fidelity: Fidelity) -> float:
+        return members * self.member_cost * (
+            _SIMULATE_COST[fidelity] + self.encode_cost * _ENCODE_SHARE[fidelity]
+        )
+    
+    def plan_generation(
+        self,
+        generation: int,
+        members: int,
+        generations_left: int,
+        growth: float
+    ) -> Tuple[Fidelity, Optional[int]]:
+        """
+        (fidelity, member cap or None) for the next generation to simulate.
+        A generation keeps the most detail that still leaves room to
+        aggregate everything below it, so deep generations degrade first.
+        The founder always stays in the tree.
+        """
+        if generation < len(self.plan):
+            return self.plan[generation]
+        
+        current = self.plan[-1][0] if self.plan else Fidelity.FULL
+        if self.member_cost is None:
+            # Nothing measured yet
+            step = (current, None)
+        else:
+            allowance = self.seconds / self.arms - self.spent()
+            deeper = sum(members * growth ** k for k in range(1, generations_left))
+            rest = self._cost(deeper, Fidelity.AGGREGATE)
+            ladder = FIDELITY_ORDER[FIDELITY_ORDER.index(current):]
+            if generation == 0:
+                ladder = [f for f in ladder if f in (Fidelity.FULL, Fidelity.NO_HISTORY)] or [Fidelity.NO_HISTORY]
+            step = None
+            for fidelity in ladder:
+                if fidelity is Fidelity.CAPPED:
+                    break
+                if self._cost(members, fidelity) + rest <= allowance:
+                    step = (fidelity, None)
+                    break
+            if step is None:
+                step = (ladder[-1], None) if generation == 0 else self._capped(
+                    allowance, members, generations_left, growth, current
+                )
+        
+        self.plan.append(step)
+        return step
+    
+    def _capped(
+        self,
+        allowance: float,
+        members: int,
+        generations_left: int,
+        growth: float,
+        current: Fidelity
+    ) -> Tuple[Fidelity, Optional[int]]:
+        """
+        Largest per-generation member cap whose projected cost fits. Once
+        the plan is capped it stays capped, at the full generation when
+        the cap no longer binds.
+        """
+        sizes = [members * growth ** k for k in range(generations_left)]
+        unit = self._cost(1, Fidelity.CAPPED)
+        low, high = 0, max(int(max(sizes)) + 1, 1)
+        while low < high:
+            cap = (low + high + 1) // 2
+            if sum(min(size, cap) for size in sizes) * unit <= allowance:
+                low = cap
+            else:
+                high = cap - 1
+        if low < members:
+            return Fidelity.CAPPED, low
+        if current is Fidelity.CAPPED:
+            return Fidelity.CAPPED, members
+        return Fidelity.AGGREGATE, None
+    
+    def report(self) -> Dict[str, Any]:
+        """The fidelity a run achieved, for the response"""
+        worst = max((f for f, _ in self.plan), key=FIDELITY_ORDER.index, default=Fidelity.FULL)
+        return {
+            "level": worst.value,
+            "generations": [
+                {"generation": g, "level": f.value, **({"cap": cap} if cap is not None else {})}
+                for g, (f, cap) in enumerate(self.plan)
+            ],
+            "budgetMs": round(self.seconds * 1000) if math.isfinite(self.seconds) else None,
+            "spentMs": round(self.spent() * 1000, 1),
+            "modeled": self.modeled,
+        }
@@ -0,0 +1,322 @@
+"""
+Seedling - Generational Wealth Time Machine
+Comparisons
+
+Baseline versus scenario runs on common random numbers, their summaries,
+and multi-seed ensembles.
+"""
+
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple
+import math
+
+from .model import FamilyMember
+from .keyed_random import KeyedRandom
+from .flat_tree import FlatTree
+from .params import SimulationParams
+from .budget import SimulationBudget
+from .engine import GenerationalSimulator
+from .timings import Timings
+
+
+# Fewest runs an antithetic ensemble takes: two pairs, two samples
+MIN_ANTITHETIC_RUNS = 4
+
+
+def _phase(timings: Optional[Timings], name: str):
+    return timings.phase(name) if timings is not None else nullcontext()
+
+
+def _simulate_pair(
+    base_params: Dict[str, Any],
+    scenario_params: Dict[str, Any],
+    num_generations: int,
+    rng: KeyedRandom,
+    budget: Optional[SimulationBudget] = None,
+    timings: Optional[Timings] = None,
+    lazy_history: bool = False,
+    stride: int = 1
+) -> Tuple[FamilyMember, FamilyMember, Tuple[SimulationParams, SimulationParams], Tuple[Dict, Dict], Tuple[int, int]]:
+    """
+    Simulate baseline and scenario on common random numbers.
+    ``scenario_params["shared"]`` holds SimulationParams fields for both
+    arms (behavioral drift), ``"simulation"`` the scenario's own on top.
+    Both arms share one keyed source, so every decision (child count,
+    literacy, education, name) for a given lineage sees the same draw.
+    Also returns each arm's params, its aggregated generations (empty without a budget)
+    and the work done by both: (lifetimes simulated, simulated years).
+    With ``lazy_history``, histories are replayed when read (history.py);
+    a ``stride`` above 1 approximates lifetimes in multi-year steps.
+    """
+    
+    # Baseline simulation
+    with _phase(timings, "simulate.baseline"):
+        shared = scenario_params.get("shared", {})
+        baseline_sim = GenerationalSimulator(SimulationParams(**shared), rng, lazy_history, stride=stride)
+        baseline_founder = baseline_sim.create_founder(**base_params)
+        baseline_sim.simulate_generations(baseline_founder, num_generations, budget, timings)
+    
+    # Scenario simulation
+    with _phase(timings, "simulate.scenario"):
+        scenario_sim_params = SimulationParams(**{**shared, **scenario_params.get("simulation", {})})
+        scenario_sim = GenerationalSimulator(scenario_sim_params, rng, lazy_history, stride=stride)
+        
+        founder_params = {**base_params, **scenario_params.get("founder", {})}
+        scenario_founder = scenario_sim.create_founder(**founder_params)
+        scenario_sim.simulate_generations(scenario_founder, num_generations, budget, timings)
+    
+    aggregates = (baseline_sim.aggregates, scenario_sim.aggregates)
+    work = (
+        baseline_sim.members_simulated + scenario_sim.members_simulated,
+        baseline_sim.years_simulated + scenario_sim.years_simulated,
+    )
+    params = (baseline_sim.params, scenario_sim_params)
+    return baseline_founder, scenario_founder, params, aggregates, work
+
+
+@dataclass
+class ComparisonResult:
+    """Simulated baseline and scenario trees, before serialization"""
+    baseline: FlatTree
+    scenario: FlatTree
+    baseline_params: SimulationParams
+    scenario_params: SimulationParams
+    summary: Dict[str, Any]
+    # SimulationBudget.report() when the run had a budget
+    fidelity: Optional[Dict[str, Any]] = None
+    # Lifetimes simulated across both arms (aggregated ones included) and
+    # the simulated years they took
+    members_simulated: int = 0
+    member_years: int = 0
+    
+    def with_fidelity(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Top-level response keys beyond the trees and summary"""
+        if self.fidelity is None:
+            return dict(extra or {})
+        return {"fidelity": self.fidelity, **(extra or {})}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "baseline": {
+                "tree": self.baseline.to_nested(),
+                "params": self.baseline_params.to_dict()
+            },
+            "scenario": {
+                "tree": self.scenario.to_nested(),
+                "params": self.scenario_params.to_dict()
+            },
+            "summary": self.summary,
+            **self.with_fidelity()
+        }
+
+
+def simulate_comparison(
+    base_params: Dict[str, Any],
+    scenario_params: Dict[str, Any],
+    num_generations: int = 4,
+    seed: int = 42,
+    budget: Optional[SimulationBudget] = None,
+    timings: Optional[Timings] = None,
+    stride: int = 1
+) -> ComparisonResult:
+    """
+    Run baseline and scenario and keep both trees in flat form.
+    With a budget, fidelity degrades to fit it and the result says how far.
+    With timings, each stage's wall time and the member counts are recorded.
+    A ``stride`` above 1 gives a coarse preview (see simulate_stride).
+    """
+    
+    baseline_founder, scenario_founder, params, aggregates, work = _simulate_pair(
+        base_params, scenario_params, num_generations, KeyedRandom(seed), budget, timings, stride=stride
+    )
+    
+    with _phase(timings, "flatten"):
+        baseline_tree = FlatTree.from_root(baseline_founder)
+        scenario_tree = FlatTree.from_root(scenario_founder)
+    
+    with _phase(timings, "summary"):
+        summary = generate_comparison_summary(baseline_tree, scenario_tree, *aggregates)
+    
+    if timings is not None:
+        timings.counts.update({
+            "generations": num_generations,
+            "members": len(baseline_tree) + len(scenario_tree),
+            "historyRows": baseline_tree.history_offsets[-1] + scenario_tree.history_offsets[-1],
+        })
+    
+    return ComparisonResult(
+        baseline=baseline_tree,
+        scenario=scenario_tree,
+        baseline_params=params[0],
+        scenario_params=params[1],
+        summary=summary,
+        fidelity=budget.report() if budget is not None else None,
+        members_simulated=work[0],
+        member_years=work[1],
+    )
+
+
+def run_comparison_simulation(
+    base_params: Dict[str, Any],
+    scenario_params: Dict[str, Any],
+    num_generations: int = 4,
+    seed: int = 42,
+    budget: Optional[SimulationBudget] = None,
+    timings: Optional[Timings] = None
+) -> Dict[str, Any]:
+    """
+    Run two simulations: baseline and with scenario changes.
+    Returns both trees for comparison.
+    """
+    
+    result = simulate_comparison(base_params, scenario_params, num_generations, seed, budget, timings)
+    with _phase(timings, "to_dict"):
+        return result.to_dict()
+
+
+def _arm_summary(tree: FlatTree, aggregates: Dict[int, Dict[str, float]], generations: int) -> Dict[str, Any]:
+    """Summary of one arm; aggregated generations come from their totals"""
+    total_members = len(tree)
+    total_net_worth = tree.total_net_worth()
+    by_generation = []
+    for g in range(generations):
+        agg = aggregates.get(g)
+        if agg is None:
+            by_generation.append(tree.generation_stats(g))
+            continue
+        count = agg["count"]
+        by_generation.append({
+            "count": count,
+            "avgNetWorth": agg["totalNetWorth"] / count if count else 0,
+            "totalNetWorth": agg["totalNetWorth"],
+            "homeOwnership": agg["homeOwners"] / count if count else 0,
+            "aggregated": True,
+            "dropped": agg["dropped"],
+        })
+        total_members += count
+        total_net_worth += agg["totalNetWorth"]
+    return {
+        "totalMembers": total_members,
+        "totalNetWorth": total_net_worth,
+        "byGeneration": by_generation
+    }
+
+
+def generate_comparison_summary(
+    baseline: FlatTree,
+    scenario: FlatTree,
+    baseline_aggregates: Optional[Dict[int, Dict[str, float]]] = None,
+    scenario_aggregates: Optional[Dict[int, Dict[str, float]]] = None
+) -> Dict[str, Any]:
+    """Generate summary statistics comparing two scenarios"""
+    
+    if isinstance(baseline, FamilyMember):
+        baseline = FlatTree.from_root(baseline, include_history=False)
+    if isinstance(scenario, FamilyMember):
+        scenario = FlatTree.from_root(scenario, include_history=False)
+    baseline_aggregates = baseline_aggregates or {}
+    scenario_aggregates = scenario_aggregates or {}
+    
+    generations = max(
+        baseline.num_generations,
+        scenario.num_generations,
+        *(g + 1 for g in baseline_aggregates),
+        *(g + 1 for g in scenario_aggregates)
+    )
+    baseline_summary = _arm_summary(baseline, baseline_aggregates, generations)
+    scenario_summary = _arm_summary(scenario, scenario_aggregates, generations)
+    baseline_total = baseline_summary["totalNetWorth"]
+    scenario_total = scenario_summary["totalNetWorth"]
+    
+    return {
+        "baseline": baseline_summary,
+        "scenario": scenario_summary,
+        "difference": {
+            "totalNetWorth": scenario_total - baseline_total,
+            "percentChange": (
+                (scenario_total - baseline_total) /
+                max(baseline_total, 1) * 100
+            )
+        }
+    }
+
+
+def run_comparison_ensemble(
+    base_params: Dict[str, Any],
+    scenario_params: Dict[str, Any],
+    num_generations: int = 4,
+    runs: int = 16,
+    seed: int = 42,
+    antithetic: bool = True,
+    trees: Optional[List[Tuple[FlatTree, FlatTree]]] = None
+) -> Dict[str, Any]:
+    """
+    Estimate the scenario effect over many seeds.
+    
+    Each run compares baseline and scenario on common random numbers, so
+    the per-run delta isolates the scenario. With antithetic pairing, runs
+    come in (u, 1 - u) pairs on the same seed and the pair mean is the
+    independent sample used for the confidence interval, so ``runs``
+    must then be even and at least 4. With fewer than two samples the
+    standard error and interval are None. Each run's
+    (baseline, scenario) trees, without history, are appended to
+    ``trees`` when it is given.
+    """
+    
+    if antithetic and (runs % 2 or runs < MIN_ANTITHETIC_RUNS):
+        raise ValueError(f"Antithetic ensembles need an even number of runs, at least {MIN_ANTITHETIC_RUNS}")
+    
+    deltas = []
+    baseline_totals = []
+    scenario_totals = []
+    
+    for i in range(runs):
+        if antithetic:
+            rng = KeyedRandom(seed + i // 2, antithetic=bool(i % 2))
+        else:
+            rng = KeyedRandom(seed + i)
+        
+        # Histories are never read here, so they are never replayed
+        baseline_founder, scenario_founder, _, _, _ = _simulate_pair(
+            base_params, scenario_params, num_generations, rng, lazy_history=True
+        )
+        baseline_tree = FlatTree.from_root(baseline_founder, include_history=False)
+        scenario_tree = FlatTree.from_root(scenario_founder, include_history=False)
+        if trees is not None:
+            trees.append((baseline_tree, scenario_tree))
+        baseline_total = baseline_tree.total_net_worth()
+        scenario_total = scenario_tree.total_net_worth()
+        
+        baseline_totals.append(baseline_total)
+        scenario_totals.append(scenario_total)
+        deltas.append(scenario_total - baseline_total)
+    
+    if antithetic:
+        samples = [(deltas[i] + deltas[i + 1]) / 2 for i in range(0, len(deltas), 2)]
+    else:
+        samples = deltas
+    
+    mean_delta = sum(samples) / len(samples)
+    std_error = ci95 = None
+    if len(samples) > 1:
+        variance = sum((d - mean_delta) ** 2 for d in samples) / (len(samples) - 1)
+        std_error = math.sqrt(variance / len(samples))
+        ci95 = [mean_delta - 1.96 * std_error, mean_delta + 1.96 * std_error]
+    
+    baseline_mean = sum(baseline_totals) / runs
+    
+    return {
+        "runs": runs,
+        "seed": seed,
+        "antithetic": antithetic,
+        "baselineMeanNetWorth": baseline_mean,
+        "scenarioMeanNetWorth": sum(scenario_totals) / runs,
+        "difference": {
+            "meanTotalNetWorth": mean_delta,
+            "stdError": std_error,
+            "ci95": ci95,
+            "percentChange": mean_delta / max(baseline_mean, 1) * 100,
+        },
+        "deltas": deltas,
+    }
@@ -0,0 +1,137 @@
+"""
+Seedling - Generational Wealth Time Machine
+Compiled Parameters
+
+Everything the engine's hot paths can work out once per parameter set
+instead of once per member-year: growth factors, income by age for each
+(base income, education), cumulative education distributions for each
+parental wealth band, and the life event rules fused into one step.
+
+Every table is computed with the same float operations, in the same
+order, as the code it replaces, so compiled runs are bit-identical.
+"""
+
+from bisect import bisect_left
+from dataclasses import astuple
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
+
+from .model import EDUCATION_INCOME_MULTIPLIER, EducationLevel, income_age_factor
+from .params import SimulationParams
+from .rules import LIFE_EVENT_RULES, EventRule, compile_rules, rule_ages
+
+# (net worth above, multiplier on living expenses) when lifestyle_inflation is on
+LIFESTYLE_INFLATION = ((500000, 1.3), (100000, 1.15))
+
+# (investments above, multiplier on investment return) when diminishing_returns is on
+DIMINISHING_RETURNS = ((2000000, 0.7), (500000, 0.85))
+
+# Child education probabilities, in draw order
+EDUCATION_PROBS = {
+    EducationLevel.HIGH_SCHOOL: 0.1,
+    EducationLevel.SOME_COLLEGE: 0.25,
+    EducationLevel.BACHELORS: 0.45,
+    EducationLevel.MASTERS: 0.15,
+    EducationLevel.DOCTORATE: 0.05,
+}
+# Parent net worth above / below which the probabilities shift
+WEALTHY_PARENT = 500000
+POOR_PARENT = 50000
+WEALTH_BANDS = {
+    "wealthy": {
+        EducationLevel.BACHELORS: 0.1,
+        EducationLevel.MASTERS: 0.1,
+        EducationLevel.HIGH_SCHOOL: -0.1,
+        EducationLevel.SOME_COLLEGE: -0.1,
+    },
+    "middle": {},
+    "poor": {
+        EducationLevel.HIGH_SCHOOL: 0.1,
+        EducationLevel.SOME_COLLEGE: 0.1,
+        EducationLevel.MASTERS: -0.1,
+        EducationLevel.DOCTORATE: -0.05,
+    },
+}
+
+# Income tables kept per compiled parameter set; the founder's base
+# income varies by request, every child's is the same
+INCOME_TABLES = 64
+# Compiled parameter sets kept
+COMPILED_CACHE_SIZE = 64
+
+
+def _cumulative(shift: Dict[EducationLevel, float]) -> Tuple[Tuple[float, ...], Tuple[EducationLevel, ...]]:
+    probs = dict(EDUCATION_PROBS)
+    for level, delta in shift.items():
+        probs[level] += delta
+    cumulative = []
+    total = 0
+    for prob in probs.values():
+        total += prob
+        cumulative.append(total)
+    return tuple(cumulative), tuple(probs)
+
+
+class CompiledParams:
+    """Per-parameter-set tables for the engine (see compile_params)"""
+    
+    def __init__(self, params: SimulationParams, rules: Sequence[EventRule] = LIFE_EVENT_RULES):
+        self.params = params
+        self.rules = rules
+        self.life_expectancy = params.life_expectancy
+        self.debt_interest_rate = params.debt_interest_rate
+        self.lifestyle_inflation = params.lifestyle_inflation
+        self.habit_annual = params.monthly_habit_change * 12
+        self.savings_growth = 1 + params.savings_interest
+        self.home_growth = 1 + params.home_appreciation
+        # (investments above, growth factor); the default applies below every tier
+        self.investment_growth = 1 + params.investment_return
+        self.investment_tiers: Tuple[Tuple[float, float], ...] = ()
+        if params.diminishing_returns:
+            self.investment_tiers = tuple(
+                (threshold, 1 + params.investment_return * factor)
+                for threshold, factor in DIMINISHING_RETURNS
+            )
+        # life_events(member, current_year) fires the rules that hold
+        self.life_events = compile_rules(rules, params)
+        self.event_ages = rule_ages(rules, params)
+        self.education_cdf = {band: _cumulative(shift) for band, shift in WEALTH_BANDS.items()}
+        self._income_tables: Dict[Tuple[float, EducationLevel], Tuple[float, ...]] = {}
+    
+    def income_table(self, base_income: float, education: EducationLevel) -> Tuple[float, ...]:
+        """Annual income at each age up to life expectancy"""
+        key = (base_income, education)
+        table = self._income_tables.get(key)
+        if table is None:
+            if len(self._income_tables) >= INCOME_TABLES:
+                self._income_tables.clear()
+            multiplier = EDUCATION_INCOME_MULTIPLIER[education]
+            table = tuple(
+                base_income * multiplier * income_age_factor(age)
+                for age in range(self.life_expectancy + 1)
+            )
+            self._income_tables[key] = table
+        return table
+    
+    def education(self, parent_net_worth: float, r: float) -> EducationLevel:
+        """The education a uniform draw ``r`` picks for a parent's wealth"""
+        if parent_net_worth > WEALTHY_PARENT:
+            band = "wealthy"
+        elif parent_net_worth < POOR_PARENT:
+            band = "poor"
+        else:
+            band = "middle"
+        cumulative, levels = self.education_cdf[band]
+        # First level whose cumulative probability reaches r
+        position = bisect_left(cumulative, r)
+        return levels[position] if position < len(levels) else EducationLevel.BACHELORS
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(fields: tuple, rules: Tuple[EventRule, ...]) -> CompiledParams:
+    return CompiledParams(SimulationParams(*fields), rules)
+
+
+def compile_params(params: SimulationParams, rules: Sequence[EventRule] = LIFE_EVENT_RULES) -> CompiledParams:
+    """The compiled tables for a parameter set and rules, built once per distinct pair"""
+    return _compile(astuple(params), tuple(rules))
@@ -0,0 +1,520 @@
+"""
+Seedling - Generational Wealth Time Machine
+Simulation Engine
+
+Models financial decisions across multiple generations, accounting
+for compound interest, debt dynamics, wealth transfer, and behavioral
+inheritance.
+"""
+
+from typing import List, Optional, Dict, Sequence
+import random
+import time
+
+from .model import (
+    EducationLevel,
+    FinancialHealth,
+    EDUCATION_DEBT,
+    FinancialSnapshot,
+    LifeEvent,
+    FamilyMember,
+    new_member_id,
+)
+from .keyed_random import KeyedRandom
+from .history import ADULT_AGE, LazyHistory
+from .params import SimulationParams
+from .compiled import LIFESTYLE_INFLATION, compile_params
+from .rules import LIFE_EVENT_RULES, EventRule
+from .budget import Fidelity, SimulationBudget
+from .timings import Timings
+
+# Years per step of the coarse preview (see simulate_stride), and the
+# relative error it was measured to stay within against the exact run:
+# total net worth per arm and per generation, across the presets and
+# custom scenarios at 3 and 5 generations (worst seen 14.7%). The
+# scenario's percent change is not bounded; it can move a lot more.
+PREVIEW_STRIDE = 5
+PREVIEW_ERROR_BOUND = 0.15
+
+
+def _geometric(ratio: float, n: int) -> float:
+    """1 + ratio + ... + ratio ** (n - 1)"""
+    return n if ratio == 1 else (ratio ** n - 1) / (ratio - 1)
+
+
+def _tier_factor(value: float, tiers, default: float = 1.0) -> float:
+    for threshold, factor in tiers:
+        if value > threshold:
+            return factor
+    return default
+
+
+class GenerationalSimulator:
+    """
+    Core simulation engine that models financial decisions
+    across multiple generations.
+    """
+    
+    def __init__(
+        self,
+        params: SimulationParams,
+        rng: Optional[KeyedRandom] = None,
+        lazy_history: bool = False,
+        rules: Sequence[EventRule] = LIFE_EVENT_RULES,
+        stride: int = 1
+    ):
+        self.params = params
+        # Life events fired at the end of each year (see rules.py)
+        self.rules = rules
+        # Tables and constants derived from params and rules (see compiled.py)
+        self.compiled = compile_params(params, rules)
+        # Without an explicit source, seed from the global RNG so callers
+        # that use random.seed() still get reproducible runs
+        self.rng = rng if rng is not None else KeyedRandom(random.getrandbits(64))
+        self.current_year = 2024
+        # Yearly snapshots are skipped below FULL fidelity
+        self.record_history = True
+        # Keep each lifetime's starting state and replay its snapshots
+        # when read (see history.py) instead of recording them
+        self.lazy_history = lazy_history
+        # Years per step; above 1, lifetimes are approximated in strides
+        # (see simulate_stride) for a fast coarse preview
+        self.stride = stride
+        # Generation -> totals for generations kept out of the tree
+        self.aggregates: Dict[int, Dict[str, float]] = {}
+        # Set while a detailed Timings splits simulate_year into phases
+        self.year_timings: Optional[Timings] = None
+        # Work done so far: lifetimes simulated and simulate_year calls they took
+        self.members_simulated = 0
+        self.years_simulated = 0
+        self.generation_names = [
+            ["Alex", "Jordan", "Taylor", "Morgan", "Casey"],
+            ["Riley", "Quinn", "Avery", "Sage", "River"],
+            ["Phoenix", "Skyler", "Dakota", "Reese", "Finley"],
+            ["Rowan", "Ellis", "Blair", "Emery", "Kendall"],
+            ["Eden", "Marlowe", "Lennox", "Sutton", "Campbell"],
+        ]
+    
+    def create_founder(
+        self,
+        name: str = "You",
+        age: int = 30,
+        income: float = 55000,
+        savings: float = 5000,
+        debt: float = 25000,
+        education: EducationLevel = EducationLevel.SOME_COLLEGE,
+        financial_literacy: float = 0.4
+    ) -> FamilyMember:
+        """Create the founding member (generation 0)"""
+        
+        # Apply scenario modifiers
+        adjusted_debt = debt * self.params.starting_debt_modifier
+        adjusted_literacy = min(1.0, financial_literacy + self.params.financial_literacy_boost)
+        
+        founder = FamilyMember(
+            id=new_member_id(),
+            name=name,
+            generation=0,
+            birth_year=self.current_year - age,
+            base_income=income,
+            education=education,
+            financial_literacy=adjusted_literacy,
+            current_age=age,
+            savings=savings,
+            debt=adjusted_debt,
+            income_table=self.compiled.income_table(income, education),
+        )
+        
+        # Record initial state
+        self._record_snapshot(founder)
+        
+        return founder
+    
+    def simulate_year(self, member: FamilyMember) -> None:
+        """Simulate one year of financial life"""
+        
+        compiled = self.compiled
+        if member.current_age > compiled.life_expectancy:
+            return
+        
+        member.current_age += 1
+        member._metrics = None
+        
+        # Skip if too young to have finances
+        if member.current_age < 18:
+            return
+        
+        timings = self.year_timings
+        if timings is not None:
+            timings.start_lap()
+        
+        income = member.annual_income
+        savings_rate = member.savings_rate
+        
+        # --- INCOME PHASE ---
+        # After-tax income (simplified ~25% effective rate)
+        net_income = income * 0.75
+        
+        # --- EXPENSE PHASE ---
+        # Basic living expenses (scales with income but has floor)
+        living_expenses = max(25000, income * 0.45)
+        if compiled.lifestyle_inflation:
+            # Wealthier households spend more
+            living_expenses *= _tier_factor(member.net_worth, LIFESTYLE_INFLATION)
+        
+        # Debt payments - more aggressive paydown
+        debt_payment = 0
+        if member.debt > 0:
+            # Interest accrues first
+            interest = member.debt * compiled.debt_interest_rate
+            # Pay at least 15% of principal plus interest, or pay it all off
+            min_payment = member.debt * 0.15 + interest
+            debt_payment = min(min_payment, member.debt + interest)
+            member.debt = max(0, member.debt + interest - debt_payment)
+        if timings is not None:
+            timings.lap("year.debt")
+        
+        # Housing costs
+        if member.owns_home:
+            housing_cost = member.home_equity * 0.025  # Property tax, maintenance, insurance
+            member.home_equity *= compiled.home_growth
+        else:
+            housing_cost = max(10000, income * 0.22)  # Rent
+        if timings is not None:
+            timings.lap("year.housing")
+        
+        # --- SAVINGS PHASE ---
+        # Monthly habit change impact (annualized)
+        available = net_income - living_expenses - debt_payment - housing_cost + compiled.habit_annual
+        
+        if available > 0:
+            # Split between savings and investments based on literacy
+            save_amount = available * savings_rate
+            investment_portion = member.financial_literacy * 0.6
+            
+            member.savings += save_amount * (1 - investment_portion)
+            member.investments += save_amount * investment_portion
+        else:
+            # Negative available - dip into savings or accumulate some debt
+            shortfall = abs(available)
+            if member.savings >= shortfall:
+                member.savings -= shortfall
+            else:
+                remaining = shortfall - member.savings
+                member.savings = 0
+                # Only 30% of shortfall becomes debt (rest is lifestyle reduction)
+                member.debt += remaining * 0.3
+        if timings is not None:
+            timings.lap("year.savings")
+        
+        # --- GROWTH PHASE ---
+        member.savings *= compiled.savings_growth
+        # Large portfolios are harder to keep at high returns (no tiers
+        # unless diminishing_returns is on)
+        member.investments *= _tier_factor(member.investments, compiled.investment_tiers, compiled.investment_growth)
+        member._metrics = None
+        if timings is not None:
+            timings.lap("year.growth")
+        
+        # --- LIFE EVENTS ---
+        compiled.life_events(member, self.current_year)
+        if timings is not None:
+            timings.lap("year.events")
+        
+        # Record state
+        if self.record_history:
+            self._record_snapshot(member)
+            if timings is not None:
+                timings.lap("year.snapshot")
+    
+    def simulate_stride(self, member: FamilyMember, years: int) -> None:
+        """
+        Approximate ``years`` adult years of simulate_year in one step.
+        
+        Debt, home equity and growth compound in closed form, as they do
+        year by year. Income is averaged over the stride and the surplus
+        or shortfall is spread evenly across it; drift tiers are read at
+        its start. Life events fire once, at its end, with a snapshot.
+        """
+        
+        compiled = self.compiled
+        start = member.current_age
+        member.current_age += years
+        table = member.income_table or compiled.income_table(member.base_income, member.education)
+        income = sum(table[start + 1:start + years + 1]) / years
+        
+        living_expenses = max(25000, income * 0.45)
+        if compiled.lifestyle_inflation:
+            living_expenses *= _tier_factor(member.net_worth, LIFESTYLE_INFLATION)
+        
+        # Each year pays the interest and 15% of the principal
+        debt_payments = 0
+        if member.debt > 0:
+            debt_payments = member.debt * (0.15 + compiled.debt_interest_rate) * _geometric(0.85, years)
+            member.debt *= 0.85 ** years
+        
+        if member.owns_home:
+            housing_costs = member.home_equity * 0.025 * _geometric(compiled.home_growth, years)
+            member.home_equity *= compiled.home_growth ** years
+        else:
+            housing_costs = max(10000, income * 0.22) * years
+        
+        available = (income * 0.75 - living_expenses + compiled.habit_annual) * years - debt_payments - housing_costs
+        
+        savings_growth = compiled.savings_growth
+        investment_growth = _tier_factor(member.investments, compiled.investment_tiers, compiled.investment_growth)
+        if available > 0:
+            # Saved evenly across the stride, each year's share growing from then on
+            save_amount = available * member.savings_rate / years
+            investment_portion = member.financial_literacy * 0.6
+            member.savings = (
+                member.savings * savings_growth ** years
+                + save_amount * (1 - investment_portion) * savings_growth * _geometric(savings_growth, years)
+            )
+            member.investments = (
+                member.investments * investment_growth ** years
+                + save_amount * investment_portion * investment_growth * _geometric(investment_growth, years)
+            )
+        else:
+            shortfall = -available
+            if member.savings >= shortfall:
+                member.savings -= shortfall
+            else:
+                member.debt += (shortfall - member.savings) * 0.3
+                member.savings = 0
+            member.savings *= savings_growth ** years
+            member.investments *= investment_growth ** years
+        member.invalidate()
+        
+        compiled.life_events(member, self.current_year)
+        if self.record_history:
+            self._record_snapshot(member)
+    
+    def _simulate_strides(self, member: FamilyMember, target_age: int) -> None:
+        """A lifetime in strides of up to ``self.stride`` years"""
+        event_ages = self.compiled.event_ages
+        while member.current_age < target_age:
+            age = member.current_age
+            if age < ADULT_AGE - 1:
+                # Nothing happens before adulthood
+                member.current_age = min(ADULT_AGE - 1, target_age)
+                member.invalidate()
+                continue
+            stop = min(age + self.stride, target_age)
+            # Strides end on the ages rules fire at, so none is stepped over
+            for event_age in event_ages:
+                if age < event_age < stop:
+                    stop = event_age
+                    break
+            self.simulate_stride(member, stop - age)
+    
+    def _check_life_events(self, member: FamilyMember) -> None:
+        """Fire the life event rules that hold this year (see rules.py)"""
+        self.compiled.life_events(member, self.current_year)
+    
+    def _record_snapshot(self, member: FamilyMember) -> None:
+        """Record current financial state"""
+        income, net_worth, health = member.metrics()
+        snapshot = FinancialSnapshot(
+            year=member.birth_year + member.current_age,
+            age=member.current_age,
+            income=income,
+            savings=member.savings,
+            investments=member.investments,
+            debt=member.debt,
+            home_equity=member.home_equity,
+            net_worth=net_worth,
+            health=health
+        )
+        member.financial_history.append(snapshot)
+    
+    def spawn_children(self, parent: FamilyMember, num_children: int = None) -> List[FamilyMember]:
+        """Create next generation members"""
+        
+        parent_health = parent.metrics()[2]
+        if num_children is None:
+            # Random but influenced by financial stability
+            base = self.params.avg_children
+            if parent_health == FinancialHealth.DISTRESSED:
+                base *= 0.8
+            num_children = max(0, round(
+                self.rng.gauss((parent.lineage, "children"), base, 0.8)
+            ))
+        
+        children = []
+        gen = parent.generation + 1
+        
+        for i in range(num_children):
+            lineage = f"{parent.lineage}.{i}"
+            
+            # Child inherits some financial literacy (nature + nurture)
+            base_literacy = parent.financial_literacy * 0.6 + self.rng.uniform(
+                (lineage, "literacy"), 0.1, 0.4
+            )
+            
+            # Wealthier parents often provide better financial education
+            if parent_health in (FinancialHealth.THRIVING, FinancialHealth.STABLE):
+                base_literacy += 0.1
+            
+            # Education influenced by parent wealth and literacy
+            education = self._determine_education(parent, lineage)
+            
+            # Name selection
+            name_pool = self.generation_names[min(gen, len(self.generation_names) - 1)]
+            name = self.rng.choice((lineage, "name"), name_pool)
+            
+            child = FamilyMember(
+                id=new_member_id(),
+                name=name,
+                generation=gen,
+                birth_year=parent.birth_year + self.params.avg_child_birth_age + (i * 2),
+                base_income=45000,  # Starting income (will be modified by education)
+                education=education,
+                financial_literacy=min(1.0, base_literacy + self.params.financial_literacy_boost),
+                parent_id=parent.id,
+                lineage=lineage,
+                debt=EDUCATION_DEBT[education] * self.params.starting_debt_modifier,
+                income_table=self.compiled.income_table(45000, education),
+            )
+            
+            children.append(child)
+            parent.children.append(child)
+        
+        return children
+    
+    def _determine_education(self, parent: FamilyMember, lineage: str) -> EducationLevel:
+        """Determine child's education level based on parent wealth"""
+        # Cumulative distributions per wealth band (see compiled.py)
+        r = self.rng.random((lineage, "education"))
+        return self.compiled.education(parent.metrics()[1], r)
+    
+    def transfer_wealth(self, parent: FamilyMember) -> None:
+        """Transfer wealth from parent to children upon death"""
+        
+        if not parent.children:
+            return
+        
+        # Estate (simplified - flat tax above the exemption)
+        estate = max(0, parent.metrics()[1])
+        taxable = estate - self.params.estate_tax_exemption
+        if self.params.estate_tax_rate and taxable > 0:
+            estate -= taxable * self.params.estate_tax_rate
+        
+        if estate > 0:
+            per_child = estate / len(parent.children)
+            
+            for child in parent.children:
+                child.inheritance_received += per_child
+                child.investments += per_child  # Inheritance goes to investments
+                child.invalidate()
+                
+                child.life_events.append(LifeEvent(
+                    year=parent.birth_year + self.params.life_expectancy,
+                    age=child.current_age,
+                    event_type="inheritance",
+                    description=f"Inherited ${per_child:,.0f} from {parent.name}",
+                    financial_impact=per_child
+                ))
+    
+    def simulate_lifetime(self, member: FamilyMember) -> None:
+        """Simulate entire lifetime for a member"""
+        
+        target_age = self.params.life_expectancy
+        self.members_simulated += 1
+        self.years_simulated += max(0, target_age - member.current_age)
+        
+        if self.stride > 1:
+            self._simulate_strides(member, target_age)
+            if not self.record_history:
+                self._record_snapshot(member)
+            return
+        
+        if self.record_history and self.lazy_history:
+            history = LazyHistory(member, self.params, self.rules)
+            self.record_history = False
+            while member.current_age < target_age:
+                self.simulate_year(member)
+            self.record_history = True
+            member.financial_history = history
+            return
+        
+        while member.current_age < target_age:
+            self.simulate_year(member)
+        
+        if not self.record_history:
+            self._record_snapshot(member)
+    
+    def simulate_generations(
+        self,
+        founder: FamilyMember,
+        num_generations: int = 4,
+        budget: Optional[SimulationBudget] = None,
+        timings: Optional[Timings] = None
+    ) -> FamilyMember:
+        """
+        Simulate multiple generations starting from founder.
+        Returns the founder with all descendants attached.
+        
+        Runs one generation at a time: every member's draws are keyed by
+        lineage, so the order does not change the result. With a budget,
+        each generation runs at the fidelity the budget plans for it, and
+        aggregated generations go to ``self.aggregates`` instead of the tree.
+        A detailed ``timings`` gets simulate_year's phases.
+        """
+        
+        if timings is not None and timings.detailed:
+            self.year_timings = timings
+        # params may have been changed since the simulator was made
+        self.compiled = compile_params(self.params, self.rules)
+        
+        level = [founder]
+        parents: List[FamilyMember] = []
+        for generation in range(num_generations + 1):
+            if not level:
+                break
+            
+            fidelity, cap = Fidelity.FULL, None
+            if budget is not None:
+                fidelity, cap = budget.plan_generation(
+                    generation, len(level), num_generations - generation + 1, self.params.avg_children
+                )
+            aggregated = fidelity in (Fidelity.AGGREGATE, Fidelity.CAPPED)
+            if aggregated:
+                for parent in parents:
+                    parent.children = []
+            
+            dropped = 0
+            if cap is not None and len(level) > cap:
+                dropped = len(level) - cap
+                step = len(level) / cap if cap else 0
+                level = [level[int(i * step)] for i in range(cap)]
+            
+            # Simulate this generation's lives
+            self.record_history = fidelity is Fidelity.FULL
+            started = time.process_time()
+            for member in level:
+                self.simulate_lifetime(member)
+            if budget is not None:
+                budget.observe(len(level), fidelity, time.process_time() - started)
+            
+            if aggregated:
+                self.aggregates[generation] = {
+                    "count": len(level),
+                    "totalNetWorth": sum(m.net_worth for m in level),
+                    "homeOwners": sum(1 for m in level if m.owns_home),
+                    "dropped": dropped,
+                }
+            
+            if generation == num_generations:
+                break
+            
+            # Spawn children, then transfer wealth when the parent dies
+            children = []
+            for member in level:
+                children.extend(self.spawn_children(member))
+                self.transfer_wealth(member)
+            parents, level = level, children
+        
+        self.record_history = True
+        self.year_timings = None
+        return founder
@@ -0,0 +1,379 @@
+"""
+Seedling - Generational Wealth Time Machine
+Flat Trees
+
+Columnar, breadth-first family trees: the form results are summarized,
+encoded and cached in.
+"""
+
+from array import array
+from collections import deque
+from typing import List, Optional, Dict, Any
+import json
+import struct
+import sys
+
+from .model import (
+    EducationLevel,
+    FinancialHealth,
+    BRANCH_COLORS,
+    branch_thickness,
+    LifeEvent,
+    FamilyMember,
+)
+
+
+# Stable small-integer codes, in enum declaration order
+HEALTH_LEVELS = tuple(FinancialHealth)
+HEALTH_CODES = {health: code for code, health in enumerate(HEALTH_LEVELS)}
+EDUCATION_LEVELS = tuple(EducationLevel)
+EDUCATION_CODES = {edu: code for code, edu in enumerate(EDUCATION_LEVELS)}
+
+# Per-member columns: (attribute, array typecode)
+MEMBER_COLUMNS = (
+    ("parent", "i"),
+    ("generation", "B"),
+    ("child_offsets", "I"),
+    ("birth_year", "i"),
+    ("current_age", "i"),
+    ("education", "B"),
+    ("financial_literacy", "d"),
+    ("income", "d"),
+    ("savings", "d"),
+    ("investments", "d"),
+    ("debt", "d"),
+    ("home_equity", "d"),
+    ("net_worth", "d"),
+    ("inheritance_received", "d"),
+    ("owns_home", "B"),
+    ("health", "B"),
+    ("history_offsets", "I"),
+)
+
+# One row per recorded FinancialSnapshot, all members back to back.
+# The money columns come first so they serialize as one contiguous block.
+HISTORY_COLUMNS = (
+    ("h_income", "d"),
+    ("h_savings", "d"),
+    ("h_investments", "d"),
+    ("h_debt", "d"),
+    ("h_home_equity", "d"),
+    ("h_net_worth", "d"),
+    ("h_year", "H"),
+    ("h_age", "B"),
+    ("h_health", "B"),
+)
+
+BUFFER_MAGIC = b"SDLT"
+BUFFER_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+
+
+def _aligned(n: int, alignment: int = 8) -> int:
+    return (n + alignment - 1) // alignment * alignment
+
+
+class FlatTree:
+    """
+    Family tree stored as parallel arrays in breadth-first order.
+    
+    ``parent[i]`` is the index of member i's parent (-1 for the founder),
+    and member i's children are ``range(child_offsets[i], child_offsets[i + 1])``.
+    Member i's history rows are ``history_offsets[i]:history_offsets[i + 1]``
+    in the ``h_*`` columns.
+    """
+    
+    def __init__(self):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.lineages: List[str] = []
+        self.parent_ids: List[Optional[str]] = []
+        self.events: List[List[LifeEvent]] = []
+        for name, typecode in MEMBER_COLUMNS + HISTORY_COLUMNS:
+            setattr(self, name, array(typecode))
+        self.gen_offsets = array("I", [0])
+    
+    # ------------------------------------------------------------------
+    # Construction
+    
+    @classmethod
+    def from_root(cls, root: FamilyMember, include_history: bool = True) -> "FlatTree":
+        """Flatten a simulated FamilyMember tree in one breadth-first pass"""
+        tree = cls()
+        queue = deque([(root, -1)])
+        next_child = 1
+        row = 0
+        current_gen = root.generation
+        
+        while queue:
+            member, parent_index = queue.popleft()
+            index = len(tree.ids)
+            
+            while member.generation > current_gen:
+                tree.gen_offsets.append(index)
+                current_gen += 1
+            
+            tree.ids.append(member.id)
+            tree.names.append(member.name)
+            tree.lineages.append(member.lineage)
+            tree.parent_ids.append(member.parent_id)
+            tree.events.append(list(member.life_events))
+            
+            income, net_worth, health = member.metrics()
+            tree.parent.append(parent_index)
+            tree.generation.append(member.generation)
+            tree.child_offsets.append(next_child)
+            tree.birth_year.append(member.birth_year)
+            tree.current_age.append(member.current_age)
+            tree.education.append(EDUCATION_CODES[member.education])
+            tree.financial_literacy.append(member.financial_literacy)
+            tree.income.append(income)
+            tree.savings.append(member.savings)
+            tree.investments.append(member.investments)
+            tree.debt.append(member.debt)
+            tree.home_equity.append(member.home_equity)
+            tree.net_worth.append(net_worth)
+            tree.inheritance_received.append(member.inheritance_received)
+            tree.owns_home.append(member.owns_home)
+            tree.health.append(HEALTH_CODES[health])
+            
+            tree.history_offsets.append(row)
+            if include_history:
+                for snapshot in member.financial_history:
+                    tree.h_year.append(snapshot.year)
+                    tree.h_age.append(snapshot.age)
+                    tree.h_income.append(snapshot.income)
+                    tree.h_savings.append(snapshot.savings)
+                    tree.h_investments.append(snapshot.investments)
+                    tree.h_debt.append(snapshot.debt)
+                    tree.h_home_equity.append(snapshot.home_equity)
+                    tree.h_net_worth.append(snapshot.net_worth)
+                    tree.h_health.append(HEALTH_CODES[snapshot.health])
+                row += len(member.financial_history)
+            
+            for child in member.children:
+                queue.append((child, index))
+            next_child += len(member.children)
+        
+        tree.child_offsets.append(next_child)
+        tree.history_offsets.append(row)
+        tree.gen_offsets.append(len(tree.ids))
+        return tree
+    
+    # ------------------------------------------------------------------
+    # Topology
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @property
+    def num_generations(self) -> int:
+        return len(self.gen_offsets) - 1
+    
+    def children_of(self, index: int) -> range:
+        return range(self.child_offsets[index], self.child_offsets[index + 1])
+    
+    def generation_range(self, gen: int) -> range:
+        """Indices of every member in a generation (empty if out of range)"""
+        if gen >= self.num_generations:
+            return range(0)
+        return range(self.gen_offsets[gen], self.gen_offsets[gen + 1])
+    
+    def history_range(self, index: int) -> range:
+        return range(self.history_offsets[index], self.history_offsets[index + 1])
+    
+    # ------------------------------------------------------------------
+    # Aggregates
+    
+    def total_net_worth(self) -> float:
+        return sum(self.net_worth)
+    
+    def generation_stats(self, gen: int) -> Dict[str, float]:
+        """Per-generation summary computed from contiguous column slices"""
+        span = self.generation_range(gen)
+        count = len(span)
+        if not count:
+            return {"count": 0, "avgNetWorth": 0, "totalNetWorth": 0}
+        total = sum(self.net_worth[span.start:span.stop])
+        return {
+            "count": count,
+            "avgNetWorth": total / count,
+            "totalNetWorth": total,
+            "homeOwnership": sum(self.owns_home[span.start:span.stop]) / count,
+        }
+    
+    def subtree_stats(self, index: int) -> Dict[str, float]:
+        """Totals over a member's descendants, one column slice per level"""
+        descendants = 0
+        total = 0.0
+        levels = self.subtree_levels(index)[1:]
+        for span in levels:
+            descendants += len(span)
+            total += sum(self.net_worth[span.start:span.stop])
+        return {
+            "descendants": descendants,
+            "generations": len(levels),
+            "totalNetWorth": total,
+            "avgNetWorth": total / descendants if descendants else 0,
+        }
+    
+    # ------------------------------------------------------------------
+    # Edge conversion
+    
+    def member_dict(self, index: int, children: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Build one member's JSON shape, identical to FamilyMember.to_dict"""
+        net_worth = self.net_worth[index]
+        health = HEALTH_LEVELS[self.health[index]]
+        history = self.history_range(index)
+        return {
+            "id": self.ids[index],
+            "name": self.names[index],
+            "generation": self.generation[index],
+            "birthYear": self.birth_year[index],
+            "currentAge": self.current_age[index],
+            "education": EDUCATION_LEVELS[self.education[index]].value,
+            "financialLiteracy": round(self.financial_literacy[index], 2),
+            "income": round(self.income[index], 2),
+            "savings": round(self.savings[index], 2),
+            "investments": round(self.investments[index], 2),
+            "debt": round(self.debt[index], 2),
+            "homeEquity": round(self.home_equity[index], 2),
+            "netWorth": round(net_worth, 2),
+            "ownsHome": bool(self.owns_home[index]),
+            "inheritanceReceived": round(self.inheritance_received[index], 2),
+            "financialHealth": health.value,
+            "branchThickness": round(branch_thickness(net_worth), 3),
+            "branchColor": BRANCH_COLORS[health],
+            "children": children if children is not None else [],
+            "parentId": self.parent_ids[index],
+            "lineage": self.lineages[index],
+            "financialHistory": [self.history_row_dict(r) for r in history],
+            "lifeEvents": [e.to_dict() for e in self.events[index]],
+        }
+    
+    def history_row_dict(self, row: int) -> Dict[str, Any]:
+        return {
+            "year": self.h_year[row],
+            "age": self.h_age[row],
+            "income": round(self.h_income[row], 2),
+            "savings": round(self.h_savings[row], 2),
+            "investments": round(self.h_investments[row], 2),
+            "debt": round(self.h_debt[row], 2),
+            "homeEquity": round(self.h_home_equity[row], 2),
+            "netWorth": round(self.h_net_worth[row], 2),
+            "health": HEALTH_LEVELS[self.h_health[row]].value,
+        }
+    
+    def subtree_levels(self, root: int = 0) -> List[range]:
+        """
+        A subtree's members, one contiguous index range per level.
+        Children of consecutive members are themselves consecutive in
+        breadth-first order, so each level is a single slice.
+        """
+        levels = []
+        span = range(root, root + 1)
+        while len(span):
+            levels.append(span)
+            span = range(self.child_offsets[span.start], self.child_offsets[span.stop])
+        return levels
+    
+    def to_nested(self, root: int = 0) -> Dict[str, Any]:
+        """
+        Build the nested ``children`` JSON shape for a subtree, deepest
+        level first so every child exists before it is attached.
+        """
+        if not self.ids:
+            return {}
+        built: Dict[int, Dict[str, Any]] = {}
+        for span in reversed(self.subtree_levels(root)):
+            for index in span:
+                children = [built.pop(c) for c in self.children_of(index)]
+                built[index] = self.member_dict(index, children)
+        return built[root]
+    
+    # ------------------------------------------------------------------
+    # Process-independent buffers
+    
+    def to_bytes(self, precision: int = 64) -> bytes:
+        """
+        Serialize to a single self-describing buffer.
+        
+        Layout: 12-byte header (magic, version, reserved, metadata length),
+        UTF-8 JSON metadata, then every column as little-endian raw data
+        starting on an 8-byte boundary. The metadata lists each column's
+        offset, typecode and length so a reader can view it in place.
+        With precision=32 the float columns are stored as float32.
+        """
+        columns = []
+        data_columns = []
+        offset = 0
+        for name, typecode in MEMBER_COLUMNS + HISTORY_COLUMNS + (("gen_offsets", "I"),):
+            data = getattr(self, name)
+            if typecode == "d" and precision == 32:
+                data = array("f", data)
+            elif not isinstance(data, array):
+                data = array(typecode, data)
+            columns.append({
+                "name": name, "type": data.typecode,
+                "offset": offset, "length": len(data),
+            })
+            data_columns.append(data)
+            offset = _aligned(offset + len(data) * data.itemsize)
+        
+        meta = json.dumps({
+            "healthLevels": [h.value for h in HEALTH_LEVELS],
+            "educationLevels": [e.value for e in EDUCATION_LEVELS],
+            "ids": self.ids,
+            "names": self.names,
+            "lineages": self.lineages,
+            "parentIds": self.parent_ids,
+            "events": [
+                [[e.year, e.age, e.event_type, e.description, e.financial_impact] for e in events]
+                for events in self.events
+            ],
+            "columns": columns,
+        }, separators=(",", ":")).encode()
+        data_start = _aligned(_HEADER.size + len(meta))
+        
+        out = bytearray(data_start + offset)
+        _HEADER.pack_into(out, 0, BUFFER_MAGIC, BUFFER_VERSION, 0, len(meta))
+        out[_HEADER.size:_HEADER.size + len(meta)] = meta
+        for column, data in zip(columns, data_columns):
+            if sys.byteorder != "little":
+                data = array(data.typecode, data)
+                data.byteswap()
+            start = data_start + column["offset"]
+            out[start:start + len(data) * data.itemsize] = data.tobytes()
+        return bytes(out)
+    
+    @classmethod
+    def from_bytes(cls, buffer) -> "FlatTree":
+        """
+        Rebuild from ``to_bytes`` output. On little-endian hosts columns
+        are zero-copy memoryviews into ``buffer`` (bytes, mmap or shared
+        memory), so nothing is unpickled or copied per member.
+        """
+        view = memoryview(buffer)
+        magic, version, _, meta_len = _HEADER.unpack_from(view, 0)
+        if magic != BUFFER_MAGIC or version != BUFFER_VERSION:
+            raise ValueError("Not a Seedling flat tree buffer")
+        meta = json.loads(bytes(view[_HEADER.size:_HEADER.size + meta_len]))
+        data_start = _aligned(_HEADER.size + meta_len)
+        
+        tree = cls()
+        tree.ids = meta["ids"]
+        tree.names = meta["names"]
+        tree.lineages = meta["lineages"]
+        tree.parent_ids = meta["parentIds"]
+        tree.events = [[LifeEvent(*e) for e in events] for events in meta["events"]]
+        for column in meta["columns"]:
+            typecode = column["type"]
+            start = data_start + column["offset"]
+            raw = view[start:start + column["length"] * array(typecode).itemsize]
+            if sys.byteorder == "little":
+                data = raw.cast(typecode)
+            else:
+                data = array(typecode, raw.tobytes())
+                data.byteswap()
+            setattr(tree, column["name"], data)
+        return tree
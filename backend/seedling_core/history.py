@@ -0,0 +1,175 @@
+"""
+Seedling - Generational Wealth Time Machine
+Replayed History
+
+simulate_year draws no random numbers: a member's year follows from its
+state and the params alone. So a lifetime's yearly snapshots need not be
+kept. LazyHistory keeps the state a member started its lifetime in
+(with the life event rules it had already fired), the params, a
+fingerprint of them and the rules. It replays the lifetime into
+snapshots when they are read, only as far as the snapshots read,
+producing the same snapshots the simulator would have recorded.
+
+Replays are cached per history in a small shared LRU (REPLAY_CACHE), so
+reading a member's history twice, or reading further into it, does not
+start over. Evicted replays are simply replayed again on the next read.
+"""
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import astuple
+from typing import List, Tuple
+import threading
+
+from .model import FamilyMember, FinancialSnapshot
+from .keyed_random import KeyedRandom
+from .params import SimulationParams
+from .rules import LIFE_EVENT_RULES, EventRule
+
+# simulate_year records nothing before this age
+ADULT_AGE = 18
+# Replayed histories kept by the default cache
+REPLAY_CACHE_SIZE = 256
+
+
+def params_fingerprint(params: SimulationParams) -> int:
+    return hash(astuple(params))
+
+
+class ReplayCache:
+    """
+    Thread-safe LRU of replays in progress: history -> (snapshots so far,
+    the member being replayed). ``maxsize`` 0 disables caching.
+    """
+    
+    def __init__(self, maxsize: int = REPLAY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[LazyHistory, Tuple[List[FinancialSnapshot], FamilyMember]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def snapshots(self, history: "LazyHistory", count: int) -> List[FinancialSnapshot]:
+        """At least the first ``count`` snapshots of a history"""
+        with self._lock:
+            entry = self._entries.get(history)
+            if entry is None:
+                entry = history.start_replay()
+                if self.maxsize:
+                    self._entries[history] = entry
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(history)
+            # Under the lock: a replay in progress is one member being mutated
+            rows, member = entry
+            if len(rows) < count:
+                history.replay(member, count)
+            return rows
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+REPLAY_CACHE = ReplayCache()
+
+
+class LazyHistory(Sequence):
+    """
+    A member's financial history, replayed on first read.
+    
+    Behaves as the list of FinancialSnapshot the simulator would have
+    recorded: same length, same snapshots, in order. Built by
+    GenerationalSimulator.simulate_lifetime when it runs with
+    ``lazy_history``, before the lifetime is simulated.
+    """
+    
+    __slots__ = ("head", "start", "params", "rules", "fingerprint", "_length")
+    
+    def __init__(
+        self,
+        member: FamilyMember,
+        params: SimulationParams,
+        rules: Sequence[EventRule] = LIFE_EVENT_RULES
+    ):
+        # Snapshots recorded before the lifetime (the founder's first year)
+        self.head = tuple(member.financial_history)
+        self.start = (
+            member.birth_year, member.base_income, member.education, member.financial_literacy,
+            member.current_age, member.savings, member.investments, member.debt,
+            member.home_equity, member.owns_home, member.achieved,
+        )
+        self.params = params
+        self.rules = rules
+        self.fingerprint = params_fingerprint(params)
+        years = params.life_expectancy - max(member.current_age, ADULT_AGE - 1)
+        self._length = len(self.head) + max(0, years)
+    
+    def start_replay(self) -> Tuple[List[FinancialSnapshot], FamilyMember]:
+        """(snapshots, member) at the start of the lifetime, ready to replay"""
+        if params_fingerprint(self.params) != self.fingerprint:
+            raise ValueError("Simulation params changed after this history was simulated")
+        (birth_year, base_income, education, literacy, age,
+         savings, investments, debt, equity, owns_home, achieved) = self.start
+        member = FamilyMember(
+            id="",
+            name="",
+            generation=0,
+            birth_year=birth_year,
+            base_income=base_income,
+            education=education,
+            financial_literacy=literacy,
+            current_age=age,
+            savings=savings,
+            investments=investments,
+            debt=debt,
+            home_equity=equity,
+            owns_home=owns_home,
+            financial_history=list(self.head),
+            achieved=achieved,
+        )
+        return member.financial_history, member
+    
+    def replay(self, member: FamilyMember, count: int) -> None:
+        """Simulate a replay's member on until it has ``count`` snapshots"""
+        from .engine import GenerationalSimulator
+        
+        # simulate_year draws nothing, so any source will do
+        simulator = GenerationalSimulator(self.params, KeyedRandom(0), rules=self.rules)
+        rows = member.financial_history
+        count = min(count, self._length)
+        while len(rows) < count:
+            simulator.simulate_year(member)
+    
+    def _snapshots(self, count: int) -> List[FinancialSnapshot]:
+        if count <= len(self.head):
+            return self.head
+        return REPLAY_CACHE.snapshots(self, count)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            span = range(*index.indices(self._length))
+            if not span:
+                return []
+            rows = self._snapshots(max(span[0], span[-1]) + 1)
+            return [rows[i] for i in span]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("history index out of range")
+        return self._snapshots(index + 1)[index]
+    
+    def __iter__(self):
+        return iter(self._snapshots(self._length))
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, LazyHistory)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+    
+    __hash__ = object.__hash__
+    
+    def __repr__(self) -> str:
+        return f"LazyHistory({self._length} snapshots)"
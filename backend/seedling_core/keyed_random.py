@@ -0,0 +1,61 @@
+"""
+Seedling - Generational Wealth Time Machine
+Keyed Random Source
+
+Draws addressed by event keys, shared by both arms of a comparison.
+"""
+
+from typing import Any, Sequence, Tuple
+
+try:
+    # The bare blake2 module loads without OpenSSL, which hashlib pulls in
+    from _blake2 import blake2b
+except ImportError:  # Interpreters built without it
+    from hashlib import blake2b
+
+
+_STANDARD_NORMAL = None
+
+
+def _normal_inv_cdf(p: float) -> float:
+    # statistics is slow to import and only normal draws need it
+    global _STANDARD_NORMAL
+    if _STANDARD_NORMAL is None:
+        from statistics import NormalDist
+        _STANDARD_NORMAL = NormalDist()
+    return _STANDARD_NORMAL.inv_cdf(p)
+
+
+class KeyedRandom:
+    """
+    Random source where every draw is addressed by a stable event key.
+    
+    A draw depends only on (seed, key), never on how many draws came before
+    it, so two simulations sharing a seed see identical randomness for the
+    same decision even when one of them makes more or fewer decisions
+    (common random numbers). With ``antithetic=True`` every uniform u is
+    mirrored to 1 - u, which also negates every normal draw.
+    """
+    
+    def __init__(self, seed: int = 42, antithetic: bool = False):
+        self.seed = seed
+        self.antithetic = antithetic
+    
+    def random(self, key: Tuple) -> float:
+        """Uniform draw in the open interval (0, 1)"""
+        digest = blake2b(
+            repr((self.seed, key)).encode(), digest_size=8
+        ).digest()
+        u = (int.from_bytes(digest, "big") + 0.5) / 18446744073709551616.0
+        return 1.0 - u if self.antithetic else u
+    
+    def uniform(self, key: Tuple, a: float, b: float) -> float:
+        return a + (b - a) * self.random(key)
+    
+    def gauss(self, key: Tuple, mu: float, sigma: float) -> float:
+        # Inverse-CDF sampling keeps the antithetic pair exactly symmetric
+        return mu + sigma * _normal_inv_cdf(self.random(key))
+    
+    def choice(self, key: Tuple, seq: Sequence[Any]) -> Any:
+        return seq[min(int(self.random(key) * len(seq)), len(seq) - 1)]
+
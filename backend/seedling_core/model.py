@@ -0,0 +1,259 @@
+"""
+Seedling - Generational Wealth Time Machine
+Family Model
+
+People, their yearly snapshots and life events, and the tables that
+drive income, student debt and tree rendering.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+from enum import Enum
+import math
+import os
+
+
+class EducationLevel(Enum):
+    HIGH_SCHOOL = "high_school"
+    SOME_COLLEGE = "some_college"
+    BACHELORS = "bachelors"
+    MASTERS = "masters"
+    DOCTORATE = "doctorate"
+
+
+class FinancialHealth(Enum):
+    THRIVING = "thriving"      # Net worth > 2x annual income
+    STABLE = "stable"          # Net worth > 0.5x annual income
+    STRUGGLING = "struggling"  # Net worth > 0, but < 0.5x income
+    DISTRESSED = "distressed"  # Negative net worth
+
+
+# Income multipliers by education level (median data-inspired)
+EDUCATION_INCOME_MULTIPLIER = {
+    EducationLevel.HIGH_SCHOOL: 1.0,
+    EducationLevel.SOME_COLLEGE: 1.2,
+    EducationLevel.BACHELORS: 1.65,
+    EducationLevel.MASTERS: 2.0,
+    EducationLevel.DOCTORATE: 2.4,
+}
+
+# Average student debt by education level
+EDUCATION_DEBT = {
+    EducationLevel.HIGH_SCHOOL: 0,
+    EducationLevel.SOME_COLLEGE: 12000,
+    EducationLevel.BACHELORS: 35000,
+    EducationLevel.MASTERS: 65000,
+    EducationLevel.DOCTORATE: 100000,
+}
+
+
+# Tree rendering colors by financial health
+BRANCH_COLORS = {
+    FinancialHealth.THRIVING: "#22c55e",    # Green
+    FinancialHealth.STABLE: "#84cc16",      # Lime
+    FinancialHealth.STRUGGLING: "#f59e0b",  # Amber
+    FinancialHealth.DISTRESSED: "#ef4444",  # Red
+}
+
+
+def branch_thickness(net_worth: float) -> float:
+    """Visual indicator for tree rendering (0-1 scale)"""
+    # Log scale to handle wide range of net worth
+    if net_worth <= 0:
+        return 0.1
+    log_worth = math.log10(max(net_worth, 1))
+    # Normalize: $1k = 0.2, $100k = 0.5, $1M = 0.7, $10M = 0.9
+    return min(0.1 + log_worth * 0.15, 1.0)
+
+
+def income_age_factor(age: int) -> float:
+    """Multiplier on income by age: grows from 22, peaks at 50"""
+    return 1 + 0.03 * min(age - 22, 28) if age > 22 else 0.5
+
+
+def health_of(net_worth: float, income: float) -> FinancialHealth:
+    if net_worth < 0:
+        return FinancialHealth.DISTRESSED
+    elif net_worth < 0.5 * income:
+        return FinancialHealth.STRUGGLING
+    elif net_worth < 2 * income:
+        return FinancialHealth.STABLE
+    else:
+        return FinancialHealth.THRIVING
+
+
+def new_member_id() -> str:
+    """Short random member id (8 hex digits)"""
+    return os.urandom(4).hex()
+
+
+@dataclass
+class FinancialSnapshot:
+    """Point-in-time financial state"""
+    year: int
+    age: int
+    income: float
+    savings: float
+    investments: float
+    debt: float
+    home_equity: float
+    net_worth: float
+    health: FinancialHealth
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "year": self.year,
+            "age": self.age,
+            "income": round(self.income, 2),
+            "savings": round(self.savings, 2),
+            "investments": round(self.investments, 2),
+            "debt": round(self.debt, 2),
+            "homeEquity": round(self.home_equity, 2),
+            "netWorth": round(self.net_worth, 2),
+            "health": self.health.value
+        }
+
+
+@dataclass
+class LifeEvent:
+    """Significant life event that affects finances"""
+    year: int
+    age: int
+    event_type: str
+    description: str
+    financial_impact: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "year": self.year,
+            "age": self.age,
+            "eventType": self.event_type,
+            "description": self.description,
+            "financialImpact": round(self.financial_impact, 2)
+        }
+
+
+@dataclass
+class FamilyMember:
+    """Represents one person in the family tree"""
+    id: str
+    name: str
+    generation: int
+    birth_year: int
+    
+    # Financial parameters
+    base_income: float
+    education: EducationLevel
+    financial_literacy: float  # 0-1, affects savings rate & decisions
+    
+    # State tracking
+    current_age: int = 0
+    savings: float = 0
+    investments: float = 0
+    debt: float = 0
+    home_equity: float = 0
+    owns_home: bool = False
+    
+    # Inheritance received
+    inheritance_received: float = 0
+    
+    # Family connections
+    children: List['FamilyMember'] = field(default_factory=list)
+    parent_id: Optional[str] = None
+    # Stable position in the tree ("0", "0.1", "0.1.0", ...), identical
+    # across baseline and scenario runs; keys every random decision
+    lineage: str = "0"
+    
+    # History
+    financial_history: List[FinancialSnapshot] = field(default_factory=list)
+    life_events: List[LifeEvent] = field(default_factory=list)
+    # One bit per once-only life event rule already fired (see rules.py)
+    achieved: int = field(default=0, repr=False, compare=False)
+    
+    # Annual income by age (CompiledParams.income_table); base income and
+    # education are fixed at birth, so it never goes stale
+    income_table: Optional[Sequence[float]] = field(default=None, repr=False, compare=False)
+    # (income, net worth, health) as of the last metrics() call; cleared
+    # by whatever changes the member's state (see invalidate())
+    _metrics: Optional[Tuple[float, float, FinancialHealth]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def net_worth(self) -> float:
+        return self.savings + self.investments + self.home_equity - self.debt
+    
+    @property
+    def annual_income(self) -> float:
+        table = self.income_table
+        age = self.current_age
+        if table is not None and age < len(table):
+            return table[age]
+        multiplier = EDUCATION_INCOME_MULTIPLIER[self.education]
+        return self.base_income * multiplier * income_age_factor(age)
+    
+    @property
+    def savings_rate(self) -> float:
+        """Savings rate influenced by financial literacy"""
+        base_rate = 0.05  # 5% baseline
+        literacy_bonus = self.financial_literacy * 0.15  # Up to 15% more
+        return base_rate + literacy_bonus
+    
+    @property
+    def financial_health(self) -> FinancialHealth:
+        return health_of(self.net_worth, self.annual_income)
+    
+    def metrics(self) -> Tuple[float, float, FinancialHealth]:
+        """
+        (annual income, net worth, financial health), computed once and
+        cached until invalidate(). The engine invalidates whenever it
+        changes a member; code that changes one directly must too.
+        """
+        metrics = self._metrics
+        if metrics is None:
+            income = self.annual_income
+            net_worth = self.savings + self.investments + self.home_equity - self.debt
+            metrics = self._metrics = (income, net_worth, health_of(net_worth, income))
+        return metrics
+    
+    def invalidate(self) -> None:
+        """Mark the cached metrics stale after a change of state"""
+        self._metrics = None
+    
+    @property
+    def branch_thickness(self) -> float:
+        """Visual indicator for tree rendering (0-1 scale)"""
+        return branch_thickness(self.net_worth)
+    
+    @property
+    def branch_color(self) -> str:
+        """Color based on financial health"""
+        return BRANCH_COLORS[self.financial_health]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        income, net_worth, health = self.metrics()
+        return {
+            "id": self.id,
+            "name": self.name,
+            "generation": self.generation,
+            "birthYear": self.birth_year,
+            "currentAge": self.current_age,
+            "education": self.education.value,
+            "financialLiteracy": round(self.financial_literacy, 2),
+            "income": round(income, 2),
+            "savings": round(self.savings, 2),
+            "investments": round(self.investments, 2),
+            "debt": round(self.debt, 2),
+            "homeEquity": round(self.home_equity, 2),
+            "netWorth": round(net_worth, 2),
+            "ownsHome": self.owns_home,
+            "inheritanceReceived": round(self.inheritance_received, 2),
+            "financialHealth": health.value,
+            "branchThickness": round(branch_thickness(net_worth), 3),
+            "branchColor": BRANCH_COLORS[health],
+            "children": [child.to_dict() for child in self.children],
+            "parentId": self.parent_id,
+            "lineage": self.lineage,
+            "financialHistory": [h.to_dict() for h in self.financial_history],
+            "lifeEvents": [e.to_dict() for e in self.life_events],
+        }
@@ -0,0 +1,58 @@
+"""
+Seedling - Generational Wealth Time Machine
+Simulation Parameters
+
+Economic and life assumptions, scenario modifiers and optional
+behavioral drift.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Any
+
+
+@dataclass
+class SimulationParams:
+    """Parameters controlling the simulation"""
+    # Economic assumptions
+    inflation_rate: float = 0.03
+    investment_return: float = 0.07
+    savings_interest: float = 0.02
+    debt_interest_rate: float = 0.07
+    home_appreciation: float = 0.04
+    
+    # Life assumptions
+    avg_children: float = 2.1
+    avg_child_birth_age: int = 28
+    retirement_age: int = 65
+    life_expectancy: int = 82
+    
+    # Scenario modifiers
+    monthly_habit_change: float = 0  # Extra monthly savings/spending
+    starting_debt_modifier: float = 1.0  # Multiplier on starting debt
+    financial_literacy_boost: float = 0  # Added to base literacy
+    
+    # Behavioral drift (off by default; the terminal version turns it on)
+    lifestyle_inflation: bool = False  # Living costs rise with net worth
+    diminishing_returns: bool = False  # Large portfolios earn less
+    estate_tax_rate: float = 0  # Tax on estates above the exemption
+    estate_tax_exemption: float = 1000000
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "inflationRate": self.inflation_rate,
+            "investmentReturn": self.investment_return,
+            "savingsInterest": self.savings_interest,
+            "debtInterestRate": self.debt_interest_rate,
+            "homeAppreciation": self.home_appreciation,
+            "avgChildren": self.avg_children,
+            "avgChildBirthAge": self.avg_child_birth_age,
+            "retirementAge": self.retirement_age,
+            "lifeExpectancy": self.life_expectancy,
+            "monthlyHabitChange": self.monthly_habit_change,
+            "startingDebtModifier": self.starting_debt_modifier,
+            "financialLiteracyBoost": self.financial_literacy_boost,
+            "lifestyleInflation": self.lifestyle_inflation,
+            "diminishingReturns": self.diminishing_returns,
+            "estateTaxRate": self.estate_tax_rate,
+            "estateTaxExemption": self.estate_tax_exemption,
+        }
@@ -0,0 +1,174 @@
+"""
+Seedling - Generational Wealth Time Machine
+Life Event Rules
+
+Life events declared as data. At the end of each simulated year, a rule
+whose trigger holds for the member applies its effect, if it has one, and
+logs its event. LIFE_EVENT_RULES are the engine's own: first home
+purchase, retirement and the net worth milestones.
+
+A rule is triggered by exactly one of
+    condition           any predicate on the member
+    at_age              an age, or the name of the SimulationParams field holding one
+    net_worth_at_least  a net worth threshold
+and can be ``enabled`` for some parameter sets only. A ``once`` rule
+fires at most once per member: it owns a bit in the member's ``achieved``
+bitset, so testing it is one AND however many events the member has.
+
+compile_rules() fuses the rules enabled for a parameter set into a
+single per-year step (CompiledParams.life_events). The step checks the
+predicate rules in order, then looks up the member's age, then walks up
+the ascending net worth thresholds and stops at the first one not
+reached. A new rule joins one of those, never another pass over the
+member. Predicate rules come first, so age and net worth rules see their
+effects.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .model import FamilyMember, LifeEvent
+from .params import SimulationParams
+
+# First home: buy at 30 or later with under $10k of debt and the down
+# payment plus a 30% cushion in savings and investments
+HOME_BUYING_AGE = 30
+HOME_MAX_DEBT = 10000
+DOWN_PAYMENT = 40000
+HOME_CUSHION = DOWN_PAYMENT * 1.3
+
+
+@dataclass(frozen=True)
+class EventRule:
+    """
+    A declared life event. ``description`` is a format string with the
+    fields age, net_worth (at the trigger) and threshold. ``effect``
+    changes the member and returns the event's financial impact.
+    """
+    event_type: str
+    description: str
+    condition: Optional[Callable[[FamilyMember], bool]] = None
+    at_age: Union[int, str, None] = None
+    net_worth_at_least: Optional[float] = None
+    effect: Optional[Callable[[FamilyMember], float]] = None
+    once: bool = False
+    enabled: Optional[Callable[[SimulationParams], bool]] = None
+    
+    def __post_init__(self):
+        triggers = (self.condition, self.at_age, self.net_worth_at_least)
+        if sum(trigger is not None for trigger in triggers) != 1:
+            raise ValueError(f"Rule {self.event_type!r} needs exactly one trigger")
+
+
+def _can_buy_home(member: FamilyMember) -> bool:
+    return (
+        not member.owns_home
+        and member.current_age >= HOME_BUYING_AGE
+        and member.debt < HOME_MAX_DEBT
+        and member.savings + member.investments >= HOME_CUSHION
+    )
+
+
+def _buy_home(member: FamilyMember) -> float:
+    if member.investments >= DOWN_PAYMENT:
+        member.investments -= DOWN_PAYMENT
+    else:
+        remaining = DOWN_PAYMENT - member.investments
+        member.investments = 0
+        member.savings -= remaining
+    member.owns_home = True
+    member.home_equity = DOWN_PAYMENT * 5  # 20% down on home value
+    return -DOWN_PAYMENT
+
+
+LIFE_EVENT_RULES: Tuple[EventRule, ...] = (
+    EventRule(
+        "home_purchase", "Purchased first home",
+        condition=_can_buy_home, effect=_buy_home, once=True,
+    ),
+    EventRule("retirement", "Retired with ${net_worth:,.0f} net worth", at_age="retirement_age"),
+    *(
+        EventRule(f"milestone_{threshold}", "Reached ${threshold:,} net worth!",
+                  net_worth_at_least=threshold, once=True)
+        for threshold in (100000, 500000, 1000000, 5000000)
+    ),
+)
+
+# (bit in ``achieved``, or 0 when not once, rule)
+_Entry = Tuple[int, EventRule]
+
+
+def _fire(member: FamilyMember, bit: int, rule: EventRule, current_year: int, net_worth: float) -> None:
+    impact = 0
+    if rule.effect is not None:
+        impact = rule.effect(member)
+        member.invalidate()
+    member.achieved |= bit
+    member.life_events.append(LifeEvent(
+        year=current_year + member.current_age - member.birth_year,
+        age=member.current_age,
+        event_type=rule.event_type,
+        description=rule.description.format(
+            age=member.current_age, net_worth=net_worth, threshold=rule.net_worth_at_least
+        ),
+        financial_impact=impact
+    ))
+
+
+def rule_ages(rules: Sequence[EventRule], params: SimulationParams) -> Tuple[int, ...]:
+    """Ages at which the rules enabled under ``params`` fire, ascending"""
+    ages = set()
+    for rule in rules:
+        if rule.at_age is not None and (rule.enabled is None or rule.enabled(params)):
+            ages.add(getattr(params, rule.at_age) if isinstance(rule.at_age, str) else rule.at_age)
+    return tuple(sorted(ages))
+
+
+def compile_rules(
+    rules: Sequence[EventRule],
+    params: SimulationParams
+) -> Callable[[FamilyMember, int], None]:
+    """
+    The fused per-year step for the rules enabled under ``params``:
+    step(member, current_year) fires every rule that holds for the member
+    """
+    predicates: List[Tuple[int, Callable[[FamilyMember], bool], EventRule]] = []
+    by_age: Dict[int, List[_Entry]] = {}
+    ladder: List[Tuple[float, int, EventRule]] = []
+    for position, rule in enumerate(rules):
+        if rule.enabled is not None and not rule.enabled(params):
+            continue
+        # Bits follow the full rule list, so they mean the same under any params
+        bit = 1 << position if rule.once else 0
+        if rule.condition is not None:
+            predicates.append((bit, rule.condition, rule))
+        elif rule.at_age is not None:
+            age = getattr(params, rule.at_age) if isinstance(rule.at_age, str) else rule.at_age
+            by_age.setdefault(age, []).append((bit, rule))
+        else:
+            ladder.append((rule.net_worth_at_least, bit, rule))
+    ladder.sort(key=lambda step: step[0])
+    predicates = tuple(predicates)
+    ladder = tuple(ladder)
+    
+    def step(member: FamilyMember, current_year: int) -> None:
+        for bit, condition, rule in predicates:
+            if not member.achieved & bit and condition(member):
+                _fire(member, bit, rule, current_year, member.metrics()[1])
+        
+        at_age = by_age.get(member.current_age)
+        if at_age is not None:
+            for bit, rule in at_age:
+                if not member.achieved & bit:
+                    _fire(member, bit, rule, current_year, member.metrics()[1])
+        
+        if ladder:
+            net_worth = member.metrics()[1]
+            for threshold, bit, rule in ladder:
+                if net_worth < threshold:
+                    break
+                if not member.achieved & bit:
+                    _fire(member, bit, rule, current_year, net_worth)
+                    net_worth = member.metrics()[1]
+    
+    return step
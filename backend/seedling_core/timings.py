@@ -0,0 +1,66 @@
+"""
+Seedling - Generational Wealth Time Machine
+Phase Timings
+
+Wall time per named phase of one request, for the Server-Timing header
+and timing logs. Callers pass a Timings where they would pass a budget;
+code that receives None does no timing work at all.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+import time
+
+
+# Phases of GenerationalSimulator.simulate_year, in the order they run
+YEAR_PHASES = ("debt", "housing", "savings", "growth", "events", "snapshot")
+
+
+class Timings:
+    """
+    Seconds and counts collected while serving one request.
+    
+    Phases accumulate, so a phase entered once per arm reports its total.
+    With ``detailed`` the simulator also splits every simulate_year call
+    into YEAR_PHASES (as ``year.debt`` and so on); that adds two clock
+    reads per phase per member-year, so it is meant for diagnosis.
+    """
+    
+    def __init__(self, detailed: bool = False):
+        self.detailed = detailed
+        self.phases: Dict[str, float] = {}
+        self.counts: Dict[str, Any] = {}
+        self._lap = 0.0
+    
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        # Enclosing phases are listed before the phases inside them
+        self.phases.setdefault(name, 0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+    
+    def start_lap(self) -> None:
+        self._lap = time.perf_counter()
+    
+    def lap(self, phase: str) -> None:
+        """Charge the time since the previous lap to ``phase``"""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._lap
+        self._lap = now
+    
+    def server_timing(self) -> str:
+        """Server-Timing header value, durations in milliseconds"""
+        return ", ".join(f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in self.phases.items())
+    
+    def report(self) -> Dict[str, Any]:
+        """Phases in milliseconds plus counts, for structured logs"""
+        return {
+            "phasesMs": {phase: round(seconds * 1000, 3) for phase, seconds in self.phases.items()},
+            **self.counts,
+        }
@@ -0,0 +1,186 @@
+"""
+Seedling - Generational Wealth Time Machine
+Request Trace Recording
+
+ASGI middleware that records a sampled, anonymized trace of API traffic
+as JSON lines, one per request, for benchmarks/load_test.py to replay:
+
+  {"at": 1700000000.123, "method": "POST", "path": "/api/simulate",
+   "query": "", "headers": {"accept-encoding": "br"}, "body": {...},
+   "status": 200, "ms": 41.7, "bytes": 18231, "cache": "miss"}
+
+Anonymized means nothing that identifies a person is kept: names are
+dropped, money amounts are rounded to two significant figures, and only
+the Accept and Accept-Encoding headers survive (no client address,
+cookies or user agent). What drives the server's cost is kept as is:
+ages, education, literacy, generation counts and scenario modifiers.
+
+Every uvicorn worker can append to the same file: each line is written
+with a single O_APPEND write. SEEDLING_TRACE_FILE turns recording on and
+SEEDLING_TRACE_SAMPLE (default 0.05) is the fraction of requests kept.
+"""
+
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode
+import json
+import math
+import os
+import random
+import threading
+import time
+
+# Only API traffic is recorded, not the frontend's static files
+TRACED_PREFIX = "/api/"
+# Bodies larger than this are recorded without their body
+MAX_BODY_BYTES = 64 * 1024
+# Request headers that change the response (format, compression)
+KEPT_HEADERS = (b"accept", b"accept-encoding")
+# Body fields holding free text about a person
+DROPPED_FIELDS = frozenset({"name"})
+# Body fields and query parameters holding money amounts
+ROUNDED_FIELDS = frozenset({"income", "savings", "debt", "monthly_habit_change", "monthly_amount"})
+
+
+def _round_significant(value: float, digits: int = 2) -> float:
+    if not value:
+        return value
+    return round(value, digits - 1 - int(math.floor(math.log10(abs(value)))))
+
+
+def anonymize(value: Any) -> Any:
+    """A request body with names dropped and money amounts coarsened"""
+    if isinstance(value, dict):
+        return {
+            key: _round_significant(item) if key in ROUNDED_FIELDS and isinstance(item, (int, float))
+            else anonymize(item)
+            for key, item in value.items()
+            if key not in DROPPED_FIELDS
+        }
+    if isinstance(value, list):
+        return [anonymize(item) for item in value]
+    return value
+
+
+def anonymize_query(query: str) -> str:
+    """A query string with money amounts coarsened"""
+    params = []
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        if key in ROUNDED_FIELDS:
+            try:
+                value = str(_round_significant(float(value)))
+            except ValueError:
+                pass
+        params.append((key, value))
+    return urlencode(params)
+
+
+class TraceRecorder:
+    """Appends sampled request records to a JSON-lines file"""
+    
+    def __init__(self, path: str, sample_rate: float):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.recorded = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    
+    def sampled(self) -> bool:
+        return random.random() < self.sample_rate
+    
+    def record(self, entry: Dict[str, Any]) -> None:
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode()
+        with self._lock:
+            os.write(self._fd, line)
+            self.recorded += 1
+    
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class TraceMiddleware:
+    """
+    Records sampled API requests with their timing, measured from the
+    request arriving to the last body chunk sent (streamed responses
+    included). Unsampled requests pass straight through.
+    """
+    
+    def __init__(self, app, recorder: TraceRecorder):
+        self.app = app
+        self.recorder = recorder
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(TRACED_PREFIX)
+            or not self.recorder.sampled()
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        at = time.time()
+        start = time.perf_counter()
+        body = bytearray()
+        response = {"status": 500, "bytes": 0, "cache": None, "ms": None}
+        
+        async def receive_and_keep():
+            message = await receive()
+            if message["type"] == "http.request" and len(body) <= MAX_BODY_BYTES:
+                body.extend(message.get("body", b""))
+            return message
+        
+        async def send_and_measure(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"x-cache":
+                        response["cache"] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response["ms"] = (time.perf_counter() - start) * 1000
+            await send(message)
+        
+        try:
+            await self.app(scope, receive_and_keep, send_and_measure)
+        finally:
+            if response["ms"] is None:
+                response["ms"] = (time.perf_counter() - start) * 1000
+            self.recorder.record({
+                "at": round(at, 3),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": anonymize_query(scope.get("query_string", b"").decode("latin-1")),
+                "headers": {
+                    name.decode("latin-1"): value.decode("latin-1")
+                    for name, value in scope.get("headers", ())
+                    if name in KEPT_HEADERS
+                },
+                "body": _parse_body(bytes(body)),
+                "status": response["status"],
+                "ms": round(response["ms"], 2),
+                "bytes": response["bytes"],
+                "cache": response["cache"],
+            })
+
+
+def _parse_body(body: bytes) -> Optional[Any]:
+    """The anonymized JSON body, or None when empty, oversized or not JSON"""
+    if not body or len(body) > MAX_BODY_BYTES:
+        return None
+    try:
+        return anonymize(json.loads(body))
+    except ValueError:
+        return None
+
+
+def open_default_recorder() -> Optional[TraceRecorder]:
+    """
+    The recorder configured by the environment, or None when
+    SEEDLING_TRACE_FILE is unset or SEEDLING_TRACE_SAMPLE is 0
+    """
+    path = os.environ.get("SEEDLING_TRACE_FILE")
+    sample_rate = float(os.environ.get("SEEDLING_TRACE_SAMPLE", "0.05"))
+    if not path or sample_rate <= 0:
+        return None
+    return TraceRecorder(path, sample_rate)
@@ -0,0 +1,212 @@
+/**
+ * Columnar Response Decoder for Seedling
+ * Wraps the binary /api/simulate response (Accept: application/x-seedling-columnar)
+ * in typed arrays that view the response buffer directly - no copies, no JSON.parse
+ * of the member histories.
+ */
+
+export const COLUMNAR_MEDIA_TYPE = 'application/x-seedling-columnar';
+
+const TYPED_ARRAYS = {
+  B: Uint8Array,
+  H: Uint16Array,
+  i: Int32Array,
+  I: Uint32Array,
+  f: Float32Array,
+  d: Float64Array,
+};
+
+const BRANCH_COLORS = {
+  thriving: '#22c55e',
+  stable: '#84cc16',
+  struggling: '#f59e0b',
+  distressed: '#ef4444',
+};
+
+const HEADER_SIZE = 12;
+const textDecoder = new TextDecoder();
+
+const align8 = (n) => Math.ceil(n / 8) * 8;
+/**
+ * Same result as the server's round(value, digits): toFixed rounds the exact
+ * binary value, and exact ties (e.g. 0.125) go to the even digit as in Python.
+ */
+const round = (value, digits = 2) => {
+  const rounded = Number(value.toFixed(digits));
+  const scaled = Math.abs(value) * 10 ** digits;
+  if (Math.abs(scaled - Math.floor(scaled) - 0.5) > 1e-6) return rounded;
+
+  const expansion = value.toFixed(100);
+  const cut = expansion.indexOf('.') + 1 + digits;
+  if (!/^50*$/.test(expansion.slice(cut))) return rounded;
+  const lastDigit = Number(expansion[cut - 1]);
+  return lastDigit % 2 === 0 ? Number(expansion.slice(0, cut)) : rounded;
+};
+
+/**
+ * Read the shared header: 4-byte magic, u16 version, u16 reserved,
+ * u32 metadata length, then UTF-8 JSON metadata padded to 8 bytes.
+ */
+const readHeader = (buffer, byteOffset, magic) => {
+  const view = new DataView(buffer, byteOffset, HEADER_SIZE);
+  const found = String.fromCharCode(
+    view.getUint8(0), view.getUint8(1), view.getUint8(2), view.getUint8(3)
+  );
+  if (found !== magic) {
+    throw new Error(`Expected ${magic} buffer, got ${found}`);
+  }
+  const metaLength = view.getUint32(8, true);
+  const meta = JSON.parse(
+    textDecoder.decode(new Uint8Array(buffer, byteOffset + HEADER_SIZE, metaLength))
+  );
+  return { meta, dataStart: byteOffset + align8(HEADER_SIZE + metaLength) };
+};
+
+/**
+ * Decode one flat tree. Members are in breadth-first order:
+ * children of member i are columns.child_offsets[i] .. columns.child_offsets[i + 1],
+ * history rows of member i are columns.history_offsets[i] .. columns.history_offsets[i + 1].
+ * @param {ArrayBuffer} buffer - Response body
+ * @param {number} byteOffset - Start of the tree inside the buffer
+ * @returns {Object} - Tree metadata plus typed-array columns
+ */
+export const decodeFlatTree = (buffer, byteOffset = 0) => {
+  const { meta, dataStart } = readHeader(buffer, byteOffset, 'SDLT');
+  const columns = {};
+  meta.columns.forEach(({ name, type, offset, length }) => {
+    columns[name] = new TYPED_ARRAYS[type](buffer, dataStart + offset, length);
+  });
+  return {
+    size: meta.ids.length,
+    ids: meta.ids,
+    names: meta.names,
+    lineages: meta.lineages,
+    parentIds: meta.parentIds,
+    events: meta.events,
+    healthLevels: meta.healthLevels,
+    educationLevels: meta.educationLevels,
+    columns,
+  };
+};
+
+/**
+ * Decode a full comparison response into { baseline, scenario, summary, ... }.
+ * Each arm is { params, tree } where tree is a decoded flat tree.
+ * @param {ArrayBuffer} buffer - Response body from response.arrayBuffer()
+ */
+export const decodeColumnarComparison = (buffer) => {
+  const { meta, dataStart } = readHeader(buffer, 0, 'SDLC');
+  const result = { ...meta };
+  ['baseline', 'scenario'].forEach((arm) => {
+    const { params, offset } = meta[arm];
+    result[arm] = { params, tree: decodeFlatTree(buffer, dataStart + offset) };
+  });
+  return result;
+};
+
+/**
+ * Financial history of one member as typed-array views (no copying)
+ */
+export const memberHistory = (tree, index) => {
+  const { columns } = tree;
+  const start = columns.history_offsets[index];
+  const end = columns.history_offsets[index + 1];
+  return {
+    year: columns.h_year.subarray(start, end),
+    age: columns.h_age.subarray(start, end),
+    income: columns.h_income.subarray(start, end),
+    savings: columns.h_savings.subarray(start, end),
+    investments: columns.h_investments.subarray(start, end),
+    debt: columns.h_debt.subarray(start, end),
+    homeEquity: columns.h_home_equity.subarray(start, end),
+    netWorth: columns.h_net_worth.subarray(start, end),
+    health: columns.h_health.subarray(start, end),
+  };
+};
+
+const branchThickness = (netWorth) => {
+  if (netWorth <= 0) return 0.1;
+  return Math.min(0.1 + Math.log10(Math.max(netWorth, 1)) * 0.15, 1.0);
+};
+
+const memberToObject = (tree, i, children) => {
+  const c = tree.columns;
+  const health = tree.healthLevels[c.health[i]];
+  const history = [];
+  for (let row = c.history_offsets[i]; row < c.history_offsets[i + 1]; row += 1) {
+    history.push({
+      year: c.h_year[row],
+      age: c.h_age[row],
+      income: round(c.h_income[row]),
+      savings: round(c.h_savings[row]),
+      investments: round(c.h_investments[row]),
+      debt: round(c.h_debt[row]),
+      homeEquity: round(c.h_home_equity[row]),
+      netWorth: round(c.h_net_worth[row]),
+      health: tree.healthLevels[c.h_health[row]],
+    });
+  }
+  return {
+    id: tree.ids[i],
+    name: tree.names[i],
+    generation: c.generation[i],
+    birthYear: c.birth_year[i],
+    currentAge: c.current_age[i],
+    education: tree.educationLevels[c.education[i]],
+    financialLiteracy: round(c.financial_literacy[i]),
+    income: round(c.income[i]),
+    savings: round(c.savings[i]),
+    investments: round(c.investments[i]),
+    debt: round(c.debt[i]),
+    homeEquity: round(c.home_equity[i]),
+    netWorth: round(c.net_worth[i]),
+    ownsHome: c.owns_home[i] === 1,
+    inheritanceReceived: round(c.inheritance_received[i]),
+    financialHealth: health,
+    branchThickness: round(branchThickness(c.net_worth[i]), 3),
+    branchColor: BRANCH_COLORS[health],
+    children,
+    parentId: tree.parentIds[i],
+    lineage: tree.lineages[i],
+    financialHistory: history,
+    lifeEvents: tree.events[i].map(([year, age, eventType, description, financialImpact]) => ({
+      year,
+      age,
+      eventType,
+      description,
+      financialImpact: round(financialImpact),
+    })),
+  };
+};
+
+/**
+ * Build the nested JSON tree shape the existing components expect.
+ * Only call this for the part of the tree actually being rendered.
+ * @param {Object} tree - Decoded flat tree
+ * @param {number} root - Member index to start from (0 = founder)
+ */
+export const treeToNested = (tree, root = 0) => {
+  const c = tree.columns;
+  // Children always follow their parent in breadth-first order, so walking
+  // backwards over the subtree builds each child before its parent needs it.
+  const levels = [];
+  let start = root;
+  let end = root + 1;
+  while (end > start) {
+    levels.push([start, end]);
+    [start, end] = [c.child_offsets[start], c.child_offsets[end]];
+  }
+  const built = new Map();
+  for (let l = levels.length - 1; l >= 0; l -= 1) {
+    const [levelStart, levelEnd] = levels[l];
+    for (let i = levelStart; i < levelEnd; i += 1) {
+      const children = [];
+      for (let child = c.child_offsets[i]; child < c.child_offsets[i + 1]; child += 1) {
+        children.push(built.get(child));
+        built.delete(child);
+      }
+      built.set(i, memberToObject(tree, i, children));
+    }
+  }
+  return built.get(root);
+};
@@ -0,0 +1,86 @@
+/**
+ * Delta-Encoded Scenario Decoder for Seedling
+ * Rebuilds the full scenario tree from a /api/simulate response requested with
+ * response_mode: 'delta' (scenario.treeDelta) and the full baseline tree.
+ */
+
+export const DELTA_ENCODING = 'seedling-delta-v1';
+
+// Numbers travel as integer deltas in units of the server's rounding
+const toUnits = (value, decimals = 2) => Math.round(value * 10 ** decimals);
+const fromUnits = (units, decimals = 2) => units / 10 ** decimals;
+
+const lineageKey = (lineage) => lineage.split('.').map(Number);
+const compareLineage = (a, b) => {
+  const ka = lineageKey(a);
+  const kb = lineageKey(b);
+  for (let i = 0; i < Math.min(ka.length, kb.length); i += 1) {
+    if (ka[i] !== kb[i]) return ka[i] - kb[i];
+  }
+  return ka.length - kb.length;
+};
+
+/**
+ * Apply a scenario delta to the baseline tree
+ * @param {Object} baselineTree - Nested baseline tree (response.baseline.tree)
+ * @param {Object} delta - response.scenario.treeDelta
+ * @returns {Object} - Nested scenario tree, same shape as a full response
+ */
+export const applyScenarioDelta = (baselineTree, delta) => {
+  if (delta.encoding !== DELTA_ENCODING) {
+    throw new Error(`Unsupported delta encoding: ${delta.encoding}`);
+  }
+
+  const baselineNodes = new Map();
+  const stack = [baselineTree];
+  while (stack.length) {
+    const node = stack.pop();
+    baselineNodes.set(node.lineage, node);
+    stack.push(...node.children);
+  }
+
+  const nodes = new Map();
+  delta.members.forEach((entry) => {
+    const base = baselineNodes.get(entry.lineage);
+    const { children, ...fields } = base;
+    const node = { ...fields, id: entry.id, ...(entry.set || {}) };
+
+    Object.entries(entry.delta || {}).forEach(([key, diff]) => {
+      const decimals = key === 'branchThickness' ? 3 : 2;
+      node[key] = fromUnits(toUnits(base[key], decimals) + diff, decimals);
+    });
+
+    if (entry.financialHistory) {
+      node.financialHistory = entry.financialHistory;
+    } else {
+      const history = base.financialHistory.map((row) => ({ ...row }));
+      Object.entries(entry.history || {}).forEach(([key, values]) => {
+        history.forEach((row, i) => {
+          row[key] = key === 'health' ? values[i] : fromUnits(toUnits(row[key]) + values[i]);
+        });
+      });
+      node.financialHistory = history;
+    }
+
+    if (entry.lifeEvents) node.lifeEvents = entry.lifeEvents;
+    nodes.set(entry.lineage, node);
+  });
+
+  delta.added.forEach((member) => nodes.set(member.lineage, { ...member }));
+
+  // Re-link by lineage: "0.2.1" is child 1 of "0.2"
+  let root = null;
+  [...nodes.keys()].sort(compareLineage).forEach((lineage) => {
+    const node = nodes.get(lineage);
+    node.children = [];
+    const cut = lineage.lastIndexOf('.');
+    if (cut === -1) {
+      root = node;
+    } else {
+      const parent = nodes.get(lineage.slice(0, cut));
+      node.parentId = parent.id;
+      parent.children.push(node);
+    }
+  });
+  return root;
+};